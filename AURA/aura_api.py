@@ -1,15 +1,32 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_restful import Api, Resource
-from memory.database import get_connection
 from brain.nlp_processor import process_command
 from memory.memory_manager import save_conversation
-from brain.analytics import get_productivity_analytics, get_productivity_score
+from brain.analytics import build_analytics_snapshot, get_productivity_score
+from brain.stats_engine import begin_snapshot, end_snapshot
+from utils.cache import get_cache_stats
+from integrations.openai_client import get_ai_status
+from brain.local_model import get_local_model_stats
+from memory.search import search
+from utils.bulk_input import read_records, input_format
+from utils.listing import stream_listing
 import json
 
 app = Flask(__name__)
 api = Api(app)
 
 
+# One set of task/habit counters per request, however many summaries it renders
+@app.before_request
+def open_stats_snapshot():
+    begin_snapshot()
+
+
+@app.teardown_request
+def close_stats_snapshot(exc):
+    end_snapshot()
+
+
 class ChatAPI(Resource):
     def post(self):
         data = request.get_json()
@@ -18,7 +35,7 @@ class ChatAPI(Resource):
         if not message:
             return {'error': 'No message provided'}, 400
 
-        response = process_command(message)
+        response = process_command(message, session=data.get('session_id') or request.remote_addr)
         save_conversation(message, response)
 
         return {
@@ -28,30 +45,18 @@ class ChatAPI(Resource):
         }
 
 
+def _listing(name):
+    """One streamed page of a utils.listing listing for the request's query"""
+    try:
+        body = stream_listing(name, request.args)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    return Response(stream_with_context(body), mimetype='application/json')
+
+
 class TasksAPI(Resource):
     def get(self):
-        conn = get_connection()
-        if not conn:
-            return {'error': 'Database connection failed'}, 500
-
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM tasks ORDER BY created_at DESC")
-        tasks = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        task_list = []
-        for task in tasks:
-            task_list.append({
-                'id': task[0],
-                'text': task[1],
-                'due_date': task[2],
-                'priority': task[3],
-                'status': task[4],
-                'created': task[5]
-            })
-
-        return {'tasks': task_list}
+        return _listing('tasks')
 
     def post(self):
         data = request.get_json()
@@ -69,36 +74,40 @@ class TasksAPI(Resource):
             return {'error': 'Failed to add task'}, 500
 
 
+def _bulk_records():
+    """Records streamed from the request body (JSON, NDJSON or CSV)"""
+    return read_records(request.stream, input_format(request.mimetype, request.args.get('format')))
+
+
+class TasksBulkAPI(Resource):
+    def post(self):
+        from brain.task_manager import add_tasks_bulk
+        result = add_tasks_bulk(_bulk_records())
+        return result, 400 if 'error' in result else 200
+
+
 class HabitsAPI(Resource):
     def get(self):
-        conn = get_connection()
-        if not conn:
-            return {'error': 'Database connection failed'}, 500
-
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM habits ORDER BY streak_count DESC")
-        habits = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        habit_list = []
-        for habit in habits:
-            habit_list.append({
-                'id': habit[0],
-                'name': habit[1],
-                'frequency': habit[2],
-                'streak': habit[3],
-                'last_completed': habit[4],
-                'total_completions': habit[5]
-            })
-
-        return {'habits': habit_list}
+        return _listing('habits')
+
+
+class HabitsBulkAPI(Resource):
+    def post(self):
+        from brain.habit_tracker import add_habits_bulk, mark_habits_done_bulk
+        action = request.args.get('action', 'add')
+        if action not in ('add', 'done'):
+            return {'error': "action must be 'add' or 'done'"}, 400
+
+        bulk = mark_habits_done_bulk if action == 'done' else add_habits_bulk
+        result = bulk(_bulk_records())
+        return result, 400 if 'error' in result else 200
 
 
 class AnalyticsAPI(Resource):
     def get(self):
-        analytics = get_productivity_analytics()
-        score = get_productivity_score()
+        snapshot = build_analytics_snapshot((30, 7))
+        analytics = snapshot.analytics(30)
+        score = get_productivity_score(snapshot)
 
         return {
             'analytics': analytics,
@@ -106,6 +115,27 @@ class AnalyticsAPI(Resource):
         }
 
 
+class CacheStatsAPI(Resource):
+    def get(self):
+        return get_cache_stats()
+
+
+class SearchAPI(Resource):
+    def get(self):
+        sources = request.args.get('sources')
+        return search(
+            request.args.get('q', ''),
+            sources=sources.split(',') if sources else None,
+            limit=request.args.get('limit', 10, type=int),
+            offset=request.args.get('offset', 0, type=int)
+        )
+
+
+class AIStatusAPI(Resource):
+    def get(self):
+        return dict(get_ai_status(), local_model=get_local_model_stats())
+
+
 class ExportAPI(Resource):
     def get(self, format_type='json'):
         from utils.data_export import export_data
@@ -116,8 +146,13 @@ class ExportAPI(Resource):
 # Add resources to API
 api.add_resource(ChatAPI, '/api/chat')
 api.add_resource(TasksAPI, '/api/tasks')
+api.add_resource(TasksBulkAPI, '/api/tasks/bulk')
 api.add_resource(HabitsAPI, '/api/habits')
+api.add_resource(HabitsBulkAPI, '/api/habits/bulk')
 api.add_resource(AnalyticsAPI, '/api/analytics')
+api.add_resource(CacheStatsAPI, '/api/cache/stats')
+api.add_resource(AIStatusAPI, '/api/ai/status')
+api.add_resource(SearchAPI, '/api/search')
 api.add_resource(ExportAPI, '/api/export/<string:format_type>')
 
 
@@ -129,7 +164,9 @@ def home():
         'endpoints': {
             'chat': '/api/chat',
             'tasks': '/api/tasks',
+            'tasks_bulk': '/api/tasks/bulk',
             'habits': '/api/habits',
+            'habits_bulk': '/api/habits/bulk',
             'analytics': '/api/analytics',
             'export': '/api/export/<format>'
         }
@@ -3,10 +3,10 @@ from tkinter import ttk, scrolledtext, messagebox
 import threading
 import queue
 from voice.speech_to_text import listen
-from voice.text_to_speech import speak
-from brain.nlp_processor import process_command
+from voice.text_to_speech import speak, say, SentenceBuffer
+from brain.nlp_processor import process_command, stream_command
 from memory.memory_manager import save_conversation
-from brain.analytics import get_productivity_analytics, get_productivity_score
+from brain.analytics import build_analytics_snapshot, get_productivity_score
 from utils.config_manager import get_config, update_config
 
 
@@ -19,6 +19,9 @@ class AURAGUI:
 
         self.config = get_config()
         self.message_queue = queue.Queue()
+        self.speech_buffer = SentenceBuffer()
+        # The sidebar score and the analytics tab share one analytics read
+        self.analytics_snapshot = build_analytics_snapshot((30, 7))
         self.setup_gui()
         self.process_messages()
 
@@ -48,6 +51,7 @@ class AURAGUI:
             ("📊 Analytics", self.show_analytics),
             ("📝 Tasks", self.show_tasks),
             ("💪 Habits", self.show_habits),
+            ("🔍 Search", self.show_search),
             ("⚙️ Settings", self.show_settings)
         ]
 
@@ -60,7 +64,7 @@ class AURAGUI:
         self.voice_btn.pack(pady=20)
 
         # Productivity score
-        score = get_productivity_score()
+        score = get_productivity_score(self.analytics_snapshot)
         score_frame = ttk.Frame(sidebar)
         score_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=10)
 
@@ -98,6 +102,11 @@ class AURAGUI:
         self.setup_settings_tab(self.settings_frame)
         self.notebook.add(self.settings_frame, text="⚙️ Settings")
 
+        # Search tab
+        self.search_frame = ttk.Frame(self.notebook)
+        self.setup_search_tab(self.search_frame)
+        self.notebook.add(self.search_frame, text="🔍 Search")
+
     def setup_chat_tab(self, parent):
         # Chat history
         self.chat_history = scrolledtext.ScrolledText(parent, height=20, width=80, font=('Arial', 10))
@@ -118,10 +127,10 @@ class AURAGUI:
         self.add_to_chat("AURA", "Hello! I'm AURA. How can I assist you today?")
 
     def setup_analytics_tab(self, parent):
-        analytics = get_productivity_analytics()
+        analytics = self.analytics_snapshot.analytics(30)
 
         # Productivity score
-        score = get_productivity_score()
+        score = get_productivity_score(self.analytics_snapshot)
         score_label = ttk.Label(parent, text=f"Overall Productivity Score: {score}/100",
                                 font=('Arial', 16, 'bold'), foreground=self.get_score_color(score))
         score_label.pack(pady=10)
@@ -186,6 +195,26 @@ class AURAGUI:
 
         self.refresh_habits()
 
+    def setup_search_tab(self, parent):
+        ttk.Label(parent, text="Search Memory", font=('Arial', 14, 'bold')).pack(pady=10)
+
+        search_frame = ttk.Frame(parent)
+        search_frame.pack(fill=tk.X, pady=5)
+
+        self.search_entry = ttk.Entry(search_frame, font=('Arial', 12))
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+        self.search_entry.bind('<Return>', lambda e: self.run_search())
+
+        ttk.Button(search_frame, text="More", command=lambda: self.run_search(more=True)).pack(side=tk.RIGHT)
+        ttk.Button(search_frame, text="Search", command=self.run_search).pack(side=tk.RIGHT, padx=(0, 5))
+
+        # Conversations, tasks and file summaries, best match first
+        self.search_results = tk.Listbox(parent, height=15, font=('Arial', 10))
+        self.search_results.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.search_status = ttk.Label(parent, text="")
+        self.search_status.pack(anchor='w')
+        self.search_offset = 0
+
     def setup_settings_tab(self, parent):
         ttk.Label(parent, text="Settings", font=('Arial', 14, 'bold')).pack(pady=10)
 
@@ -225,22 +254,47 @@ class AURAGUI:
         # Process in thread to avoid GUI freeze
         threading.Thread(target=self.process_command_thread, args=(message,), daemon=True).start()
 
+    def append_to_chat(self, text):
+        self.chat_history.config(state=tk.NORMAL)
+        self.chat_history.insert(tk.END, text)
+        self.chat_history.config(state=tk.DISABLED)
+        self.chat_history.see(tk.END)
+
     def process_command_thread(self, message):
-        response = process_command(message)
-        self.message_queue.put(("AURA", response))
+        # Deltas are queued as they arrive so the reply appears token by token
+        self.message_queue.put(("stream_start", "AURA"))
+        response = ""
+        for delta in stream_command(message):
+            response += delta
+            self.message_queue.put(("stream", delta))
+        self.message_queue.put(("stream_end", response))
         save_conversation(message, response)
 
     def process_messages(self):
+        voice_enabled = self.config.get('voice_enabled', True)
         try:
             while True:
                 sender, message = self.message_queue.get_nowait()
-                self.add_to_chat(sender, message)
-                if self.config.get('voice_enabled', True):
-                    speak(message)
+                if sender == "stream_start":
+                    self.append_to_chat(f"{message}: ")
+                elif sender == "stream":
+                    self.append_to_chat(message)
+                    if voice_enabled:
+                        for sentence in self.speech_buffer.feed(message):
+                            say(sentence)
+                elif sender == "stream_end":
+                    self.append_to_chat("\n\n")
+                    for sentence in self.speech_buffer.flush():
+                        if voice_enabled:
+                            say(sentence)
+                else:
+                    self.add_to_chat(sender, message)
+                    if voice_enabled:
+                        speak(message)
         except queue.Empty:
             pass
         finally:
-            self.root.after(100, self.process_messages)
+            self.root.after(50, self.process_messages)
 
     def start_voice_input(self):
         def voice_thread():
@@ -271,6 +325,10 @@ class AURAGUI:
     def show_settings(self):
         self.notebook.select(4)
 
+    def show_search(self):
+        self.notebook.select(5)
+        self.search_entry.focus_set()
+
     def add_task(self):
         task_text = self.task_entry.get().strip()
         if not task_text:
@@ -318,6 +376,24 @@ class AURAGUI:
             status = "✓" if last_completed == str(datetime.now().date()) else "○"
             self.habits_list.insert(tk.END, f"{status} {name} - Streak: {streak} days")
 
+    def run_search(self, more=False):
+        query = self.search_entry.get().strip()
+        if not query:
+            return
+
+        from memory.search import search
+        self.search_offset = self.search_offset + 20 if more else 0
+        if not more:
+            self.search_results.delete(0, tk.END)
+        page = search(query, limit=20, offset=self.search_offset)
+
+        labels = {'conversations': "💬", 'tasks': "📝", 'files': "📄"}
+        for match in page['results']:
+            self.search_results.insert(tk.END, f"{labels[match['source']]} {match['snippet']}")
+        shown = self.search_results.size()
+        more_text = " (More for the next page)" if page['has_more'] else ""
+        self.search_status.config(text=f"{shown} results in {page['took_ms']} ms{more_text}")
+
     def save_api_key(self):
         api_key = self.api_entry.get()
         if update_config('openai_api_key', api_key):
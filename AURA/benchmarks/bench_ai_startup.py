@@ -0,0 +1,95 @@
+"""Startup cost of AI initialisation: blocking test completion vs lazy client.
+
+The openai module is replaced by an in-process fake whose requests sleep for
+--latency seconds (a typical chat completion round trip), so no network or
+API key is needed. Times:
+  before: the old initialize_ai(), which built the client and sent a test
+          completion before returning
+  after:  the new initialize_ai(), which only starts a background warm-up,
+          plus how long until is_ai_ready() turns true
+
+Run from the AURA directory:
+    python -m benchmarks.bench_ai_startup [--latency 0.8] [--probe]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+
+
+def install_fake_openai(latency):
+    def create(**kwargs):
+        time.sleep(latency)
+        message = types.SimpleNamespace(content="AI connected!")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=None)
+
+    def list_models():
+        time.sleep(latency / 4)
+        return []
+
+    def OpenAI(api_key):
+        return types.SimpleNamespace(
+            chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)),
+            models=types.SimpleNamespace(list=list_models)
+        )
+
+    sys.modules['openai'] = types.SimpleNamespace(OpenAI=OpenAI)
+
+
+def legacy_initialize_ai():
+    """The pre-lazy initialize_ai(): build the client, then a test completion"""
+    import openai
+    from utils.config_manager import get_config
+    client = openai.OpenAI(api_key=get_config().get('openai_api_key'))
+    response = client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[{"role": "user", "content": "Say 'AI connected' in a creative way."}],
+        max_tokens=20
+    )
+    return bool(response.choices[0].message.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.8, help="fake round trip in seconds")
+    parser.add_argument('--probe', action='store_true', help="include the background health probe")
+    args = parser.parse_args()
+
+    install_fake_openai(args.latency)
+    workdir = tempfile.mkdtemp(prefix="aura_bench_")
+    cwd = os.getcwd()
+    try:
+        # A throwaway config so the real key is never read
+        os.chdir(workdir)
+        with open('aura_config.json', 'w') as f:
+            json.dump({'openai_api_key': 'sk-bench', 'response_cache_enabled': False}, f)
+
+        start = time.perf_counter()
+        legacy_initialize_ai()
+        before = time.perf_counter() - start
+
+        from integrations import openai_client
+        start = time.perf_counter()
+        openai_client.initialize_ai(probe=args.probe)
+        after = time.perf_counter() - start
+
+        expected = 'verified' if args.probe else 'ready'
+        while openai_client.ai_status['state'] not in (expected, 'offline', 'unreachable'):
+            time.sleep(0.001)
+        ready = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"fake LLM round trip: {args.latency * 1000:.0f} ms")
+    print(f"before: initialize_ai() blocked startup for {before * 1000:8.1f} ms")
+    print(f"after:  initialize_ai() blocked startup for {after * 1000:8.1f} ms")
+    print(f"        AI status '{openai_client.ai_status['state']}' after {ready * 1000:.1f} ms (in the background)")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""Importing tasks one add_task() at a time vs POST /api/tasks/bulk.
+
+Builds a throwaway database and imports --rows synthetic tasks three ways:
+  add_task     one connection and commit per task, as before the bulk API
+  bulk, json   a JSON array through the aura_api test client
+  bulk, csv    the same rows as CSV
+Each row still fires the stats, rollup and FTS triggers, so the bulk
+numbers include that per-row work; what they save is the per-row commit.
+
+Run from the AURA directory:
+    python -m benchmarks.bench_bulk_import [--rows 20000]
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+
+
+def make_rows(count):
+    return [{'text': f"imported task {i}", 'priority': i % 3 + 1, 'due_date': f"2030-01-{i % 28 + 1:02d}"}
+            for i in range(count)]
+
+
+def as_csv(rows):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=['text', 'priority', 'due_date'])
+    writer.writeheader()
+    writer.writerows(rows)
+    return out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--single-rows', type=int, default=2000,
+                        help="tasks imported with add_task (extrapolated to --rows)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="aura_bulk_")
+    try:
+        from memory.database import configure_pool, setup_database, stop_checkpointer
+        configure_pool(os.path.join(workdir, 'bulk.db'))
+        setup_database()
+        stop_checkpointer()
+
+        from brain.task_manager import add_task
+        from aura_api import app
+        client = app.test_client()
+        rows = make_rows(args.rows)
+
+        start = time.perf_counter()
+        for row in rows[:args.single_rows]:
+            add_task(row['text'], row['due_date'], row['priority'])
+        single = (time.perf_counter() - start) / args.single_rows
+
+        print(f"\n{'import':<14}{'rows/s':>10}{f'{args.rows} rows':>14}")
+        print(f"{'add_task':<14}{1 / single:>10,.0f}{single * args.rows:>13.1f}s")
+        for name, body, content_type in (('bulk, json', json.dumps(rows), 'application/json'),
+                                         ('bulk, csv', as_csv(rows), 'text/csv')):
+            start = time.perf_counter()
+            result = client.post('/api/tasks/bulk', data=body, content_type=content_type).get_json()
+            elapsed = time.perf_counter() - start
+            assert result['inserted'] == args.rows, result
+            print(f"{name:<14}{args.rows / elapsed:>10,.0f}{elapsed:>13.1f}s")
+    finally:
+        from memory.conversation_logger import get_conversation_logger
+        get_conversation_logger().stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
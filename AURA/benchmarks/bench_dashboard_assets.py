@@ -0,0 +1,84 @@
+"""Bytes and requests for loading the web dashboard, first visit and repeat.
+
+Loads / and the assets it links through web/app.py's test client, as a
+browser would with each Accept-Encoding, then again with the ETags and
+cache lifetimes it got back: hashed assets are still fresh and are not
+requested at all, and the page itself is revalidated (304). Analytics and
+chat calls are left out; they are the same either way.
+
+Run from the AURA directory:
+    python -m benchmarks.bench_dashboard_assets [--rounds 200]
+"""
+import argparse
+import os
+import re
+import shutil
+import tempfile
+import time
+
+ENCODINGS = (('identity', ''), ('gzip', 'gzip, deflate'), ('br', 'gzip, deflate, br'))
+
+
+def visit(client, accept, cache):
+    """(requests, bytes) for one page load; cache maps URL -> ETag, or None for immutable"""
+    page_headers = {'Accept-Encoding': accept}
+    if '/' in cache:
+        page_headers['If-None-Match'] = cache['/']
+    page = client.get('/', headers=page_headers)
+    requests, size = 1, len(page.data)
+    if page.status_code == 200:
+        cache['/'] = page.headers['ETag']
+        urls = re.findall(r'(?:href|src)="(/assets/[^"]+)"', page.get_data(as_text=True))
+        cache['assets'] = urls
+    for url in cache['assets']:
+        if url in cache:
+            continue  # max-age=1y, immutable: served from the browser cache
+        response = client.get(url, headers={'Accept-Encoding': accept})
+        assert response.status_code == 200, url
+        requests += 1
+        size += len(response.data)
+        cache[url] = None
+    return requests, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=200, help="first visits timed per encoding")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="aura_assets_")
+    try:
+        from memory.database import configure_pool, setup_database, stop_checkpointer
+        configure_pool(os.path.join(workdir, 'assets.db'))
+        setup_database()
+        stop_checkpointer()
+
+        from web.app import app
+        from utils.static_assets import brotli
+        client = app.test_client()
+
+        print(f"\n{'encoding':<10}{'visit':<8}{'requests':>10}{'bytes':>10}{'ms':>8}")
+        for name, accept in ENCODINGS:
+            if name == 'br' and brotli is None:
+                print(f"{name:<10}(brotli module not installed)")
+                continue
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                visit(client, accept, {})
+            first_ms = (time.perf_counter() - start) * 1000 / args.rounds
+
+            cache = {}
+            first = visit(client, accept, cache)
+            start = time.perf_counter()
+            repeat = visit(client, accept, cache)
+            repeat_ms = (time.perf_counter() - start) * 1000
+            print(f"{name:<10}{'first':<8}{first[0]:>10}{first[1]:>10,}{first_ms:>8.2f}")
+            print(f"{'':<10}{'repeat':<8}{repeat[0]:>10}{repeat[1]:>10,}{repeat_ms:>8.2f}")
+    finally:
+        from memory.conversation_logger import get_conversation_logger
+        get_conversation_logger().stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
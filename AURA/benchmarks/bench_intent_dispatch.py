@@ -0,0 +1,210 @@
+"""Routing regression corpus and throughput of the compiled intent dispatcher.
+
+legacy_route() is the original process_command() if/elif chain with each
+handler call replaced by its intent name, frozen as it was when the
+dispatcher replaced it. Routing changed on purpose since then only through
+the prefix rules in ROUTING_CHANGES, which sit after the ai_* prefixes and
+before everything else; expected_route() is the legacy chain with those
+applied. Every command in CORPUS, plus a batch of generated ones, must
+route to expected_route() through resolve_intent(), and every command in
+CHANGED_EXAMPLES to its listed intent, which legacy_route() must not give;
+the run fails loudly otherwise. Then both routers are timed over the
+(already normalised) corpus.
+
+Run from the AURA directory:
+    python -m benchmarks.bench_intent_dispatch [--runs 5] [--generated 5000]
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from brain.intent_dispatcher import INTENT_RULES, resolve_intent
+
+
+def legacy_route(command):
+    if command.startswith('chat '):
+        return 'ai_chat'
+    elif command.startswith('ai summarize '):
+        return 'ai_summarize'
+    elif command.startswith('ai write '):
+        return 'ai_write'
+    elif command.startswith('search '):
+        return 'web_search'
+    elif any(word in command for word in ['suggest', 'recommend', 'what should i do']):
+        return 'suggestions'
+    elif 'productivity report' in command:
+        return 'productivity_report'
+    elif 'export data' in command:
+        return 'export_data'
+    elif 'settings' in command:
+        return 'settings'
+    elif command.startswith('add habit '):
+        return 'add_habit'
+    elif command.startswith('mark habit '):
+        return 'mark_habit'
+    elif any(word in command for word in ['show habits', 'my habits']):
+        return 'show_habits'
+    elif 'habit stats' in command:
+        return 'habit_stats'
+    elif any(word in command for word in ['remind me to', 'task', 'todo', 'remember to', 'add task']):
+        return 'add_task'
+    elif any(word in command for word in ['show tasks', 'my tasks', 'what are my tasks', 'list tasks']):
+        return 'show_tasks'
+    elif any(word in command for word in ['complete task', 'done', 'finished', 'mark complete']):
+        return 'complete_task'
+    elif any(word in command for word in ['task stats', 'how many tasks', 'progress']):
+        return 'task_stats'
+    elif any(word in command for word in ['completed tasks', 'what i finished', 'task history']):
+        return 'completed_tasks'
+    elif any(word in command for word in ['what did', 'remember', 'last time', 'our conversation']):
+        return 'memory'
+    elif any(word in command for word in ['hello', 'hi', 'hey', 'good morning', 'good afternoon']):
+        return 'greeting'
+    elif any(word in command for word in ['how are you', 'how do you do']):
+        return 'status'
+    elif any(word in command for word in ['thank you', 'thanks']):
+        return 'thanks'
+    else:
+        return 'default'
+
+
+# Deliberate routing changes since the legacy chain, in rule order
+ROUTING_CHANGES = [
+    # user-019: memory search
+    ('search_memory', ('what did i say about ', 'search memory for ')),
+    # user-021: numbered task commands
+    ('show_tasks', ('show tasks', 'list tasks', 'my tasks', 'what are my tasks')),
+    ('complete_task', ('complete task ',)),
+    ('defer_task', ('defer task ', 'postpone task ')),
+    ('edit_task', ('edit task ', 'rename task ')),
+]
+UNCHANGED_PREFIX_INTENTS = ('ai_chat', 'ai_summarize', 'ai_write')
+
+# Commands whose intent changed on purpose: (command, new intent)
+CHANGED_EXAMPLES = [
+    ("what did i say about the dentist", 'search_memory'),
+    ("search memory for project notes", 'search_memory'),
+    ("show tasks", 'show_tasks'),
+    ("my tasks", 'show_tasks'),
+    ("list tasks due today", 'show_tasks'),
+    ("complete task 2", 'complete_task'),
+    ("defer task 2 to tomorrow", 'defer_task'),
+    ("postpone task 1 by 3 days", 'defer_task'),
+    ("edit task 3 to buy oat milk", 'edit_task'),
+    ("rename task 1 call dad", 'edit_task'),
+]
+
+
+def expected_route(command):
+    legacy = legacy_route(command)
+    if legacy in UNCHANGED_PREFIX_INTENTS:
+        return legacy
+    for intent, prefixes in ROUTING_CHANGES:
+        if command.startswith(prefixes):
+            return intent
+    return legacy
+
+
+CORPUS = [
+    # Prefix commands, including near misses
+    "chat tell me a joke", "chat", "chatting about tasks", "ai summarize this long text",
+    "ai summarize", "ai write a poem about habits", "ai writer", "search python asyncio",
+    "search", "research the market", "please search cats",
+    "what did i say about the dentist", "what did i say about tasks", "what did i say",
+    "search memory for project notes", "search memory",
+    # Suggestions and reports
+    "suggest something", "what do you recommend", "what should i do now",
+    "productivity report", "give me a productivity report please", "export data",
+    "export data to csv", "open settings", "settings task",
+    # Habits
+    "add habit meditate daily", "add habit", "add habits", "mark habit read done",
+    "mark habit", "show habits", "what are my habits", "habit stats", "my habit stats",
+    "add habit stats daily", "show habits and tasks",
+    # Tasks
+    "remind me to call mom tomorrow", "add task buy milk high priority", "task review pr",
+    "todo list", "remember to water plants", "show tasks", "my tasks", "what are my tasks",
+    "list tasks", "complete task 2", "done with 1", "i finished 3", "mark complete 1",
+    "defer task 2 to tomorrow", "postpone task 1 by 3 days", "edit task 3 to buy oat milk",
+    "rename task 1 call dad", "complete task", "defer tasks", "add task edit task 2",
+    "task stats", "how many tasks do i have", "progress", "show my progress",
+    "completed tasks", "what i finished today", "task history", "multitasking",
+    # Memory, small talk and fallthrough
+    "what did we talk about", "remember our chat", "last time we spoke", "our conversation",
+    "hello", "hi", "hey there", "good morning", "good afternoon aura", "this is weird",
+    "how are you", "how do you do", "thank you", "thanks a lot", "ok", "", "   ",
+    "what is the weather", "play some music", "xyz", "SHOW TASKS", "  Hello AURA  ",
+    "Chat what's up", "suggestion box", "thanks for the task", "done", "whatever",
+]
+
+
+def generated_corpus(count, seed=7):
+    """Random commands stitched together from trigger phrases and filler"""
+    rng = random.Random(seed)
+    phrases = [phrase for _, _, rule_phrases in INTENT_RULES for phrase in rule_phrases]
+    filler = ['please', 'the', 'my', 'now', 'aura', 'x', 'today', '1', 'h', 'it', 'a']
+    commands = []
+    for _ in range(count):
+        parts = [rng.choice(phrases if rng.random() < 0.4 else filler) for _ in range(rng.randint(1, 5))]
+        joiner = rng.choice([' ', '', ' '])
+        commands.append(joiner.join(parts))
+    return commands
+
+
+def check_routing(commands):
+    mismatches = []
+    for command in commands:
+        # process_command() normalises before routing
+        normalised = command.lower().strip()
+        expected = expected_route(normalised)
+        actual = resolve_intent(normalised)
+        if expected != actual:
+            mismatches.append((command, expected, actual))
+    for command, intent in CHANGED_EXAMPLES:
+        if resolve_intent(command) != intent or legacy_route(command) == intent:
+            mismatches.append((command, f"{intent} (was {legacy_route(command)})", resolve_intent(command)))
+    return mismatches
+
+
+def throughput(router, commands, runs):
+    rates = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for command in commands:
+            router(command)
+        rates.append(len(commands) / (time.perf_counter() - start))
+    return statistics.median(rates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--generated', type=int, default=5000)
+    args = parser.parse_args()
+
+    commands = CORPUS + generated_corpus(args.generated)
+    mismatches = check_routing(commands)
+    if mismatches:
+        print(f"❌ {len(mismatches)} commands routed differently (command, expected, compiled):")
+        for mismatch in mismatches[:20]:
+            print(f"  {mismatch!r}")
+        return 1
+    print(f"✅ {len(commands):,} commands route as expected "
+          f"({len(CHANGED_EXAMPLES)} deliberate changes from the legacy chain)")
+
+    normalised = [command.lower().strip() for command in commands]
+    legacy = throughput(legacy_route, normalised, args.runs)
+    compiled = throughput(resolve_intent, normalised, args.runs)
+    default_only = [c for c in normalised if legacy_route(c) == 'default'] or ['what is the weather']
+    legacy_default = throughput(legacy_route, default_only, args.runs)
+    compiled_default = throughput(resolve_intent, default_only, args.runs)
+
+    print(f"\n{'':<22}{'legacy cmd/s':>14}{'compiled cmd/s':>16}")
+    print(f"{'whole corpus':<22}{legacy:>14,.0f}{compiled:>16,.0f}")
+    print(f"{'default branch only':<22}{legacy_default:>14,.0f}{compiled_default:>16,.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
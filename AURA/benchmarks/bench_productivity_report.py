@@ -0,0 +1,136 @@
+"""Latency of the "productivity report" before and after the analytics snapshot.
+
+Builds a throwaway database with --tasks rows (default 1M) spread over a year,
+then times:
+  before: the original three full analytics passes over tasks (30, 14, 7 days)
+  after:  the same report from one build_analytics_snapshot() over daily_rollup
+
+Run from the AURA directory:
+    python -m benchmarks.bench_productivity_report [--tasks 1000000] [--runs 5]
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from memory import database
+from memory.database import configure_pool, setup_database, get_connection, stop_checkpointer
+from memory.migrations import MIGRATIONS
+from brain.analytics import build_analytics_snapshot, generate_insights, get_productivity_score
+
+
+def build_database(path, task_count, habit_count=20, seed=42):
+    """Create the pre-migration schema, bulk load it, then let migrations index it"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    for step in MIGRATIONS[0][2]:
+        conn.execute(step)
+    conn.execute("PRAGMA user_version = 1")
+
+    def tasks():
+        for i in range(task_count):
+            yield (f"task {i}", rng.choice([None, rng.randint(-30, 30)]), rng.randint(1, 3),
+                   'completed' if rng.random() < 0.6 else 'pending', rng.randint(0, 364), rng.randint(0, 86399))
+
+    conn.executemany("""
+        INSERT INTO tasks (task_text, due_date, priority, status, created_at)
+        VALUES (?, CASE WHEN ?2 IS NULL THEN NULL ELSE datetime('now', ?2 || ' days') END,
+                ?3, ?4, datetime('now', '-' || ?5 || ' days', '-' || ?6 || ' seconds'))
+    """, tasks())
+    conn.executemany("INSERT INTO habits (habit_name, frequency, streak_count, total_completions) VALUES (?, 'daily', ?, ?)",
+                     [(f"habit {i}", rng.randint(0, 30), rng.randint(0, 300)) for i in range(habit_count)])
+    conn.commit()
+    conn.close()
+
+
+def legacy_analytics(days):
+    """The pre-rollup get_productivity_analytics: four queries over tasks"""
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT COUNT(*),
+                   SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN status = 'pending' AND due_date < datetime('now') THEN 1 ELSE 0 END)
+            FROM tasks WHERE created_at >= datetime('now', ?)
+        """, (f'-{days} days',))
+        task_stats = cur.fetchone()
+        cur.execute("SELECT COUNT(*), AVG(streak_count), MAX(streak_count) FROM habits")
+        habit_stats = cur.fetchone()
+        cur.execute("""
+            SELECT date(created_at) as day, COUNT(*) FROM tasks
+            WHERE status = 'completed' AND created_at >= datetime('now', ?)
+            GROUP BY day ORDER BY day
+        """, (f'-{days} days',))
+        daily_trends = cur.fetchall()
+        cur.execute("""
+            SELECT priority, COUNT(*) FROM tasks
+            WHERE created_at >= datetime('now', ?) GROUP BY priority
+        """, (f'-{days} days',))
+        priority_dist = cur.fetchall()
+        return task_stats, habit_stats, daily_trends, priority_dist
+    finally:
+        cur.close()
+        conn.close()
+
+
+def legacy_report():
+    legacy_analytics(30)
+    legacy_analytics(14)  # generate_insights()
+    legacy_analytics(7)   # get_productivity_score()
+
+
+def snapshot_report():
+    # What handle_productivity_report() does, minus the string formatting
+    snapshot = build_analytics_snapshot((30, 14, 7))
+    snapshot.analytics(30)
+    generate_insights(snapshot)
+    get_productivity_score(snapshot)
+
+
+def time_it(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="aura_bench_")
+    path = os.path.join(workdir, 'bench.db')
+    try:
+        print(f"Building database with {args.tasks:,} tasks...")
+        start = time.perf_counter()
+        build_database(path, args.tasks)
+        configure_pool(path)
+        setup_database()
+        stop_checkpointer()
+        print(f"  built and migrated in {time.perf_counter() - start:.1f}s")
+
+        snapshot_report()  # warm the overdue snapshot
+
+        before = time_it(legacy_report, args.runs)
+        after = time_it(snapshot_report, args.runs)
+
+        print(f"\n{'':<10}{'median ms':>12}{'best ms':>12}")
+        print(f"{'before':<10}{before[0]:>12.1f}{before[1]:>12.1f}")
+        print(f"{'after':<10}{after[0]:>12.1f}{after[1]:>12.1f}")
+        print(f"speed-up: {before[0] / max(after[0], 1e-6):.0f}x")
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
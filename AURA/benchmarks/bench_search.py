@@ -0,0 +1,116 @@
+"""Latency of memory.search over a large synthetic history.
+
+Builds a throwaway database with --rows conversation turns (plus a tenth
+as many tasks and a hundredth as many file summaries) through the normal
+inserts, so the FTS5 triggers index them as the app would, then times
+common, rare, multi-word and deep-page queries.
+
+Text is drawn from a Zipf-distributed vocabulary of VOCABULARY words, with
+the everyday words below placed around rank 100 so that, like real notes,
+"meeting" turns up in a few percent of turns. "stopword" queries the
+single most frequent word (in most turns): the worst case, bounded by
+memory.search.RANK_WINDOW.
+
+Run from the AURA directory:
+    python -m benchmarks.bench_search [--rows 1000000] [--runs 20]
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+WORDS = ("meeting project dentist budget report gym running email client launch review "
+         "deadline groceries python habit sleep reading invoice travel flight design "
+         "presentation family birthday doctor study exam coffee focus plan").split()
+RARE = ("zanzibar", "quokka", "mandolin")
+VOCABULARY = 20000
+
+QUERIES = [
+    ("stopword", "w0", 0),
+    ("common word", "meeting", 0),
+    ("two words", "project deadline", 0),
+    ("rare word", "zanzibar", 0),
+    ("prefix", "presen", 0),
+    ("no match", "xylophone", 0),
+    ("page 5", "budget report", 40),
+]
+
+
+def vocabulary():
+    """(words, cumulative Zipf weights), WORDS starting at rank 100"""
+    words = [f"w{i}" for i in range(VOCABULARY - len(WORDS))]
+    words[100:100] = WORDS
+    cumulative, total = [], 0.0
+    for rank in range(len(words)):
+        total += 1 / (rank + 1)
+        cumulative.append(total)
+    return words, cumulative
+
+
+def sentence(rng, length, vocab):
+    words = rng.choices(vocab[0], cum_weights=vocab[1], k=length)
+    if rng.random() < 0.0005:
+        words[rng.randrange(length)] = rng.choice(RARE)
+    return " ".join(words)
+
+
+def populate(conn, rows, seed=7):
+    rng = random.Random(seed)
+    vocab = vocabulary()
+    cur = conn.cursor()
+    chunk = 50000
+    for start in range(0, rows, chunk):
+        cur.executemany(
+            "INSERT INTO user_memory (user_input, ai_response, memory_type) VALUES (?, ?, 'conversation')",
+            [(sentence(rng, 8, vocab), sentence(rng, 20, vocab)) for _ in range(min(chunk, rows - start))]
+        )
+        conn.commit()
+    cur.executemany("INSERT INTO tasks (task_text, priority) VALUES (?, ?)",
+                    [(sentence(rng, 5, vocab), rng.randint(1, 3)) for _ in range(rows // 10)])
+    cur.executemany("INSERT INTO file_memory (file_path, content_summary) VALUES (?, ?)",
+                    [(f"/docs/file_{i}.txt", sentence(rng, 30, vocab)) for i in range(rows // 100)])
+    conn.commit()
+    cur.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000, help="conversation turns")
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="aura_search_")
+    try:
+        from memory.database import configure_pool, setup_database, stop_checkpointer, get_connection
+        configure_pool(os.path.join(workdir, 'search.db'))
+        setup_database()
+        stop_checkpointer()
+
+        conn = get_connection()
+        start = time.perf_counter()
+        populate(conn, args.rows)
+        conn.close()
+        print(f"indexed {args.rows} turns in {time.perf_counter() - start:.1f}s")
+
+        from memory.search import search
+        print(f"\n{'query':<14}{'results':>9}{'median ms':>11}{'p95 ms':>9}")
+        for name, query, offset in QUERIES:
+            timings = []
+            for _ in range(args.runs):
+                begin = time.perf_counter()
+                page = search(query, limit=10, offset=offset)
+                timings.append((time.perf_counter() - begin) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{name:<14}{len(page['results']):>9}{statistics.median(timings):>11.2f}{p95:>9.2f}")
+    finally:
+        from memory.conversation_logger import get_conversation_logger
+        get_conversation_logger().stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""Load test: the development server against serve.py's production servers.
+
+Starts each server in turn as a subprocess on a throwaway database (2,000
+tasks, 20 habits) with the mock LLM behind the chat endpoint:
+  dev        web/app.py's app.run(debug=True), without the reloader
+  werkzeug   serve.py --server werkzeug
+  waitress   serve.py --server waitress   (if installed)
+  gunicorn   serve.py --server gunicorn   (if installed, POSIX only)
+Then it drives a mix of GET /api/tasks, /api/habits and /api/analytics
+with one POST /api/chat in seven from --concurrency clients. Each client holds one
+persistent HTTP/1.1 connection, the way browsers and proxies do, so the
+numbers include whether the server keeps connections alive.
+
+Run from the AURA directory:
+    python -m benchmarks.bench_serve [--concurrency 1,8,32] [--requests 400]
+"""
+import argparse
+import http.client
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.load_test_chat import percentile
+from benchmarks.mock_llm_server import start_mock_server
+
+AURA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVERS = ('dev', 'werkzeug', 'waitress', 'gunicorn')
+MIX = [
+    ('GET', '/api/tasks?limit=50', None),
+    ('GET', '/api/habits', None),
+    ('GET', '/api/analytics', None),
+    ('GET', '/api/tasks?limit=20&status=pending', None),
+    ('GET', '/api/habits?fields=name,streak', None),
+    ('GET', '/api/analytics', None),
+    ('POST', '/api/chat', 'chat'),
+]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def seed(workdir, base_url):
+    with open(os.path.join(workdir, 'aura_config.json'), 'w') as f:
+        json.dump({'openai_api_key': 'sk-mock', 'openai_base_url': base_url, 'openai_max_concurrency': 64,
+                   'voice_enabled': False, 'response_cache_enabled': False, 'local_model_enabled': False}, f)
+    code = (
+        "from memory.database import setup_database, close_all_connections, stop_checkpointer\n"
+        "from brain.task_manager import add_tasks_bulk\n"
+        "from brain.habit_tracker import add_habits_bulk\n"
+        "setup_database()\n"
+        "add_tasks_bulk({'text': f'task {i}', 'priority': i % 3 + 1} for i in range(2000))\n"
+        "add_habits_bulk({'name': f'habit {i}'} for i in range(20))\n"
+        "stop_checkpointer()\n"
+        "close_all_connections()\n"
+    )
+    subprocess.run([sys.executable, '-c', code], cwd=workdir, env=_env(), check=True, stdout=subprocess.DEVNULL)
+
+
+def _env():
+    return dict(os.environ, PYTHONPATH=AURA_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''))
+
+
+def start_server(name, port, workdir, threads):
+    if name == 'dev':
+        command = [sys.executable, '-c', "from web.app import app; "
+                   f"app.run(port={port}, debug=True, use_reloader=False)"]
+    else:
+        command = [sys.executable, os.path.join(AURA_DIR, 'serve.py'), '--server', name,
+                   '--port', str(port), '--threads', str(threads)]
+    process = subprocess.Popen(command, cwd=workdir, env=_env(),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/api/habits')
+            if conn.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{name} did not start")
+
+
+def run_level(port, concurrency, total):
+    counter = iter(range(total))
+    lock = threading.Lock()
+    latencies, errors, connections = [], [0], [0]
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                conn.close()
+                return
+            method, path, chat = MIX[i % len(MIX)]
+            body = json.dumps({'message': f"chat load test question {i}"}) if chat else None
+            start = time.perf_counter()
+            try:
+                if conn.sock is None:
+                    with lock:
+                        connections[0] += 1
+                conn.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+                response = conn.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(client)
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'errors': errors[0],
+        'connections': connections[0],
+        'throughput': len(latencies) / wall if wall else 0,
+        'p50': percentile(latencies, 50) * 1000,
+        'p95': percentile(latencies, 95) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+    }
+
+
+def installed(name):
+    if name in ('dev', 'werkzeug'):
+        return True
+    if name == 'gunicorn' and os.name != 'posix':
+        return False
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', default='1,8,32', help="comma-separated levels")
+    parser.add_argument('--requests', type=int, default=400, help="requests per level and server")
+    parser.add_argument('--servers', default=','.join(SERVERS))
+    parser.add_argument('--threads', type=int, default=16, help="serve.py --threads")
+    parser.add_argument('--latency', type=float, default=50, help="mock LLM time to first token, ms")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(',')]
+    servers = [name for name in args.servers.split(',') if installed(name)]
+
+    _, base_url = start_mock_server(port=0, latency=args.latency, jitter=10, tokens_per_second=5000)
+    workdir = tempfile.mkdtemp(prefix="aura_serve_")
+    try:
+        seed(workdir, base_url)
+        print(f"\n{'server':<10}{'conc':>6}{'conns':>7}{'errors':>8}{'req/s':>9}"
+              f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name in servers:
+            port = free_port()
+            process = start_server(name, port, workdir, args.threads)
+            try:
+                for level in levels:
+                    result = run_level(port, level, args.requests)
+                    print(f"{name:<10}{level:>6}{result['connections']:>7}{result['errors']:>8}"
+                          f"{result['throughput']:>9.1f}{result['p50']:>10.1f}{result['p95']:>10.1f}"
+                          f"{result['p99']:>10.1f}")
+            finally:
+                process.send_signal(signal.SIGTERM)
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""Query latency and recall of the semantic memory store, flat vs IVF.
+
+Fills a throwaway memory.vector_store.VectorStore with --rows synthetic
+embeddings (noisy points around --clusters topic centres, as real
+conversations bunch around recurring subjects) and queries it with noisy
+copies of stored rows:
+  flat     exact top-k, one query at a time and in batches of --batch
+  ivf      approximate top-k after build_ivf(), with recall@k against flat
+The embedder is bypassed (add_vectors), so this measures the index only.
+
+Run from the AURA directory:
+    python -m benchmarks.bench_vector_memory [--rows 200000] [--queries 200]
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from memory.vector_store import DIM, VectorStore, _normalize_rows
+
+
+class _NoEmbedder:
+    name = 'bench'
+    dim = DIM
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--clusters', type=int, default=500)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=32)
+    parser.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    centres = _normalize_rows(rng.standard_normal((args.clusters, DIM)).astype(np.float32))
+    workdir = tempfile.mkdtemp(prefix="aura_vectors_")
+    try:
+        store = VectorStore(path=workdir, embedder=_NoEmbedder(), index='flat').open()
+        start = time.perf_counter()
+        for begin in range(0, args.rows, 50000):
+            n = min(50000, args.rows - begin)
+            points = centres[rng.integers(0, args.clusters, n)] + 0.08 * rng.standard_normal((n, DIM))
+            store.add_vectors('user_memory', range(begin + 1, begin + n + 1), _normalize_rows(points.astype(np.float32)))
+        print(f"stored {store.count} vectors ({store.count * DIM * 4 / 1e6:.0f} MB) "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        picks = rng.integers(0, store.count, args.queries)
+        queries = _normalize_rows(np.asarray(store.vectors[picks]) + 0.02 * rng.standard_normal((args.queries, DIM)))
+        queries = queries.astype(np.float32)
+
+        # Query vectors go straight to the search internals (no embedding)
+        def flat(q):
+            return store._search_flat(store.vectors, store.keys, store.count, q, args.k, None)
+
+        single = [timed(lambda q=q: flat(q[None, :]))[1] for q in queries]
+        exact, batch_ms = [], 0.0
+        for begin in range(0, len(queries), args.batch):
+            result, ms = timed(lambda: flat(queries[begin:begin + args.batch]))
+            exact.extend(result)
+            batch_ms += ms
+
+        _, build_ms = timed(store.build_ivf)
+        ivf_ms, hits = [], 0
+        for q, truth in zip(queries, exact):
+            result, ms = timed(lambda q=q: store._search_ivf(store.vectors, store.keys, store.ivf,
+                                                            store.count, q, args.k, None))
+            ivf_ms.append(ms)
+            hits += len({r[2] for r in result} & {t[2] for t in truth})
+
+        print(f"\n{'mode':<22}{'median ms':>10}{'queries/s':>11}")
+        print(f"{'flat, single':<22}{statistics.median(single):>10.2f}{1000 / statistics.mean(single):>11.0f}")
+        print(f"{f'flat, batch of {args.batch}':<22}{batch_ms / len(queries):>10.2f}"
+              f"{len(queries) / batch_ms * 1000:>11.0f}")
+        print(f"{'ivf, single':<22}{statistics.median(ivf_ms):>10.2f}{1000 / statistics.mean(ivf_ms):>11.0f}")
+        print(f"\nivf build {build_ms / 1000:.1f}s, recall@{args.k} {hits / (args.k * len(queries)):.3f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
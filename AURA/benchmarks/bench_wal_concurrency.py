@@ -0,0 +1,110 @@
+"""Read throughput while conversations are being written, per storage profile.
+
+Run from the AURA directory:
+    python -m benchmarks.bench_wal_concurrency [--seconds 5] [--readers 4]
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from memory import database
+from memory.database import configure_pool, setup_database, get_connection, stop_checkpointer
+
+
+def seed(rows):
+    conn = get_connection()
+    conn.executemany(
+        "INSERT INTO user_memory (user_input, ai_response, memory_type) VALUES (?, ?, 'conversation')",
+        [(f"message {i}", f"response {i}") for i in range(rows)]
+    )
+    conn.executemany(
+        "INSERT INTO tasks (task_text, priority) VALUES (?, ?)",
+        [(f"task {i}", i % 3 + 1) for i in range(rows)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def writer(stop, counters):
+    # Same shape as save_conversation(): one row, one commit
+    while not stop.is_set():
+        conn = get_connection()
+        try:
+            conn.execute("INSERT INTO user_memory (user_input, ai_response, memory_type) VALUES (?, ?, ?)",
+                         ("hello", "hi there", "conversation"))
+            conn.commit()
+            counters['writes'] += 1
+        except sqlite3.OperationalError:
+            counters['write_errors'] += 1
+        finally:
+            conn.close()
+
+
+def reader(stop, counters, lock):
+    reads = errors = 0
+    while not stop.is_set():
+        conn = get_connection()
+        try:
+            conn.execute("SELECT user_input, ai_response, timestamp FROM user_memory "
+                         "ORDER BY timestamp DESC LIMIT 5").fetchall()
+            conn.execute("SELECT COUNT(*) FROM tasks WHERE status = 'pending'").fetchone()
+            reads += 1
+        except sqlite3.OperationalError:
+            errors += 1
+        finally:
+            conn.close()
+    with lock:
+        counters['reads'] += reads
+        counters['read_errors'] += errors
+
+
+def run_profile(profile, seconds, readers, rows):
+    workdir = tempfile.mkdtemp(prefix="aura_bench_")
+    try:
+        configure_pool(os.path.join(workdir, 'bench.db'), max_size=readers + 2, profile=profile)
+        setup_database()
+        stop_checkpointer()
+        seed(rows)
+
+        counters = {'reads': 0, 'read_errors': 0, 'writes': 0, 'write_errors': 0}
+        stop = threading.Event()
+        lock = threading.Lock()
+        threads = [threading.Thread(target=writer, args=(stop, counters))]
+        threads += [threading.Thread(target=reader, args=(stop, counters, lock)) for _ in range(readers)]
+
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        return counters
+    finally:
+        database.close_all_connections()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--profiles', nargs='+', default=['legacy', 'wal'])
+    args = parser.parse_args()
+
+    results = [(profile, run_profile(profile, args.seconds, args.readers, args.rows))
+               for profile in args.profiles]
+
+    print(f"\n{'profile':<10}{'reads/s':>12}{'writes/s':>12}{'read errs':>12}{'write errs':>12}")
+    for profile, c in results:
+        print(f"{profile:<10}{c['reads'] / args.seconds:>12.0f}{c['writes'] / args.seconds:>12.0f}"
+              f"{c['read_errors']:>12}{c['write_errors']:>12}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""Load test the chat endpoints against the mock LLM.
+
+Drives POST /api/chat on the web dashboard (web/app.py) and on the REST API
+(aura_api.py ChatAPI) at each --concurrency level and reports throughput and
+p50/p95/p99 latency. By default everything runs in-process and offline: a
+mock LLM (benchmarks.mock_llm_server), both Flask apps on ephemeral ports, a
+throwaway database and a throwaway config pointing openai_base_url at the
+mock. Pass --web-url / --api-url to hit servers you started yourself.
+
+Messages start with "chat " so they take the AI path. --distinct sets how
+many different prompts are cycled through (lower = more cache hits and
+coalescing); --cache turns the response cache on.
+
+Run from the AURA directory:
+    python -m benchmarks.load_test_chat [--concurrency 1,4,16] [--requests 200]
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.mock_llm_server import start_mock_server
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a sorted list"""
+    if not samples:
+        return 0
+    rank = max(1, math.ceil(pct / 100 * len(samples)))
+    return samples[rank - 1]
+
+
+def post_chat(url, message, timeout=60):
+    request = urllib.request.Request(
+        url, data=json.dumps({'message': message}).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST'
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        body = json.loads(response.read())
+        ok = response.status == 200 and 'response' in body
+    return time.perf_counter() - start, ok
+
+
+def run_level(url, concurrency, total, distinct):
+    counter = iter(range(total))
+    lock = threading.Lock()
+    latencies = []
+    errors = [0]
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            try:
+                elapsed, ok = post_chat(url, f"chat load test question {i % distinct}")
+            except Exception:
+                elapsed, ok = None, False
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': total,
+        'errors': errors[0],
+        'throughput': len(latencies) / wall if wall else 0,
+        'p50': percentile(latencies, 50) * 1000,
+        'p95': percentile(latencies, 95) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+        'mean': (statistics.mean(latencies) * 1000) if latencies else 0,
+    }
+
+
+def start_apps(args, workdir):
+    """Mock LLM, throwaway config/database and both Flask apps, in-process"""
+    from werkzeug.serving import make_server
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    _, base_url = start_mock_server(
+        port=0, latency=args.latency, jitter=args.jitter,
+        tokens_per_second=args.tokens_per_second, error_rate=args.error_rate
+    )
+
+    os.chdir(workdir)
+    with open('aura_config.json', 'w') as f:
+        json.dump({
+            'openai_api_key': 'sk-mock',
+            'openai_base_url': base_url,
+            'openai_max_concurrency': args.llm_concurrency,
+            'response_cache_enabled': args.cache,
+            'voice_enabled': False,
+        }, f)
+
+    from memory.database import configure_pool, setup_database, stop_checkpointer
+    configure_pool(os.path.join(workdir, 'load.db'))
+    setup_database()
+    stop_checkpointer()
+
+    from web.app import app as web_app
+    from aura_api import app as api_app
+
+    urls = {}
+    for name, app in (('web', web_app), ('api', api_app)):
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        urls[name] = f"http://127.0.0.1:{server.server_port}/api/chat"
+    return urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', default='1,4,16', help="comma-separated levels")
+    parser.add_argument('--requests', type=int, default=200, help="requests per level and target")
+    parser.add_argument('--targets', default='web,api')
+    parser.add_argument('--distinct', type=int, default=1_000_000, help="distinct prompts to cycle through")
+    parser.add_argument('--cache', action='store_true', help="enable the response cache")
+    parser.add_argument('--web-url', help="existing web dashboard /api/chat URL")
+    parser.add_argument('--api-url', help="existing REST API /api/chat URL")
+    parser.add_argument('--llm-concurrency', type=int, default=4, help="openai_max_concurrency")
+    parser.add_argument('--latency', type=float, default=300, help="mock time to first token, ms")
+    parser.add_argument('--jitter', type=float, default=50, help="mock latency jitter, ms")
+    parser.add_argument('--tokens-per-second', type=float, default=200)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(',')]
+    targets = [target.strip() for target in args.targets.split(',')]
+
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="aura_load_")
+    try:
+        if args.web_url or args.api_url:
+            urls = {'web': args.web_url, 'api': args.api_url}
+        else:
+            urls = start_apps(args, workdir)
+
+        print(f"\n{'target':<8}{'conc':>6}{'reqs':>7}{'errors':>8}{'req/s':>9}"
+              f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for target in targets:
+            if not urls.get(target):
+                continue
+            for level in levels:
+                result = run_level(urls[target], level, args.requests, args.distinct)
+                print(f"{target:<8}{level:>6}{result['requests']:>7}{result['errors']:>8}"
+                      f"{result['throughput']:>9.1f}{result['p50']:>10.1f}{result['p95']:>10.1f}{result['p99']:>10.1f}")
+    finally:
+        os.chdir(cwd)
+        from memory.conversation_logger import get_conversation_logger
+        get_conversation_logger().stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
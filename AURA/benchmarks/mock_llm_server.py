@@ -0,0 +1,221 @@
+"""Local OpenAI-compatible stand-in for the chat completions API.
+
+Serves POST /v1/chat/completions (plain and stream=true server-sent events)
+and GET /v1/models with synthetic replies, so the AI paths can be exercised
+and load tested offline. Point AURA at it with
+    "openai_base_url": "http://127.0.0.1:8765/v1"
+(any non-empty openai_api_key works).
+
+Behaviour knobs:
+  --latency MS      time to first token
+  --jitter MS       uniform random extra latency, 0..jitter
+  --tokens-per-second N   generation speed after the first token (0 = instant)
+  --reply-tokens N  words per reply
+  --error-rate F    fraction of requests answered with --error-status
+  --error-status N  500 (server error) or 429 (rate limited)
+
+Batch prompts from integrations.batch_ai get a well-formed JSON array
+answer (one object per numbered item) instead of random words.
+
+Run from the AURA directory:
+    python -m benchmarks.mock_llm_server [--port 8765] [--latency 300] ...
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+WORDS = ("focus plan habit task progress small steps daily review goal energy "
+         "break schedule priority momentum routine").split()
+
+
+class MockSettings:
+    def __init__(self, latency=300, jitter=0, tokens_per_second=50, reply_tokens=40,
+                 error_rate=0.0, error_status=500, seed=None):
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.tokens_per_second = tokens_per_second
+        self.reply_tokens = reply_tokens
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'streams': 0, 'errors': 0, 'tokens': 0}
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def random(self):
+        with self.lock:
+            return self.rng.random()
+
+
+def reply_words(messages, count):
+    """Deterministic reply for a prompt: same messages, same words"""
+    prompt = ' '.join(str(m.get('content', '')) for m in messages)
+    rng = random.Random(prompt)
+    words = [rng.choice(WORDS) for _ in range(max(count, 1))]
+    words[0] = words[0].capitalize()
+    return [word + ('.' if (i + 1) % 12 == 0 or i == len(words) - 1 else '') for i, word in enumerate(words)]
+
+
+_BATCH_FIELD_RE = re.compile(r'JSON array of \{"id": <item number>, "(\w+)"')
+_BATCH_ITEM_RE = re.compile(r'^\[(\d+)\] ', re.MULTILINE)
+
+
+def batch_reply(messages):
+    """JSON array answer to an integrations.batch_ai prompt, else None"""
+    match = _BATCH_FIELD_RE.search(str(messages[0].get('content', ''))) if messages else None
+    if not match:
+        return None
+    field = match.group(1)
+    items = _BATCH_ITEM_RE.findall(str(messages[-1].get('content', '')))
+    rng = random.Random(str(messages))
+    answers = []
+    for item in items:
+        if field == 'sentiment':
+            value = rng.choice(('positive', 'negative', 'neutral'))
+        else:
+            value = ' '.join(rng.choice(WORDS) for _ in range(8)).capitalize() + '.'
+        answers.append({'id': int(item), field: value})
+    return json.dumps(answers)
+
+
+def estimate_tokens(messages):
+    return sum(len(str(m.get('content', ''))) // 4 + 4 for m in messages)
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    settings = MockSettings()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            self._send_json(200, {'object': 'list', 'data': [
+                {'id': 'gpt-3.5-turbo', 'object': 'model', 'created': 0, 'owned_by': 'mock'}
+            ]})
+        else:
+            self._send_json(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': {'message': 'invalid JSON'}})
+            return
+
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'not found'}})
+            return
+
+        settings = self.settings
+        settings.count('requests')
+        time.sleep(settings.latency + settings.jitter * settings.random())
+
+        if settings.error_rate and settings.random() < settings.error_rate:
+            settings.count('errors')
+            self._send_json(settings.error_status, {'error': {
+                'message': 'mock failure', 'type': 'rate_limit_error' if settings.error_status == 429 else 'server_error'
+            }})
+            return
+
+        messages = request.get('messages', [])
+        count = min(request.get('max_tokens') or settings.reply_tokens, settings.reply_tokens)
+        batch = batch_reply(messages)
+        words = batch.split(' ') if batch else reply_words(messages, count)
+        settings.count('tokens', len(words))
+        model = request.get('model', 'gpt-3.5-turbo')
+
+        if request.get('stream'):
+            settings.count('streams')
+            self._stream(model, words)
+            return
+
+        if settings.tokens_per_second:
+            time.sleep(len(words) / settings.tokens_per_second)
+        prompt_tokens = estimate_tokens(messages)
+        self._send_json(200, {
+            'id': 'chatcmpl-mock', 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ' '.join(words)},
+                         'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': len(words),
+                      'total_tokens': prompt_tokens + len(words)}
+        })
+
+    def _stream(self, model, words):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        delay = 1 / self.settings.tokens_per_second if self.settings.tokens_per_second else 0
+        for i, word in enumerate(words):
+            chunk = {
+                'id': 'chatcmpl-mock', 'object': 'chat.completion.chunk', 'created': int(time.time()), 'model': model,
+                'choices': [{'index': 0, 'delta': {'content': word if i == 0 else ' ' + word}, 'finish_reason': None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            if delay and i < len(words) - 1:
+                time.sleep(delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def start_mock_server(host='127.0.0.1', port=8765, **settings):
+    """Start the server on a daemon thread; returns (server, base_url)"""
+    handler = type('ConfiguredMockLLMHandler', (MockLLMHandler,), {'settings': MockSettings(**settings)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-llm", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=300)
+    parser.add_argument('--jitter', type=float, default=0)
+    parser.add_argument('--tokens-per-second', type=float, default=50)
+    parser.add_argument('--reply-tokens', type=int, default=40)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=500, choices=[429, 500])
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(
+        args.host, args.port, latency=args.latency, jitter=args.jitter,
+        tokens_per_second=args.tokens_per_second, reply_tokens=args.reply_tokens,
+        error_rate=args.error_rate, error_status=args.error_status
+    )
+    print(f"🧪 Mock LLM serving {base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stats = server.RequestHandlerClass.settings.stats
+        print(f"\n{stats['requests']} requests, {stats['streams']} streamed, "
+              f"{stats['errors']} errors, {stats['tokens']} tokens generated")
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -1,36 +1,88 @@
 import random
-from integrations.openai_client import chat_with_gpt, summarize_text, generate_content
+from integrations.openai_client import chat_with_gpt, stream_chat_with_gpt, summarize_text, generate_content
+from brain.local_model import get_local_model
+from utils.config_manager import get_config
 
+# Context about AURA for better responses
+AURA_CONTEXT = "You are AURA, a helpful AI personal assistant focused on productivity, task management, and personal development. Be concise, helpful, and encouraging."
 
-def chat_with_ai(message):
+GPT_FALLBACK_PREFIX = "I'd be happy to help with that!"
+
+LEARNING_RESPONSES = [
+    "Learning is a journey! What specific topic interests you?",
+    "Continuous learning is key to growth. I can help you create a study plan!",
+    "That's great! Breaking learning into daily habits works best."
+]
+
+PRODUCTIVITY_RESPONSES = [
+    "Try time-blocking: schedule specific times for different types of work.",
+    "The Pomodoro technique (25min work, 5min break) boosts focus significantly.",
+    "Prioritize tasks using the Eisenhower Matrix - focus on what's important!"
+]
+
+
+def local_reply(message):
+    """Answer from the offline model (brain.local_model), or None"""
+    model = get_local_model()
+    if model is None:
+        return None
+    config = get_config()
+    return model.answer(message, config.get('local_model_threshold', 0.8), config.get('local_model_min_support', 2))
+
+
+def is_canned_reply(message, response):
+    """Whether response is one of the offline fallbacks rather than a real answer"""
+    return (response.startswith(GPT_FALLBACK_PREFIX) or f"'{message}'" in response
+            or response in LEARNING_RESPONSES or response in PRODUCTIVITY_RESPONSES)
+
+
+def chat_with_ai(message, use_local=True):
     """Enhanced AI chat with real GPT integration"""
 
+    # Frequent questions are answered offline, without a network call
+    if use_local:
+        response = local_reply(message)
+        if response:
+            return response
+
     # Use real AI if available, otherwise fallback to basic responses
     try:
-        # Add context about AURA for better responses
-        context = "You are AURA, a helpful AI personal assistant focused on productivity, task management, and personal development. Be concise, helpful, and encouraging."
-
-        response = chat_with_gpt(message, context)
+        response = chat_with_gpt(message, AURA_CONTEXT)
         if response and not response.startswith("AI error"):
             return response
     except:
         pass  # Fall back to basic responses
 
-    # Fallback basic responses
+    return basic_response(message)
+
+
+def stream_chat_with_ai(message, use_local=True):
+    """chat_with_ai() that yields the reply as it is generated"""
+    if use_local:
+        response = local_reply(message)
+        if response:
+            yield response
+            return
+
+    started = False
+    try:
+        for delta in stream_chat_with_gpt(message, AURA_CONTEXT):
+            started = True
+            yield delta
+    except:
+        if started:
+            return
+        yield basic_response(message)
+
+
+def basic_response(message):
+    """Fallback reply when GPT is unavailable"""
     message_lower = message.lower()
 
     if any(word in message_lower for word in ['learn', 'study', 'education']):
-        responses = [
-            "Learning is a journey! What specific topic interests you?",
-            "Continuous learning is key to growth. I can help you create a study plan!",
-            "That's great! Breaking learning into daily habits works best."
-        ]
+        responses = LEARNING_RESPONSES
     elif any(word in message_lower for word in ['productive', 'efficient', 'work']):
-        responses = [
-            "Try time-blocking: schedule specific times for different types of work.",
-            "The Pomodoro technique (25min work, 5min break) boosts focus significantly.",
-            "Prioritize tasks using the Eisenhower Matrix - focus on what's important!"
-        ]
+        responses = PRODUCTIVITY_RESPONSES
     else:
         responses = [
             f"I understand you're asking about '{message}'. How can I help you take action on this?",
@@ -56,7 +108,8 @@ def get_ai_insights():
     """Generate AI-powered productivity insights"""
     try:
         prompt = "Give one concise, encouraging productivity insight or tip (max 2 sentences)"
-        insight = chat_with_gpt(prompt, "You are a productivity coach")
+        # No history: a fixed prompt keeps this answer cacheable
+        insight = chat_with_gpt(prompt, "You are a productivity coach", history=False)
         if insight and not insight.startswith("AI error"):
             return f"💡 {insight}"
     except:
@@ -1,116 +1,239 @@
 from memory.database import get_connection
+from brain.stats_engine import get_habit_counters
+from utils.cache import cached
 from datetime import datetime, timedelta
+from types import MappingProxyType
+import copy
 import statistics
 
 
-def get_productivity_analytics(days=30):
-    """Get comprehensive productivity analytics"""
+# How stale the rollup's overdue_snapshot may get before analytics refreshes
+# it. Writes keep it current; this only catches tasks that became overdue
+# simply because time passed.
+OVERDUE_REFRESH_SECONDS = 300
+
+ROLLUP_WINDOW_SQL = """
+    SELECT day, tasks_created, tasks_completed,
+           priority_low, priority_medium, priority_high, priority_other,
+           habit_completions, overdue_snapshot
+    FROM daily_rollup
+    WHERE day >= date('now', ?)
+    ORDER BY day
+"""
+
+
+def empty_analytics(days):
+    return {
+        'period_days': days,
+        'tasks': {'total': 0, 'completed': 0, 'overdue': 0, 'completion_rate': 0},
+        'habits': {'total': 0, 'average_streak': 0, 'best_streak': 0},
+        'daily_trends': [],
+        'priority_breakdown': []
+    }
+
+
+def refresh_overdue_snapshot(force=False):
+    """Catch-up job: recount overdue pending tasks per creation day"""
     conn = get_connection()
     if conn is None:
-        return {
-            'period_days': days,
-            'tasks': {'total': 0, 'completed': 0, 'overdue': 0, 'completion_rate': 0},
-            'habits': {'total': 0, 'average_streak': 0, 'best_streak': 0},
-            'daily_trends': [],
-            'priority_breakdown': []
-        }
+        return False
 
     cur = conn.cursor()
 
     try:
-        # Task completion rate
+        if not force:
+            cur.execute("""
+                SELECT overdue_refreshed_at IS NOT NULL
+                   AND overdue_refreshed_at >= datetime('now', ?)
+                FROM rollup_state WHERE id = 1
+            """, (f'-{OVERDUE_REFRESH_SECONDS} seconds',))
+            row = cur.fetchone()
+            if row and row[0]:
+                return False
+
+        # Only pending overdue tasks are read, through idx_tasks_status_due
         cur.execute("""
-            SELECT 
-                COUNT(*) as total_tasks,
-                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed_tasks,
-                SUM(CASE WHEN status = 'pending' AND due_date < datetime('now') THEN 1 ELSE 0 END) as overdue_tasks
+            SELECT date(created_at), COUNT(*)
             FROM tasks
-            WHERE created_at >= datetime('now', ?)
-        """, (f'-{days} days',))
+            WHERE status = 'pending' AND due_date < datetime('now')
+            GROUP BY date(created_at)
+        """)
+        overdue = cur.fetchall()
 
-        task_stats = cur.fetchone()
+        cur.execute("UPDATE daily_rollup SET overdue_snapshot = 0 WHERE overdue_snapshot != 0")
+        cur.executemany("UPDATE daily_rollup SET overdue_snapshot = ? WHERE day = ?",
+                        [(count, day) for day, count in overdue])
+        cur.execute("UPDATE rollup_state SET overdue_refreshed_at = datetime('now') WHERE id = 1")
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"Overdue snapshot refresh skipped: {e}")
+        return False
+    finally:
+        cur.close()
+        conn.close()
 
-        # Habit consistency
-        cur.execute("""
-            SELECT 
-                COUNT(*) as total_habits,
-                AVG(streak_count) as avg_streak,
-                MAX(streak_count) as max_streak
-            FROM habits
-        """)
 
-        habit_stats = cur.fetchone()
+def rebuild_daily_rollup():
+    """Recompute daily_rollup from the raw tasks and habit_logs tables"""
+    conn = get_connection()
+    if conn is None:
+        return False
 
-        # Daily completion trends
-        cur.execute("""
-            SELECT 
-                date(created_at) as day,
-                COUNT(*) as tasks_completed
-            FROM tasks 
-            WHERE status = 'completed' 
-            AND created_at >= datetime('now', ?)
-            GROUP BY day
-            ORDER BY day
-        """, (f'-{days} days',))
-
-        daily_trends = cur.fetchall()
-
-        # Priority distribution
+    cur = conn.cursor()
+
+    try:
+        cur.execute("BEGIN IMMEDIATE")
+        cur.execute("DELETE FROM daily_rollup")
         cur.execute("""
-            SELECT 
-                priority,
-                COUNT(*) as count
+            INSERT INTO daily_rollup
+                (day, tasks_created, tasks_completed, priority_low, priority_medium,
+                 priority_high, priority_other)
+            SELECT date(created_at), COUNT(*), IFNULL(SUM(status = 'completed'), 0),
+                   IFNULL(SUM(priority = 1), 0), IFNULL(SUM(priority = 2), 0),
+                   IFNULL(SUM(priority = 3), 0), SUM(priority IS NULL OR priority NOT IN (1, 2, 3))
             FROM tasks
-            WHERE created_at >= datetime('now', ?)
-            GROUP BY priority
-        """, (f'-{days} days',))
-
-        priority_dist = cur.fetchall()
-
-        total_tasks = task_stats[0] or 0
-        completed_tasks = task_stats[1] or 0
-        completion_rate = round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 1)
-
-        analytics = {
-            'period_days': days,
-            'tasks': {
-                'total': total_tasks,
-                'completed': completed_tasks,
-                'overdue': task_stats[2] or 0,
-                'completion_rate': completion_rate
-            },
-            'habits': {
-                'total': habit_stats[0] or 0,
-                'average_streak': round(habit_stats[1] or 0, 1),
-                'best_streak': habit_stats[2] or 0
-            },
-            'daily_trends': [
-                {'date': trend[0], 'completed': trend[1]} for trend in daily_trends
-            ],
-            'priority_breakdown': [
-                {'priority': dist[0], 'count': dist[1]} for dist in priority_dist
-            ]
-        }
-
-        return analytics
+            WHERE created_at IS NOT NULL
+            GROUP BY date(created_at)
+        """)
+        cur.execute("""
+            INSERT INTO daily_rollup (day, habit_completions)
+            SELECT completed_date, COUNT(*)
+            FROM habit_logs
+            WHERE completed_date IS NOT NULL
+            GROUP BY completed_date
+            ON CONFLICT (day) DO UPDATE SET habit_completions = excluded.habit_completions
+        """)
+        cur.execute("UPDATE rollup_state SET overdue_refreshed_at = NULL WHERE id = 1")
+        conn.commit()
+    except Exception as e:
+        print(f"Error rebuilding daily rollup: {e}")
+        return False
+    finally:
+        cur.close()
+        conn.close()
+
+    return refresh_overdue_snapshot(force=True)
+
 
+class AnalyticsSnapshot:
+    """Immutable analytics for several windows, built from a single read.
+
+    analytics(days) hands out a fresh copy, so callers can't alter what
+    other readers of the same snapshot see.
+    """
+
+    __slots__ = ('_windows',)
+
+    def __init__(self, windows):
+        object.__setattr__(self, '_windows', MappingProxyType(dict(windows)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AnalyticsSnapshot is immutable")
+
+    @property
+    def windows(self):
+        return tuple(sorted(self._windows))
+
+    def analytics(self, days):
+        return copy.deepcopy(self._windows[days])
+
+
+def _summarize_window(rows, days, habit_stats):
+    total_tasks = completed_tasks = overdue_tasks = 0
+    priorities = {1: 0, 2: 0, 3: 0, 'other': 0}
+    daily_trends = []
+
+    for day, created, completed, low, medium, high, other, habit_done, overdue in rows:
+        total_tasks += created
+        completed_tasks += completed
+        overdue_tasks += overdue
+        priorities[1] += low
+        priorities[2] += medium
+        priorities[3] += high
+        priorities['other'] += other
+        if completed > 0:
+            daily_trends.append({'date': day, 'completed': completed})
+
+    completion_rate = round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 1)
+
+    return {
+        'period_days': days,
+        'tasks': {
+            'total': total_tasks,
+            'completed': completed_tasks,
+            'overdue': overdue_tasks,
+            'completion_rate': completion_rate
+        },
+        'habits': {
+            'total': habit_stats['total_habits'],
+            'average_streak': habit_stats['average_streak'],
+            'best_streak': habit_stats['best_streak']
+        },
+        'daily_trends': daily_trends,
+        'priority_breakdown': [
+            {'priority': priority, 'count': count} for priority, count in priorities.items() if count > 0
+        ]
+    }
+
+
+def build_analytics_snapshot(windows=(30, 14, 7)):
+    """Answer every window from one read of daily_rollup and one of habits.
+
+    Each window covers today plus the previous days - 1 UTC days.
+    """
+    windows = sorted({max(int(days), 1) for days in windows})
+    longest = windows[-1]
+    refresh_overdue_snapshot()
+
+    conn = get_connection()
+    if conn is None:
+        return AnalyticsSnapshot({days: empty_analytics(days) for days in windows})
+
+    cur = conn.cursor()
+
+    try:
+        cur.execute("SELECT date('now')")
+        today = datetime.strptime(cur.fetchone()[0], '%Y-%m-%d').date()
+        cur.execute(ROLLUP_WINDOW_SQL, (f'-{longest - 1} days',))
+        rows = cur.fetchall()
     except Exception as e:
         print(f"Analytics error: {e}")
-        return {
-            'period_days': days,
-            'tasks': {'total': 0, 'completed': 0, 'overdue': 0, 'completion_rate': 0},
-            'habits': {'total': 0, 'average_streak': 0, 'best_streak': 0},
-            'daily_trends': [],
-            'priority_breakdown': []
-        }
+        return AnalyticsSnapshot({days: empty_analytics(days) for days in windows})
     finally:
         cur.close()
         conn.close()
 
+    habit_stats = get_habit_counters()
+    results = {}
+    for days in windows:
+        start = str(today - timedelta(days=days - 1))
+        results[days] = _summarize_window([row for row in rows if row[0] >= start], days, habit_stats)
+
+    return AnalyticsSnapshot(results)
+
+
+def get_productivity_analytics(days=30):
+    """Get comprehensive productivity analytics.
+
+    Served from daily_rollup: the window is today plus the previous
+    days - 1 UTC days, so at most `days` rollup rows are summed.
+    """
+    days = max(int(days), 1)
+    return build_analytics_snapshot((days,)).analytics(days)
+
+
+# Overdue counts move with the clock, so keep the TTL short
+@cached(tables=('tasks', 'habits', 'habit_logs'), ttl=60)
+def _current_productivity_score():
+    return get_productivity_score(build_analytics_snapshot((7,)))
+
 
-def get_productivity_score():
-    """Calculate overall productivity score (0-100)"""
-    analytics = get_productivity_analytics(7)  # Last 7 days
+def get_productivity_score(snapshot=None):
+    """Calculate overall productivity score (0-100) over the last 7 days"""
+    if snapshot is None:
+        return _current_productivity_score()
+    analytics = snapshot.analytics(7)
 
     if not analytics or analytics['tasks']['total'] == 0:
         return 50
@@ -134,9 +257,11 @@ def get_productivity_score():
     return round(score)
 
 
-def generate_insights():
-    """Generate AI-powered productivity insights"""
-    analytics = get_productivity_analytics(14)
+def generate_insights(snapshot=None):
+    """Generate AI-powered productivity insights from the last 14 days"""
+    if snapshot is None:
+        snapshot = build_analytics_snapshot((14,))
+    analytics = snapshot.analytics(14)
 
     if not analytics or analytics['tasks']['total'] == 0:
         return "Keep using AURA to generate personalized insights!"
@@ -1,5 +1,13 @@
 from memory.database import get_connection
-from datetime import datetime, timedelta
+from brain.stats_engine import get_habit_counters
+from utils.cache import cached, bump_generation
+from utils.bulk_input import run_bulk, field, CHUNK_SIZE
+from datetime import date, datetime, timedelta
+
+FREQUENCIES = ('daily', 'weekly', 'monthly')
+
+# Names are stored as typed and looked up case-insensitively (migration 10
+# indexes habit_name COLLATE NOCASE), so "Read" and "read" are one habit
 
 
 def add_habit(habit_name, frequency):
@@ -13,10 +21,12 @@ def add_habit(habit_name, frequency):
     try:
         cur.execute("""
             INSERT OR IGNORE INTO habits (habit_name, frequency) 
-            VALUES (?, ?)
-        """, (habit_name, frequency))
+            SELECT ?, ?
+            WHERE NOT EXISTS (SELECT 1 FROM habits WHERE habit_name = ? COLLATE NOCASE)
+        """, (habit_name, frequency, habit_name))
 
         conn.commit()
+        bump_generation('habits', 'habit_logs')
         return cur.rowcount > 0
     except Exception as e:
         print(f"Error adding habit: {e}")
@@ -39,7 +49,7 @@ def mark_habit_done(habit_name):
         today = datetime.now().date()
         cur.execute("""
             SELECT id FROM habits 
-            WHERE habit_name = ? AND last_completed = ?
+            WHERE habit_name = ? COLLATE NOCASE AND last_completed = ?
         """, (habit_name, str(today)))
 
         if cur.fetchone():
@@ -51,11 +61,11 @@ def mark_habit_done(habit_name):
             SET streak_count = streak_count + 1,
                 last_completed = ?,
                 total_completions = total_completions + 1
-            WHERE habit_name = ?
+            WHERE habit_name = ? COLLATE NOCASE
         """, (str(today), habit_name))
 
         # Log the completion
-        cur.execute("SELECT id FROM habits WHERE habit_name = ?", (habit_name,))
+        cur.execute("SELECT id FROM habits WHERE habit_name = ? COLLATE NOCASE", (habit_name,))
         result = cur.fetchone()
         if result:
             habit_id = result[0]
@@ -63,6 +73,7 @@ def mark_habit_done(habit_name):
                         (habit_id, str(today)))
 
         conn.commit()
+        bump_generation('habits', 'habit_logs')
         return cur.rowcount > 0
     except Exception as e:
         print(f"Error marking habit done: {e}")
@@ -72,6 +83,123 @@ def mark_habit_done(habit_name):
         conn.close()
 
 
+def _bulk_habit(record):
+    """(habit_name, frequency) for an imported record"""
+    habit_name = field(record, 'name', 'habit_name', 'habit')
+    if not isinstance(habit_name, str) or not habit_name.strip():
+        raise ValueError("'name' is required")
+    frequency = str(field(record, 'frequency') or 'daily').lower()
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"'frequency' must be one of {', '.join(FREQUENCIES)}")
+    return habit_name.strip(), frequency
+
+
+def _insert_habits(cur, chunk):
+    # Names are unique ignoring case: report the ones that exist already or
+    # repeat in the chunk
+    names = [params[0] for _, params in chunk]
+    cur.execute(f"""
+        SELECT habit_name FROM habits 
+        WHERE habit_name COLLATE NOCASE IN ({','.join('?' * len(names))})
+    """, names)
+    taken = {row[0].lower() for row in cur.fetchall()}
+
+    rows, rejected = [], []
+    for row, params in chunk:
+        if params[0].lower() in taken:
+            rejected.append((row, f"habit '{params[0]}' already exists"))
+        else:
+            taken.add(params[0].lower())
+            rows.append(params)
+    cur.executemany("INSERT INTO habits (habit_name, frequency) VALUES (?, ?)", rows)
+    return len(rows), rejected
+
+
+def add_habits_bulk(records, chunk_size=CHUNK_SIZE):
+    """Insert many habits, chunk_size per transaction.
+
+    records are dicts with 'name' and optionally 'frequency' (daily, weekly
+    or monthly; daily by default). Returns the utils.bulk_input.run_bulk()
+    result, with existing or repeated names reported as row errors.
+    """
+    return run_bulk(records, _bulk_habit, _insert_habits, ('habits', 'habit_logs'), chunk_size)
+
+
+def _bulk_completion(record):
+    """(habit_name, completed date as 'YYYY-MM-DD') for an imported record"""
+    habit_name = field(record, 'name', 'habit_name', 'habit')
+    if not isinstance(habit_name, str) or not habit_name.strip():
+        raise ValueError("'name' is required")
+    completed = field(record, 'date', 'completed_date')
+    if completed is None:
+        return habit_name.strip(), str(datetime.now().date())
+    try:
+        return habit_name.strip(), str(date.fromisoformat(str(completed)[:10]))
+    except ValueError:
+        raise ValueError(f"'date' is not an ISO date: {completed!r}")
+
+
+def _insert_completions(cur, chunk):
+    names = sorted({params[0] for _, params in chunk})
+    cur.execute(f"""
+        SELECT id, habit_name, last_completed FROM habits 
+        WHERE habit_name COLLATE NOCASE IN ({','.join('?' * len(names))})
+    """, names)
+    habits = {name.lower(): (habit_id, last) for habit_id, name, last in cur.fetchall()}
+
+    dates = sorted({params[1] for _, params in chunk})
+    done = set()
+    if habits:
+        ids = [habit_id for habit_id, _ in habits.values()]
+        cur.execute(f"""
+            SELECT habit_id, completed_date FROM habit_logs 
+            WHERE habit_id IN ({','.join('?' * len(ids))}) 
+            AND completed_date IN ({','.join('?' * len(dates))})
+        """, ids + dates)
+        done = {(habit_id, str(completed)) for habit_id, completed in cur.fetchall()}
+
+    logs, rejected, per_habit = [], [], {}
+    for row, (name, completed) in chunk:
+        if name.lower() not in habits:
+            rejected.append((row, f"no habit named '{name}'"))
+            continue
+        habit_id = habits[name.lower()][0]
+        if (habit_id, completed) in done:
+            rejected.append((row, f"'{name}' is already marked done on {completed}"))
+            continue
+        done.add((habit_id, completed))
+        logs.append((habit_id, completed))
+        per_habit.setdefault(name.lower(), []).append(completed)
+
+    cur.executemany("INSERT INTO habit_logs (habit_id, completed_date) VALUES (?, ?)", logs)
+
+    # Same totals as mark_habit_done() once per day: the streak grows by the
+    # days newer than the habit's last completion
+    updates = []
+    for name, completed in per_habit.items():
+        habit_id, last = habits[name]
+        newer = [day for day in completed if last is None or day > str(last)]
+        updates.append((len(newer), len(completed), max(completed), habit_id))
+    cur.executemany("""
+        UPDATE habits 
+        SET streak_count = streak_count + ?,
+            total_completions = total_completions + ?,
+            last_completed = MAX(COALESCE(last_completed, ''), ?)
+        WHERE id = ?
+    """, updates)
+    return len(logs), rejected
+
+
+def mark_habits_done_bulk(records, chunk_size=CHUNK_SIZE):
+    """Log many habit completions, chunk_size per transaction.
+
+    records are dicts with 'name' and optionally 'date' (ISO, today by
+    default). Unknown habits and days already logged are row errors.
+    """
+    return run_bulk(records, _bulk_completion, _insert_completions, ('habits', 'habit_logs'), chunk_size)
+
+
+@cached(tables=('habits',))
 def get_all_habits():
     """Get all habits with their current status"""
     conn = get_connection()
@@ -98,51 +226,13 @@ def get_all_habits():
 
 def get_habit_stats():
     """Get comprehensive habit statistics"""
-    conn = get_connection()
-    if conn is None:
-        return {'total_habits': 0, 'completed_today': 0, 'best_streak': 0, 'total_completions': 0}
-
-    cur = conn.cursor()
-
-    try:
-        # Check if habits table exists
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='habits'")
-        if not cur.fetchone():
-            return {'total_habits': 0, 'completed_today': 0, 'best_streak': 0, 'total_completions': 0}
-
-        # Total habits
-        cur.execute("SELECT COUNT(*) FROM habits")
-        total_habits = cur.fetchone()[0] or 0
-
-        # Completed today
-        today = datetime.now().date()
-        cur.execute("SELECT COUNT(*) FROM habits WHERE last_completed = ?", (str(today),))
-        completed_today_result = cur.fetchone()
-        completed_today = completed_today_result[0] if completed_today_result else 0
-
-        # Best streak
-        cur.execute("SELECT MAX(streak_count) FROM habits")
-        best_streak_result = cur.fetchone()
-        best_streak = best_streak_result[0] if best_streak_result and best_streak_result[0] is not None else 0
-
-        # Total completions
-        cur.execute("SELECT SUM(total_completions) FROM habits")
-        total_completions_result = cur.fetchone()
-        total_completions = total_completions_result[0] if total_completions_result and total_completions_result[
-            0] is not None else 0
-
-        return {
-            'total_habits': total_habits,
-            'completed_today': completed_today,
-            'best_streak': best_streak,
-            'total_completions': total_completions
-        }
-    except Exception as e:
-        print(f"Error getting habit stats: {e}")
-        return {'total_habits': 0, 'completed_today': 0, 'best_streak': 0, 'total_completions': 0}
-    finally:
-        cur.close()
-        conn.close()
+    counters = get_habit_counters()
+    return {
+        'total_habits': counters['total_habits'],
+        'completed_today': counters['completed_today'],
+        'best_streak': counters['best_streak'],
+        'total_completions': counters['total_completions']
+    }
 
 
 def get_habit_summary():
@@ -180,9 +270,13 @@ def check_streaks():
         """, (str(yesterday),))
 
         conn.commit()
+        bump_generation('habits', 'habit_logs')
         print("✅ Habit streaks checked")
     except Exception as e:
         print(f"⚠️  Habit streak check skipped: {e}")
+    finally:
+        cur.close()
+        conn.close()
 
 
 def get_habit_completion_rate(habit_name, days=30):
@@ -195,7 +289,7 @@ def get_habit_completion_rate(habit_name, days=30):
 
     try:
         # Get habit ID
-        cur.execute("SELECT id FROM habits WHERE habit_name = ?", (habit_name,))
+        cur.execute("SELECT id FROM habits WHERE habit_name = ? COLLATE NOCASE", (habit_name,))
         result = cur.fetchone()
         if not result:
             return 0
@@ -233,7 +327,7 @@ def delete_habit(habit_name):
 
     try:
         # Get habit ID first
-        cur.execute("SELECT id FROM habits WHERE habit_name = ?", (habit_name,))
+        cur.execute("SELECT id FROM habits WHERE habit_name = ? COLLATE NOCASE", (habit_name,))
         result = cur.fetchone()
         if not result:
             return False
@@ -247,6 +341,7 @@ def delete_habit(habit_name):
         cur.execute("DELETE FROM habits WHERE id = ?", (habit_id,))
 
         conn.commit()
+        bump_generation('habits', 'habit_logs')
         return cur.rowcount > 0
 
     except Exception as e:
@@ -269,10 +364,11 @@ def update_habit_frequency(habit_name, new_frequency):
         cur.execute("""
             UPDATE habits 
             SET frequency = ? 
-            WHERE habit_name = ?
+            WHERE habit_name = ? COLLATE NOCASE
         """, (new_frequency, habit_name))
 
         conn.commit()
+        bump_generation('habits', 'habit_logs')
         return cur.rowcount > 0
 
     except Exception as e:
@@ -293,7 +389,7 @@ def get_habit_history(habit_name, days=7):
 
     try:
         # Get habit ID
-        cur.execute("SELECT id FROM habits WHERE habit_name = ?", (habit_name,))
+        cur.execute("SELECT id FROM habits WHERE habit_name = ? COLLATE NOCASE", (habit_name,))
         result = cur.fetchone()
         if not result:
             return []
@@ -332,10 +428,11 @@ def reset_habit_streak(habit_name):
         cur.execute("""
             UPDATE habits 
             SET streak_count = 0 
-            WHERE habit_name = ?
+            WHERE habit_name = ? COLLATE NOCASE
         """, (habit_name,))
 
         conn.commit()
+        bump_generation('habits', 'habit_logs')
         return cur.rowcount > 0
 
     except Exception as e:
@@ -0,0 +1,120 @@
+"""Compiled intent routing for process_command().
+
+INTENT_RULES lists every intent in precedence order, exactly as the old
+if/elif chain tested them. All trigger phrases are compiled once into an
+Aho-Corasick automaton (a dense DFA: one dict lookup per input character),
+so a command is scanned a single time no matter how many rules there are.
+The winning intent is the earliest rule with a matching phrase; 'prefix'
+rules only count matches that start at position 0 (str.startswith).
+"""
+
+PREFIX = 'prefix'
+CONTAINS = 'contains'
+DEFAULT_INTENT = 'default'
+
+# (intent, match mode, trigger phrases) - order is precedence
+INTENT_RULES = [
+    ('ai_chat', PREFIX, ['chat ']),
+    ('ai_summarize', PREFIX, ['ai summarize ']),
+    ('ai_write', PREFIX, ['ai write ']),
+    ('show_tasks', PREFIX, ['show tasks', 'list tasks', 'my tasks', 'what are my tasks']),
+    ('complete_task', PREFIX, ['complete task ']),
+    ('defer_task', PREFIX, ['defer task ', 'postpone task ']),
+    ('edit_task', PREFIX, ['edit task ', 'rename task ']),
+    ('search_memory', PREFIX, ['what did i say about ', 'search memory for ']),
+    ('web_search', PREFIX, ['search ']),
+    ('suggestions', CONTAINS, ['suggest', 'recommend', 'what should i do']),
+    ('productivity_report', CONTAINS, ['productivity report']),
+    ('export_data', CONTAINS, ['export data']),
+    ('settings', CONTAINS, ['settings']),
+    ('add_habit', PREFIX, ['add habit ']),
+    ('mark_habit', PREFIX, ['mark habit ']),
+    ('show_habits', CONTAINS, ['show habits', 'my habits']),
+    ('habit_stats', CONTAINS, ['habit stats']),
+    ('add_task', CONTAINS, ['remind me to', 'task', 'todo', 'remember to', 'add task']),
+    ('show_tasks', CONTAINS, ['show tasks', 'my tasks', 'what are my tasks', 'list tasks']),
+    ('complete_task', CONTAINS, ['complete task', 'done', 'finished', 'mark complete']),
+    ('task_stats', CONTAINS, ['task stats', 'how many tasks', 'progress']),
+    ('completed_tasks', CONTAINS, ['completed tasks', 'what i finished', 'task history']),
+    ('memory', CONTAINS, ['what did', 'remember', 'last time', 'our conversation']),
+    ('greeting', CONTAINS, ['hello', 'hi', 'hey', 'good morning', 'good afternoon']),
+    ('status', CONTAINS, ['how are you', 'how do you do']),
+    ('thanks', CONTAINS, ['thank you', 'thanks']),
+]
+
+
+class IntentDispatcher:
+    def __init__(self, rules=INTENT_RULES, default=DEFAULT_INTENT):
+        self.rules = list(rules)
+        self.default = default
+        self._compile()
+
+    def _compile(self):
+        # phrase -> [(rule index, prefix only)]; a phrase may trigger several rules
+        triggers = {}
+        for index, (_, mode, phrases) in enumerate(self.rules):
+            for phrase in phrases:
+                triggers.setdefault(phrase, []).append((index, mode == PREFIX))
+
+        # Trie
+        goto = [{}]
+        outputs = [[]]
+        for phrase, phrase_rules in triggers.items():
+            state = 0
+            for ch in phrase:
+                if ch not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            for index, prefix_only in phrase_rules:
+                outputs[state].append((index, prefix_only, len(phrase)))
+
+        # Failure links (BFS), folded into a full transition table so that
+        # matching never has to follow them at run time
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0)
+                queue.append(child)
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            outputs[state] = outputs[state] + outputs[fail[state]]
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def match(self, command):
+        """Rule indices that match the (already normalised) command"""
+        matched = set()
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for position, ch in enumerate(command, 1):
+            state = delta[state].get(ch, 0)
+            for index, prefix_only, length in outputs[state]:
+                if not prefix_only or position == length:
+                    matched.add(index)
+        return matched
+
+    def dispatch(self, command):
+        """Return the intent name for a lower-cased, stripped command"""
+        matched = self.match(command)
+        if not matched:
+            return self.default
+        return self.rules[min(matched)][0]
+
+
+_dispatcher = None
+
+
+def get_dispatcher():
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = IntentDispatcher()
+    return _dispatcher
+
+
+def resolve_intent(command):
+    return get_dispatcher().dispatch(command)
\ No newline at end of file
@@ -0,0 +1,250 @@
+"""Offline answers for frequent chat turns, learned from user_memory.
+
+Every AI chat turn in user_memory is a (question, answer) example.
+LocalModel indexes the questions as hashed word unigram + bigram TF-IDF
+vectors in an inverted index. A new message is answered locally when its
+nearest stored question scores cosine >= local_model_threshold and the
+questions that close have been asked at least local_model_min_support
+times between them, so only genuinely recurring turns skip the network.
+Everything else goes to GPT as before.
+
+The examples (not the vectors) persist to aura_local_model.json; loading
+rebuilds the index, which takes milliseconds for tens of thousands of
+distinct questions. Training is incremental: a background retrain reads
+only user_memory rows past trained_until, merges them into the examples
+and swaps in a freshly built index. It runs at load time when the
+database has moved on, and after every RETRAIN_EVERY lookups.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict
+from memory.database import get_connection
+from memory.conversation_logger import flush_conversations
+from utils.config_manager import get_config
+
+MODEL_FILE = "aura_local_model.json"
+FEATURES = 1 << 20  # hashed feature space
+THRESHOLD = 0.8
+MIN_SUPPORT = 2
+RETRAIN_EVERY = 20  # lookups between background retrains
+MAX_QUESTION_CHARS = 200  # long, one-off prompts are not worth learning
+MAX_EXAMPLES = 50000  # most recently asked questions kept
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def normalize(text):
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def _features(question):
+    """{hashed feature: count} over word unigrams and bigrams"""
+    words = question.split()
+    counts = defaultdict(int)
+    for gram in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+        # crc32, not hash(): stable across processes
+        counts[zlib.crc32(gram.encode('utf-8')) % FEATURES] += 1
+    return counts
+
+
+def _weights(counts, idf, default_idf):
+    weights = {f: (1 + math.log(tf)) * idf.get(f, default_idf) for f, tf in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    return {f: w / norm for f, w in weights.items()}
+
+
+class _Index:
+    """Immutable search structure over one snapshot of the examples"""
+
+    def __init__(self, examples):
+        self.questions = list(examples)
+        features = [_features(question) for question in self.questions]
+
+        df = defaultdict(int)
+        for counts in features:
+            for f in counts:
+                df[f] += 1
+        total = len(self.questions)
+        self.idf = {f: math.log((total + 1) / (n + 1)) + 1 for f, n in df.items()}
+        self.default_idf = math.log(total + 1) + 1
+
+        self.postings = defaultdict(list)
+        for doc, counts in enumerate(features):
+            for f, weight in _weights(counts, self.idf, self.default_idf).items():
+                self.postings[f].append((doc, weight))
+
+    def search(self, question, threshold):
+        """[(cosine, question)] for stored questions at or above threshold, best first"""
+        scores = defaultdict(float)
+        for f, weight in _weights(_features(question), self.idf, self.default_idf).items():
+            for doc, doc_weight in self.postings.get(f, ()):
+                scores[doc] += weight * doc_weight
+        matches = [(score, self.questions[doc]) for doc, score in scores.items() if score >= threshold]
+        return sorted(matches, reverse=True)
+
+
+class LocalModel:
+    def __init__(self, path=MODEL_FILE):
+        self.path = path
+        self.examples = {}  # normalized question -> [times asked, latest answer, latest id]
+        self.trained_until = 0
+        self._index = _Index({})
+        self._lock = threading.Lock()
+        self._training = threading.Lock()
+        self._since_retrain = 0
+        self.stats = {'lookups': 0, 'local_hits': 0, 'retrains': 0, 'load_ms': 0.0, 'retrain_ms': 0.0}
+
+    def load(self):
+        start = time.perf_counter()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.examples = {q: [count, answer, last_id] for q, count, answer, last_id in data['examples']}
+            self.trained_until = data.get('trained_until', 0)
+            self._index = _Index(self.examples)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading local model: {e}")
+        self.stats['load_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return self
+
+    def save(self):
+        with self._lock:
+            data = {
+                'version': 1,
+                'trained_until': self.trained_until,
+                'examples': [[q, count, answer, last_id] for q, (count, answer, last_id) in self.examples.items()]
+            }
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def answer(self, message, threshold=THRESHOLD, min_support=MIN_SUPPORT):
+        """Stored answer for a recurring question, or None"""
+        question = normalize(message)
+        with self._lock:
+            self.stats['lookups'] += 1
+            self._since_retrain += 1
+            retrain = self._since_retrain >= RETRAIN_EVERY
+            index, examples = self._index, self.examples
+        if retrain:
+            self.retrain_async()
+        if not question or len(question) > MAX_QUESTION_CHARS:
+            return None
+
+        matches = index.search(question, threshold)
+        if not matches:
+            return None
+        support = sum(examples[q][0] for _, q in matches if q in examples)
+        if support < min_support:
+            return None
+
+        with self._lock:
+            self.stats['local_hits'] += 1
+        return examples[matches[0][1]][1]
+
+    def retrain(self):
+        """Fold user_memory rows newer than trained_until into the model"""
+        if not self._training.acquire(blocking=False):
+            return 0
+        try:
+            start = time.perf_counter()
+            flush_conversations(timeout=1.0)
+            rows = self._new_turns()
+            if not rows:
+                return 0
+
+            examples = {q: list(example) for q, example in self.examples.items()}
+            for turn_id, question, answer in _chat_examples(rows):
+                example = examples.setdefault(question, [0, answer, turn_id])
+                example[0] += 1
+                example[1], example[2] = answer, turn_id
+            if len(examples) > MAX_EXAMPLES:
+                newest = sorted(examples.items(), key=lambda item: item[1][2])[-MAX_EXAMPLES:]
+                examples = dict(newest)
+
+            index = _Index(examples)
+            with self._lock:
+                self.examples, self._index = examples, index
+                self.trained_until = rows[-1][0]
+                self._since_retrain = 0
+                self.stats['retrains'] += 1
+                self.stats['retrain_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            self.save()
+            return len(rows)
+        except Exception as e:
+            print(f"Error retraining local model: {e}")
+            return 0
+        finally:
+            self._training.release()
+
+    def retrain_async(self):
+        with self._lock:
+            self._since_retrain = 0
+        threading.Thread(target=self.retrain, name="aura-local-model", daemon=True).start()
+
+    def _new_turns(self):
+        conn = get_connection()
+        if conn is None:
+            return []
+        cur = conn.cursor()
+        try:
+            cur.execute("""
+                SELECT id, user_input, ai_response FROM user_memory
+                WHERE id > ? AND memory_type = 'conversation'
+                ORDER BY id
+            """, (self.trained_until,))
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats, examples=len(self.examples), trained_until=self.trained_until)
+        stats['hit_ratio'] = round(stats['local_hits'] / stats['lookups'], 3) if stats['lookups'] else 0.0
+        return stats
+
+
+def _chat_examples(rows):
+    """(id, normalized question, answer) for AI chat turns worth reusing"""
+    from brain.intent_dispatcher import resolve_intent
+    from brain.ai_chat import is_canned_reply
+
+    for turn_id, user_input, answer in rows:
+        command = (user_input or "").lower().strip()
+        if resolve_intent(command) != 'ai_chat' or not answer:
+            continue
+        message = command[5:]
+        question = normalize(message)
+        if question and len(question) <= MAX_QUESTION_CHARS and not is_canned_reply(message, answer):
+            yield turn_id, question, answer
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_local_model():
+    """Shared LocalModel, loaded on first use; None when disabled"""
+    global _model
+    if not get_config().get('local_model_enabled', True):
+        return None
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = LocalModel().load()
+                # Catch up on turns saved since the file was written
+                _model.retrain_async()
+    return _model
+
+
+def get_local_model_stats():
+    return _model.get_stats() if _model is not None else {}
\ No newline at end of file
@@ -1,107 +1,84 @@
 import re
 import random
-from datetime import datetime
-from brain.task_manager import add_task, get_pending_tasks, complete_task, get_task_stats, get_overdue_tasks
+from datetime import datetime, timedelta, timezone
+from brain.task_manager import add_task, get_task_listing, complete_task, defer_task, edit_task, get_task_stats
+from brain.task_views import use_session, end_session, remember_listing, resolve_task, task_changed
 from brain.date_parser import parse_due_date, parse_priority
 from brain.habit_tracker import add_habit, mark_habit_done, get_all_habits, get_habit_stats
-from brain.ai_chat import chat_with_ai, ai_summarize, ai_write, get_ai_insights
+from brain.ai_chat import chat_with_ai, stream_chat_with_ai, local_reply, ai_summarize, ai_write, get_ai_insights
 from brain.smart_suggestions import get_smart_suggestions
-from brain.analytics import get_productivity_analytics, generate_insights, get_productivity_score
+from brain.analytics import build_analytics_snapshot, generate_insights, get_productivity_score
 from integrations.web_search import search_web
-from integrations.openai_client import chat_with_gpt, summarize_text, generate_content
+from integrations.openai_client import chat_with_gpt, stream_chat_with_gpt, summarize_text, generate_content
 from utils.data_export import export_data
-from memory.memory_manager import get_recent_memories
+from memory.memory_manager import get_recent_memories, find_similar_memories
+from memory.search import search
 from memory.database import get_completed_tasks
+from brain.intent_dispatcher import resolve_intent
 
 
-def process_command(command):
+def process_command(command, session=None):
+    """Response to one command; session keys per-user state such as the
+    numbered task list (brain.task_views), the shared default if None"""
     command = command.lower().strip()
+    return _handle(resolve_intent(command), command, session)
 
-    # AI Chat
-    if command.startswith('chat '):
-        return handle_ai_chat(command)
-
-    # AI Summarize
-    elif command.startswith('ai summarize '):
-        return handle_ai_summarize(command)
-
-    # AI Write
-    elif command.startswith('ai write '):
-        return handle_ai_write(command)
-
-    # Web Search
-    elif command.startswith('search '):
-        return search_web(command[7:])
-
-    # Smart Suggestions
-    elif any(word in command for word in ['suggest', 'recommend', 'what should i do']):
-        return get_smart_suggestions()
-
-    # Productivity Report
-    elif 'productivity report' in command:
-        return handle_productivity_report()
-
-    # Export Data
-    elif 'export data' in command:
-        return export_data()
-
-    # Settings
-    elif 'settings' in command:
-        return handle_settings(command)
-
-    # Habit Commands
-    elif command.startswith('add habit '):
-        return handle_add_habit(command)
-    elif command.startswith('mark habit '):
-        return handle_mark_habit(command)
-    elif any(word in command for word in ['show habits', 'my habits']):
-        return handle_show_habits()
-    elif 'habit stats' in command:
-        return handle_habit_stats()
-
-    # Existing task commands
-    elif any(word in command for word in ['remind me to', 'task', 'todo', 'remember to', 'add task']):
-        return handle_task_command(command)
-    elif any(word in command for word in ['show tasks', 'my tasks', 'what are my tasks', 'list tasks']):
-        return handle_show_tasks()
-    elif any(word in command for word in ['complete task', 'done', 'finished', 'mark complete']):
-        return handle_complete_task(command)
-    elif any(word in command for word in ['task stats', 'how many tasks', 'progress']):
-        return handle_task_stats()
-    elif any(word in command for word in ['completed tasks', 'what i finished', 'task history']):
-        return handle_completed_tasks()
-
-    # Memory recall
-    elif any(word in command for word in ['what did', 'remember', 'last time', 'our conversation']):
-        return handle_memory_command(command)
-
-    # Greetings
-    elif any(word in command for word in ['hello', 'hi', 'hey', 'good morning', 'good afternoon']):
-        return get_personality_response('greeting')
-
-    # How are you
-    elif any(word in command for word in ['how are you', 'how do you do']):
-        return get_personality_response('status')
-
-    # Thank you
-    elif any(word in command for word in ['thank you', 'thanks']):
-        return get_personality_response('thanks')
-
-    # Default response
-    else:
-        return get_personality_response('default', command)
+
+def stream_command(command, session=None):
+    """process_command() as a generator of text chunks.
+
+    Intents with a streaming handler (AI chat) yield text as it is
+    generated; every other intent yields its whole response once.
+    """
+    command = command.lower().strip()
+    intent = resolve_intent(command)
+    stream_handler = STREAM_HANDLERS.get(intent)
+    if stream_handler is None:
+        yield _handle(intent, command, session)
+        return
+    yield from stream_handler(command)
+
+
+def _handle(intent, command, session):
+    token = use_session(session)
+    try:
+        return INTENT_HANDLERS[intent](command)
+    finally:
+        end_session(token)
 
 
 # AI Handlers
 def handle_ai_chat(command):
     message = command[5:]
+    response = local_reply(message)
+    if response:
+        return response
     try:
         response = chat_with_gpt(message)
         if response and not response.startswith("AI error"):
             return response
     except:
         pass
-    return chat_with_ai(message)
+    return chat_with_ai(message, use_local=False)
+
+
+def stream_ai_chat(command):
+    message = command[5:]
+    response = local_reply(message)
+    if response:
+        yield response
+        return
+    started = False
+    try:
+        for delta in stream_chat_with_gpt(message):
+            started = True
+            yield delta
+        if started:
+            return
+    except:
+        if started:
+            return
+    yield from stream_chat_with_ai(message, use_local=False)
 
 
 def handle_ai_summarize(command):
@@ -121,9 +98,11 @@ def handle_ai_write(command):
 
 
 def handle_productivity_report():
-    analytics = get_productivity_analytics()
-    insights = generate_insights()
-    score = get_productivity_score()
+    # One read answers the 30-day report, 14-day insights and 7-day score
+    snapshot = build_analytics_snapshot((30, 14, 7))
+    analytics = snapshot.analytics(30)
+    insights = generate_insights(snapshot)
+    score = get_productivity_score(snapshot)
 
     report = f"📊 Productivity Report (Score: {score}/100)\n\n"
     report += f"Tasks Completed: {analytics['tasks']['completed']}/{analytics['tasks']['total']} ({analytics['tasks']['completion_rate']}%)\n"
@@ -214,15 +193,18 @@ def handle_task_command(command):
 
 
 def handle_show_tasks():
-    tasks = get_pending_tasks()
+    tasks = get_task_listing()
+    remember_listing(tasks)
     if not tasks:
         return "You have no pending tasks! 🎉"
 
-    overdue_tasks = get_overdue_tasks()
+    # Same instant as SQLite's datetime('now'), which due dates were compared to
+    now = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    overdue_tasks = sorted((task for task in tasks if task[2] and str(task[2]) < now), key=lambda task: str(task[2]))
     if overdue_tasks:
         response = "⚠️ OVERDUE TASKS:\n"
         for task in overdue_tasks:
-            task_id, task_text, due_date = task
+            task_text, due_date = task[1], task[2]
             response += f"❌ {task_text} (Was due: {due_date})\n"
         response += "\n"
     else:
@@ -230,7 +212,7 @@ def handle_show_tasks():
 
     response += "📋 Your pending tasks:\n"
     for i, task in enumerate(tasks, 1):
-        task_id, task_text, due_date, priority = task
+        task_id, task_text, due_date, priority, version = task
         priority_icon = ""
         if priority == 3:
             priority_icon = " 🔥"
@@ -244,22 +226,52 @@ def handle_show_tasks():
     return response
 
 
-def handle_complete_task(command):
-    tasks = get_pending_tasks()
-    if not tasks:
-        return "You have no pending tasks to complete!"
+def _update_numbered_task(task_num, update, *args):
+    """Apply update(task_id, *args, version) to the task shown as task_num"""
+    task = resolve_task(task_num)
+    if task is None:
+        return f"❌ There's no task {task_num} in your list. Say 'show tasks' to see it."
+    task_id, version = task
+    if not update(task_id, *args, version=version):
+        return f"⚠️ Task {task_num} has changed since your list was shown. Say 'show tasks' to see it again."
+    task_changed(task_num)
+    return None
+
 
+def handle_complete_task(command):
     num_match = re.search(r'(\d+)', command)
-    if num_match:
-        task_num = int(num_match.group(1))
-        if 1 <= task_num <= len(tasks):
-            task_id = tasks[task_num - 1][0]
-            if complete_task(task_id):
-                return f"🎉 Task {task_num} marked as completed! Great job!"
-            else:
-                return "❌ Couldn't find that task."
+    if not num_match:
+        return "Please specify which task to complete (e.g., 'complete task 1')"
 
-    return "Please specify which task to complete (e.g., 'complete task 1')"
+    task_num = int(num_match.group(1))
+    error = _update_numbered_task(task_num, complete_task)
+    return error or f"🎉 Task {task_num} marked as completed! Great job!"
+
+
+def handle_defer_task(command):
+    task_match = re.search(r'task (\d+)\s*(.*)', command)
+    if not task_match:
+        return "Please specify which task to defer (e.g., 'defer task 2 to tomorrow')"
+
+    task_num, when = int(task_match.group(1)), task_match.group(2)
+    days_match = re.search(r'by (\d+) days?', when)
+    if days_match:
+        due_date = datetime.now() + timedelta(days=int(days_match.group(1)))
+    else:
+        due_date = parse_due_date(when) or parse_due_date('tomorrow')
+
+    error = _update_numbered_task(task_num, defer_task, due_date)
+    return error or f"📅 Task {task_num} moved to {due_date.strftime('%Y-%m-%d')}"
+
+
+def handle_edit_task(command):
+    task_match = re.search(r'task (\d+)\s+(?:to\s+)?(.+)', command)
+    if not task_match:
+        return "Please say what task to change and how (e.g., 'edit task 2 to buy oat milk')"
+
+    task_num, task_text = int(task_match.group(1)), task_match.group(2).strip()
+    error = _update_numbered_task(task_num, edit_task, task_text)
+    return error or f"✏️ Task {task_num} is now: '{task_text}'"
 
 
 def handle_task_stats():
@@ -290,6 +302,16 @@ def handle_completed_tasks():
 
 
 def handle_memory_command(command):
+    # "remember when we talked about X": recall by meaning, not just recency
+    if ' about ' in command:
+        topic = command.split(' about ', 1)[1].strip(' ?')
+        similar = find_similar_memories(topic, 3) if topic else []
+        if similar:
+            response = f"🧠 Conversations about '{topic}':\n"
+            for i, mem in enumerate(similar, 1):
+                response += f"{i}. You: {mem['user_input']}\n   AURA: {mem['ai_response']}\n"
+            return response
+
     memories = get_recent_memories(3)
     if not memories:
         return "I don't have much in my memory yet. Keep talking to me!"
@@ -302,6 +324,25 @@ def handle_memory_command(command):
     return response
 
 
+def handle_search_memory(command):
+    for prefix in ('what did i say about ', 'search memory for '):
+        if command.startswith(prefix):
+            query = command[len(prefix):].strip(' ?')
+            break
+    else:
+        query = command
+
+    page = search(query, limit=5)
+    if not page['results']:
+        return f"🔎 I couldn't find anything about '{query}'."
+
+    labels = {'conversations': 'You said', 'tasks': 'Task', 'files': 'File'}
+    response = f"🔎 Found about '{query}':\n"
+    for i, match in enumerate(page['results'], 1):
+        response += f"{i}. {labels[match['source']]}: {match['snippet']}\n"
+    return response
+
+
 def get_personality_response(response_type, command=None):
     responses = {
         'greeting': [
@@ -330,4 +371,39 @@ def get_personality_response(response_type, command=None):
         ]
     }
 
-    return random.choice(responses[response_type])
\ No newline at end of file
+    return random.choice(responses[response_type])
+
+
+# Intent name (see brain.intent_dispatcher.INTENT_RULES) -> handler(command)
+INTENT_HANDLERS = {
+    'ai_chat': handle_ai_chat,
+    'ai_summarize': handle_ai_summarize,
+    'ai_write': handle_ai_write,
+    'web_search': lambda command: search_web(command[7:]),
+    'suggestions': lambda command: get_smart_suggestions(),
+    'productivity_report': lambda command: handle_productivity_report(),
+    'export_data': lambda command: export_data(),
+    'settings': handle_settings,
+    'add_habit': handle_add_habit,
+    'mark_habit': handle_mark_habit,
+    'show_habits': lambda command: handle_show_habits(),
+    'habit_stats': lambda command: handle_habit_stats(),
+    'add_task': handle_task_command,
+    'show_tasks': lambda command: handle_show_tasks(),
+    'complete_task': handle_complete_task,
+    'defer_task': handle_defer_task,
+    'edit_task': handle_edit_task,
+    'task_stats': lambda command: handle_task_stats(),
+    'completed_tasks': lambda command: handle_completed_tasks(),
+    'memory': handle_memory_command,
+    'search_memory': handle_search_memory,
+    'greeting': lambda command: get_personality_response('greeting'),
+    'status': lambda command: get_personality_response('status'),
+    'thanks': lambda command: get_personality_response('thanks'),
+    'default': lambda command: get_personality_response('default', command),
+}
+
+# Intents whose handler can stream; the rest go through INTENT_HANDLERS
+STREAM_HANDLERS = {
+    'ai_chat': stream_ai_chat,
+}
\ No newline at end of file
@@ -1,26 +1,20 @@
 import random
-from memory.database import get_connection
+from brain.stats_engine import get_task_counters, get_habit_counters
+from utils.cache import cached
 from datetime import datetime, timedelta
 
 
+# Depends on the hour of day as well as the data, hence the short TTL
+@cached(tables=('tasks', 'habits'), ttl=60)
 def get_smart_suggestions():
-    conn = get_connection()
-    if conn is None:
-        return "I'm still learning your patterns. Keep using AURA for personalized suggestions!"
-
-    cur = conn.cursor()
+    task_counters = get_task_counters()
+    habit_counters = get_habit_counters()
 
     try:
         # Analyze task patterns
-        cur.execute(
-            "SELECT COUNT(*) FROM tasks WHERE status = 'completed' AND created_at >= datetime('now', '-7 days')")
-        recent_completed = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM tasks WHERE status = 'pending'")
-        pending_tasks = cur.fetchone()[0]
-
-        cur.execute("SELECT COUNT(*) FROM habits WHERE last_completed = date('now')")
-        habits_today = cur.fetchone()[0]
+        recent_completed = task_counters['completed_last_7_days']
+        pending_tasks = task_counters['pending']
+        habits_today = habit_counters['completed_today']
 
         # Generate suggestions based on patterns
         suggestions = []
@@ -59,9 +53,6 @@ def get_smart_suggestions():
     except Exception as e:
         print(f"Error generating suggestions: {e}")
         return "Keep building consistent habits for better suggestions!"
-    finally:
-        cur.close()
-        conn.close()
 
 
 def get_task_suggestions():
@@ -0,0 +1,290 @@
+"""Shared task and habit counters.
+
+Every summary in AURA (task stats, daily summary, habit stats, smart
+suggestions) reads from the two dictionaries computed here. Totals come from
+the single stats_counters row that triggers keep in sync with tasks and
+habits (see migration 3); the date-dependent counters are index range counts
+that only touch recent rows. Inside stats_snapshot() the numbers are
+computed once and reused, so a startup or a dashboard render that shows
+several summaries only reads them once.
+
+Run from the AURA directory:
+    python -m brain.stats_engine --check      # compare counters with a recount
+    python -m brain.stats_engine --rebuild    # recompute counters from scratch
+"""
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from memory.database import get_connection
+
+EMPTY_TASK_COUNTERS = {
+    'total': 0, 'completed': 0, 'pending': 0, 'overdue': 0,
+    'completed_today': 0, 'completed_last_7_days': 0
+}
+
+EMPTY_HABIT_COUNTERS = {
+    'total_habits': 0, 'completed_today': 0, 'best_streak': 0,
+    'total_completions': 0, 'average_streak': 0
+}
+
+# O(1) totals plus index range counts for the date-dependent numbers
+TASK_COUNTERS_SQL = """
+    SELECT
+        c.tasks_total,
+        c.tasks_completed,
+        c.tasks_pending,
+        (SELECT COUNT(*) FROM tasks
+         WHERE status = 'pending' AND due_date < datetime('now')),
+        (SELECT COUNT(*) FROM tasks
+         WHERE status = 'completed'
+         AND created_at >= date('now') AND created_at < date('now', '+1 day')),
+        (SELECT COUNT(*) FROM tasks
+         WHERE status = 'completed' AND created_at >= datetime('now', '-7 days'))
+    FROM stats_counters c
+    WHERE c.id = 1
+"""
+
+HABIT_COUNTERS_SQL = """
+    SELECT
+        c.habits_total,
+        (SELECT COUNT(*) FROM habits WHERE last_completed = ?),
+        (SELECT MAX(streak_count) FROM habits),
+        c.habit_completions,
+        c.habit_streak_sum
+    FROM stats_counters c
+    WHERE c.id = 1
+"""
+
+# Full recounts: one conditional-aggregate pass per table
+TASK_RECOUNT_SQL = """
+    SELECT
+        COUNT(*),
+        SUM(status = 'completed'),
+        SUM(status = 'pending'),
+        SUM(status = 'pending' AND due_date < datetime('now')),
+        SUM(status = 'completed' AND date(created_at) = date('now')),
+        SUM(status = 'completed' AND created_at >= datetime('now', '-7 days'))
+    FROM tasks
+"""
+
+HABIT_RECOUNT_SQL = """
+    SELECT
+        COUNT(*),
+        SUM(last_completed = ?),
+        MAX(streak_count),
+        SUM(total_completions),
+        SUM(streak_count)
+    FROM habits
+"""
+
+# Columns of stats_counters and the counter each one stores
+STORED_COUNTERS = [
+    ('tasks_total', 'tasks', 'total'),
+    ('tasks_completed', 'tasks', 'completed'),
+    ('tasks_pending', 'tasks', 'pending'),
+    ('habits_total', 'habits', 'total_habits'),
+    ('habit_completions', 'habits', 'total_completions'),
+    ('habit_streak_sum', 'habits', 'streak_sum'),
+]
+
+_local = threading.local()
+
+
+def _task_row_to_counters(row):
+    return {
+        'total': row[0] or 0,
+        'completed': row[1] or 0,
+        'pending': row[2] or 0,
+        'overdue': row[3] or 0,
+        'completed_today': row[4] or 0,
+        'completed_last_7_days': row[5] or 0
+    }
+
+
+def _habit_row_to_counters(row):
+    total = row[0] or 0
+    streak_sum = row[4] or 0
+    return {
+        'total_habits': total,
+        'completed_today': row[1] or 0,
+        'best_streak': row[2] or 0,
+        'total_completions': row[3] or 0,
+        'average_streak': round(streak_sum / total, 1) if total else 0,
+        'streak_sum': streak_sum
+    }
+
+
+def _recount_tasks(cur):
+    cur.execute(TASK_RECOUNT_SQL)
+    return _task_row_to_counters(cur.fetchone())
+
+
+def _recount_habits(cur):
+    # mark_habit_done() stores the local date, so compare against that
+    cur.execute(HABIT_RECOUNT_SQL, (str(datetime.now().date()),))
+    return _habit_row_to_counters(cur.fetchone())
+
+
+def _compute_task_counters(cur):
+    cur.execute(TASK_COUNTERS_SQL)
+    row = cur.fetchone()
+    if row is None:
+        # stats_counters not seeded yet (pre-migration database)
+        return _recount_tasks(cur)
+    return _task_row_to_counters(row)
+
+
+def _compute_habit_counters(cur):
+    cur.execute(HABIT_COUNTERS_SQL, (str(datetime.now().date()),))
+    row = cur.fetchone()
+    if row is None:
+        return _recount_habits(cur)
+    return _habit_row_to_counters(row)
+
+
+def _read(key, compute, empty):
+    snapshot = getattr(_local, 'snapshot', None)
+    if snapshot is not None and key in snapshot:
+        return dict(snapshot[key])
+
+    conn = get_connection()
+    if conn is None:
+        return dict(empty)
+
+    cur = conn.cursor()
+
+    try:
+        counters = compute(cur)
+    except Exception as e:
+        print(f"Error computing {key} stats: {e}")
+        return dict(empty)
+    finally:
+        cur.close()
+        conn.close()
+
+    if snapshot is not None:
+        snapshot[key] = counters
+    return dict(counters)
+
+
+def get_task_counters():
+    """All task counters from one pass over tasks"""
+    return _read('tasks', _compute_task_counters, EMPTY_TASK_COUNTERS)
+
+
+def get_habit_counters():
+    """All habit counters from one pass over habits"""
+    return _read('habits', _compute_habit_counters, EMPTY_HABIT_COUNTERS)
+
+
+def rebuild_counters():
+    """Recompute stats_counters from the tasks and habits tables"""
+    conn = get_connection()
+    if conn is None:
+        return False
+
+    cur = conn.cursor()
+
+    try:
+        cur.execute("BEGIN IMMEDIATE")
+        recounted = {'tasks': _recount_tasks(cur), 'habits': _recount_habits(cur)}
+        columns = [column for column, _, _ in STORED_COUNTERS]
+        values = [recounted[table][key] for _, table, key in STORED_COUNTERS]
+        cur.execute(f"""
+            INSERT OR REPLACE INTO stats_counters (id, {', '.join(columns)})
+            VALUES (1, {', '.join('?' * len(columns))})
+        """, values)
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"Error rebuilding counters: {e}")
+        return False
+    finally:
+        cur.close()
+        conn.close()
+
+
+def check_counters():
+    """Compare stored counters with a full recount.
+
+    Returns {column: (stored, recounted)} for every counter that disagrees;
+    an empty dict means the counters are consistent.
+    """
+    conn = get_connection()
+    if conn is None:
+        return None
+
+    cur = conn.cursor()
+
+    try:
+        # One read transaction so both sides see the same data
+        cur.execute("BEGIN")
+        columns = [column for column, _, _ in STORED_COUNTERS]
+        cur.execute(f"SELECT {', '.join(columns)} FROM stats_counters WHERE id = 1")
+        stored = cur.fetchone() or [None] * len(columns)
+        recounted = {'tasks': _recount_tasks(cur), 'habits': _recount_habits(cur)}
+        conn.rollback()
+
+        mismatches = {}
+        for (column, table, key), value in zip(STORED_COUNTERS, stored):
+            expected = recounted[table][key]
+            if value != expected:
+                mismatches[column] = (value, expected)
+        return mismatches
+    except Exception as e:
+        print(f"Error checking counters: {e}")
+        return None
+    finally:
+        cur.close()
+        conn.close()
+
+
+def begin_snapshot():
+    """Start reusing counters on this thread until end_snapshot()"""
+    depth = getattr(_local, 'depth', 0)
+    if depth == 0:
+        _local.snapshot = {}
+    _local.depth = depth + 1
+
+
+def end_snapshot():
+    depth = getattr(_local, 'depth', 0) - 1
+    _local.depth = max(depth, 0)
+    if depth <= 0:
+        _local.snapshot = None
+
+
+@contextmanager
+def stats_snapshot():
+    """Compute each counter set at most once for the enclosed block"""
+    begin_snapshot()
+    try:
+        yield
+    finally:
+        end_snapshot()
+
+
+def main(argv):
+    from memory.database import setup_database
+    setup_database()
+
+    if '--rebuild' in argv:
+        if not rebuild_counters():
+            return 1
+        print("✅ Counters rebuilt")
+
+    mismatches = check_counters()
+    if mismatches is None:
+        return 1
+    if mismatches:
+        print("❌ Counters out of sync (stored, recounted):")
+        for column, (stored, expected) in mismatches.items():
+            print(f"  {column}: {stored} != {expected}")
+        return 1
+    print("✅ Counters match a full recount")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
\ No newline at end of file
@@ -1,6 +1,13 @@
 from memory.database import get_connection
+from brain.stats_engine import get_task_counters
+from utils.cache import cached, bump_generation
+from utils.bulk_input import run_bulk, field, CHUNK_SIZE
 from datetime import datetime
 
+PRIORITIES = {'low': 1, 'medium': 2, 'high': 3}
+STATUSES = ('pending', 'completed')
+MAX_TASK_CHARS = 1000
+
 
 def add_task(task_text, due_date=None, priority=1):
     conn = get_connection()
@@ -16,6 +23,7 @@ def add_task(task_text, due_date=None, priority=1):
         """, (task_text, due_date, priority))
 
         conn.commit()
+        bump_generation('tasks')
         return True
     except Exception as e:
         print(f"Error adding task: {e}")
@@ -25,7 +33,63 @@ def add_task(task_text, due_date=None, priority=1):
         conn.close()
 
 
-def get_pending_tasks():
+def _bulk_task(record):
+    """(task_text, due_date, priority, status) for an imported record"""
+    task_text = field(record, 'text', 'task_text', 'task')
+    if not isinstance(task_text, str) or not task_text.strip():
+        raise ValueError("'text' is required")
+    task_text = task_text.strip()
+    if len(task_text) > MAX_TASK_CHARS:
+        raise ValueError(f"'text' is longer than {MAX_TASK_CHARS} characters")
+
+    due_date = field(record, 'due_date', 'due')
+    if due_date is not None:
+        try:
+            due_date = datetime.fromisoformat(str(due_date).replace('Z', '+00:00')).replace(tzinfo=None)
+        except ValueError:
+            raise ValueError(f"'due_date' is not an ISO date: {due_date!r}")
+
+    priority = field(record, 'priority')
+    if priority is None:
+        priority = 1
+    elif str(priority).lower() in PRIORITIES:
+        priority = PRIORITIES[str(priority).lower()]
+    else:
+        try:
+            priority = int(priority)
+        except (TypeError, ValueError):
+            priority = None
+        if priority not in (1, 2, 3):
+            raise ValueError("'priority' must be 1-3 or low/medium/high")
+
+    status = field(record, 'status') or 'pending'
+    if status not in STATUSES:
+        raise ValueError(f"'status' must be one of {', '.join(STATUSES)}")
+
+    return task_text, due_date, priority, status
+
+
+def _insert_tasks(cur, chunk):
+    cur.executemany("""
+        INSERT INTO tasks (task_text, due_date, priority, status) 
+        VALUES (?, ?, ?, ?)
+    """, [params for _, params in chunk])
+    return len(chunk), []
+
+
+def add_tasks_bulk(records, chunk_size=CHUNK_SIZE):
+    """Insert many tasks, chunk_size per transaction.
+
+    records are dicts with 'text' and optionally 'due_date' (ISO 8601),
+    'priority' (1-3 or low/medium/high) and 'status' (pending/completed).
+    Returns the utils.bulk_input.run_bulk() result with per-row errors.
+    """
+    return run_bulk(records, _bulk_task, _insert_tasks, ('tasks',), chunk_size)
+
+
+@cached(tables=('tasks',))
+def get_task_listing():
+    """Pending tasks in display order, as (id, task_text, due_date, priority, version)"""
     conn = get_connection()
     if conn is None:
         return []
@@ -34,7 +98,7 @@ def get_pending_tasks():
 
     try:
         cur.execute("""
-            SELECT id, task_text, due_date, priority 
+            SELECT id, task_text, due_date, priority, version 
             FROM tasks 
             WHERE status = 'pending' 
             ORDER BY 
@@ -55,7 +119,24 @@ def get_pending_tasks():
         conn.close()
 
 
-def complete_task(task_id):
+@cached(tables=('tasks',))
+def get_pending_tasks():
+    return [task[:4] for task in get_task_listing()]
+
+
+def _update_task(task_id, assignments, params, version=None):
+    """UPDATE one task by primary key and bump its row version.
+
+    With version, the row only changes if it is still pending at that
+    version, i.e. nobody touched it since it was read. Returns True when
+    a row was updated.
+    """
+    sql = f"UPDATE tasks SET {assignments}, version = version + 1 WHERE id = ?"
+    params = list(params) + [task_id]
+    if version is not None:
+        sql += " AND version = ? AND status = 'pending'"
+        params.append(version)
+
     conn = get_connection()
     if conn is None:
         return False
@@ -63,45 +144,37 @@ def complete_task(task_id):
     cur = conn.cursor()
 
     try:
-        cur.execute("UPDATE tasks SET status = 'completed' WHERE id = ?", (task_id,))
+        cur.execute(sql, params)
         conn.commit()
+        bump_generation('tasks')
         return cur.rowcount > 0
     except Exception as e:
-        print(f"Error completing task: {e}")
+        print(f"Error updating task: {e}")
         return False
     finally:
         cur.close()
         conn.close()
 
 
-def get_task_stats():
-    conn = get_connection()
-    if conn is None:
-        return {'total': 0, 'completed': 0, 'pending': 0}
+def complete_task(task_id, version=None):
+    return _update_task(task_id, "status = 'completed'", (), version)
 
-    cur = conn.cursor()
 
-    try:
-        cur.execute("SELECT COUNT(*) FROM tasks")
-        total = cur.fetchone()[0]
+def defer_task(task_id, due_date, version=None):
+    return _update_task(task_id, "due_date = ?", (due_date,), version)
 
-        cur.execute("SELECT COUNT(*) FROM tasks WHERE status = 'completed'")
-        completed = cur.fetchone()[0]
 
-        cur.execute("SELECT COUNT(*) FROM tasks WHERE status = 'pending'")
-        pending = cur.fetchone()[0]
+def edit_task(task_id, task_text, version=None):
+    return _update_task(task_id, "task_text = ?", (task_text,), version)
 
-        return {
-            'total': total,
-            'completed': completed,
-            'pending': pending
-        }
-    except Exception as e:
-        print(f"Error getting task stats: {e}")
-        return {'total': 0, 'completed': 0, 'pending': 0}
-    finally:
-        cur.close()
-        conn.close()
+
+def get_task_stats():
+    counters = get_task_counters()
+    return {
+        'total': counters['total'],
+        'completed': counters['completed'],
+        'pending': counters['pending']
+    }
 
 
 def get_overdue_tasks():
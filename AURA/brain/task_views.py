@@ -0,0 +1,71 @@
+"""What "task 3" means, per session.
+
+handle_show_tasks() remembers, for the session that asked, the id and row
+version of the task behind each number it printed. "complete task 3",
+"defer task 3 ..." and "edit task 3 ..." resolve the number from that
+view instead of re-reading and re-sorting the pending list, and update by
+primary key guarded by the version (brain.task_manager._update_task). If
+the task was completed, edited or deferred anywhere since it was shown,
+the guarded UPDATE matches nothing and the user is asked to list the tasks
+again rather than having a different task changed.
+
+A session is whoever is talking: the CLI, GUI and voice loop share
+DEFAULT_SESSION, web clients pass their own id to process_command().
+"""
+import contextvars
+import threading
+from collections import OrderedDict
+from brain.task_manager import get_task_listing
+
+DEFAULT_SESSION = 'default'
+MAX_SESSIONS = 256  # least recently used views are dropped beyond this
+
+_session = contextvars.ContextVar('aura_session', default=DEFAULT_SESSION)
+_views = OrderedDict()  # session -> [[task id, version], ...] in display order
+_lock = threading.Lock()
+
+
+def use_session(session):
+    """Make session current for the command being handled; returns a reset token"""
+    return _session.set(session or DEFAULT_SESSION)
+
+
+def end_session(token):
+    _session.reset(token)
+
+
+def remember_listing(tasks):
+    """Record the numbered list just shown: rows from get_task_listing()"""
+    view = [[task[0], task[4]] for task in tasks]
+    with _lock:
+        _views[_session.get()] = view
+        _views.move_to_end(_session.get())
+        while len(_views) > MAX_SESSIONS:
+            _views.popitem(last=False)
+
+
+def resolve_task(number):
+    """(task id, version) shown as this number, or None if there was none.
+
+    Without a listing in this session yet, the current pending list is
+    taken as the one the user means, as before views existed.
+    """
+    session = _session.get()
+    with _lock:
+        view = _views.get(session)
+    if view is None:
+        remember_listing(get_task_listing())
+        with _lock:
+            view = _views.get(session, [])
+    if not 1 <= number <= len(view):
+        return None
+    task_id, version = view[number - 1]
+    return task_id, version
+
+
+def task_changed(number):
+    """Follow this session's own successful update of task number"""
+    with _lock:
+        view = _views.get(_session.get())
+        if view is not None and 1 <= number <= len(view):
+            view[number - 1][1] += 1
\ No newline at end of file
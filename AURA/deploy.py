@@ -62,6 +62,7 @@ def main():
     print("  python main.py      - Text/Voice mode")
     print("  python aura_gui.py  - Graphical interface")
     print("  python web/app.py   - Web dashboard")
+    print("  python serve.py     - Dashboard and REST API on a production server")
     print("\n💡 For AI features, set your OpenAI API key in the GUI settings")
 
 
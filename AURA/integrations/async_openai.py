@@ -0,0 +1,273 @@
+"""Asyncio layer under openai_client for concurrent callers.
+
+Flask threads, the GUI and the CLI all call the sync helpers in
+openai_client; those now submit their request to one background event loop
+that owns a single AsyncOpenAI client. That gives every caller:
+  - one shared httpx connection pool (keep-alive across requests/threads)
+  - a semaphore capping concurrent upstream requests (openai_max_concurrency)
+  - a per-call timeout (openai_timeout seconds)
+  - single-flight coalescing: identical in-flight prompts (same cache key)
+    share one upstream call instead of each paying for it
+Streamed chat replies (stream_sync) take the same semaphore slot, pool and
+timeout for as long as the stream runs; they are not coalesced, since each
+caller consumes its own stream as it arrives.
+
+Point openai_base_url at a local OpenAI-compatible server to test or load
+test without the real API.
+"""
+import asyncio
+import queue
+import threading
+import time
+from utils.config_manager import get_config
+from integrations.response_cache import make_key
+
+MAX_CONCURRENCY = 4
+TIMEOUT = 30.0  # seconds per request, including time queued on the semaphore
+
+_DONE = object()  # ends a stream_sync() queue
+
+
+class AsyncLLM:
+    def __init__(self, api_key, base_url=None, max_concurrency=MAX_CONCURRENCY, timeout=TIMEOUT):
+        self.api_key = api_key
+        self.base_url = base_url or None
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._client = None
+        self._semaphore = None
+        self._inflight = {}
+        self._in_flight_now = 0
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'requests': 0, 'streams': 0, 'upstream_calls': 0, 'coalesced': 0,
+            'timeouts': 0, 'errors': 0, 'max_in_flight': 0
+        }
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="aura-openai-loop", daemon=True)
+        self._thread.start()
+        self.run(self._setup())
+
+    async def _setup(self):
+        # Created on the loop thread so they bind to this loop
+        import httpx
+        import openai
+        limits = httpx.Limits(max_connections=self.max_concurrency,
+                              max_keepalive_connections=self.max_concurrency)
+        self._client = openai.AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=self.timeout,
+            http_client=httpx.AsyncClient(limits=limits, timeout=self.timeout)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    async def complete(self, messages, model, max_tokens, temperature, timeout=None):
+        """(content, total_tokens) for one chat completion, coalescing duplicates"""
+        self._count('requests')
+        key = make_key(messages, model, max_tokens, temperature)
+        future = self._inflight.get(key)
+        if future is not None:
+            self._count('coalesced')
+            # shield: one waiter timing out must not cancel the shared call
+            return await asyncio.shield(future)
+
+        future = self._loop.create_future()
+        self._inflight[key] = future
+        try:
+            result = await asyncio.wait_for(
+                self._call(messages, model, max_tokens, temperature),
+                timeout or self.timeout
+            )
+            future.set_result(result)
+            return result
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self._count('timeouts')
+            else:
+                self._count('errors')
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures don't log warnings
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _call(self, messages, model, max_tokens, temperature):
+        async with self._semaphore:
+            self._enter()
+            try:
+                response = await self._client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
+            finally:
+                self._leave()
+
+        usage = getattr(response, 'usage', None)
+        return response.choices[0].message.content, getattr(usage, 'total_tokens', 0) or 0
+
+    async def stream(self, messages, model, max_tokens, temperature, on_delta, timeout=None):
+        """Stream one chat completion, calling on_delta(text) for each chunk"""
+        self._count('requests')
+        self._count('streams')
+        try:
+            await asyncio.wait_for(
+                self._stream_call(messages, model, max_tokens, temperature, on_delta),
+                timeout or self.timeout
+            )
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self._count('timeouts')
+            else:
+                self._count('errors')
+            raise
+
+    async def _stream_call(self, messages, model, max_tokens, temperature, on_delta):
+        # The slot is held until the last chunk, like any other upstream call
+        async with self._semaphore:
+            self._enter()
+            try:
+                stream = await self._client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True
+                )
+                try:
+                    async for chunk in stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            on_delta(delta)
+                finally:
+                    # Hand the connection back to the pool, also on cancel or timeout
+                    await stream.response.aclose()
+            finally:
+                self._leave()
+
+    def _enter(self):
+        with self._stats_lock:
+            self._in_flight_now += 1
+            self.stats['upstream_calls'] += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self._in_flight_now)
+
+    def _leave(self):
+        with self._stats_lock:
+            self._in_flight_now -= 1
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop from any (non-loop) thread and wait"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def complete_sync(self, messages, model, max_tokens, temperature, timeout=None):
+        """Blocking wrapper for the existing sync callers"""
+        timeout = timeout or self.timeout
+        # Small grace period so the loop-side timeout fires first
+        return self.run(self.complete(messages, model, max_tokens, temperature, timeout), timeout + 1)
+
+    def stream_sync(self, messages, model, max_tokens, temperature, timeout=None):
+        """Generator of text deltas for the sync callers; closing it early cancels the call"""
+        timeout = timeout or self.timeout
+        deltas = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self.stream(messages, model, max_tokens, temperature, deltas.put_nowait, timeout), self._loop)
+        future.add_done_callback(lambda _: deltas.put_nowait(_DONE))
+        try:
+            while True:
+                try:
+                    # Small grace period so the loop-side timeout fires first
+                    delta = deltas.get(timeout=timeout + 1)
+                except queue.Empty:
+                    raise TimeoutError("stream stalled")
+                if delta is _DONE:
+                    break
+                yield delta
+            future.result()  # an upstream error or timeout after the last delta
+        finally:
+            future.cancel()
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+            stats['in_flight'] = self._in_flight_now
+        stats['max_concurrency'] = self.max_concurrency
+        return stats
+
+    def close(self):
+        async def shutdown():
+            if self._client is not None:
+                await self._client.close()
+        try:
+            self.run(shutdown(), timeout=5)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+
+
+class RateBudget:
+    """Async token bucket over requests and tokens per minute.
+
+    Bulk jobs acquire() before each request with its estimated token cost,
+    so many concurrent batches still stay under the account's rate limits.
+    """
+
+    def __init__(self, requests_per_minute=60, tokens_per_minute=60000):
+        self.rates = (requests_per_minute / 60, tokens_per_minute / 60)
+        self.capacity = (requests_per_minute, tokens_per_minute)
+        self.available = list(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed, self.updated = now - self.updated, now
+        for i in range(2):
+            self.available[i] = min(self.capacity[i], self.available[i] + elapsed * self.rates[i])
+
+    async def acquire(self, tokens):
+        # A single request larger than the bucket waits for a full bucket
+        tokens = min(tokens, self.capacity[1])
+        async with self._lock:
+            while True:
+                self._refill()
+                needed = (1 - self.available[0], tokens - self.available[1])
+                if needed[0] <= 0 and needed[1] <= 0:
+                    self.available[0] -= 1
+                    self.available[1] -= tokens
+                    return
+                await asyncio.sleep(max(needed[i] / self.rates[i] for i in range(2)))
+
+
+_llm = None
+_llm_lock = threading.Lock()
+
+
+def get_async_llm():
+    """Shared AsyncLLM built from the config; None without an API key"""
+    global _llm
+    if _llm is None:
+        with _llm_lock:
+            if _llm is None:
+                config = get_config()
+                api_key = config.get('openai_api_key')
+                if not api_key:
+                    return None
+                _llm = AsyncLLM(
+                    api_key,
+                    base_url=config.get('openai_base_url'),
+                    max_concurrency=config.get('openai_max_concurrency', MAX_CONCURRENCY),
+                    timeout=config.get('openai_timeout', TIMEOUT)
+                )
+    return _llm
+
+
+def get_llm_stats():
+    return _llm.get_stats() if _llm is not None else {}
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""Batched sentiment and summarization for bulk memory processing.
+
+analyze_sentiment() and summarize_text() cost one round trip per text.
+These pack many texts into one request as a numbered list and ask for a
+JSON array back, one object per item:
+
+    [{"id": 1, "sentiment": "positive"}, {"id": 2, "sentiment": "neutral"}]
+
+parse_batch_reply() tolerates prose or code fences around the array and
+missing or malformed items: anything it cannot read comes back as None, so
+callers can retry just those texts rather than the whole batch.
+
+Batches run concurrently on the shared AsyncLLM loop (integrations.async_openai),
+at most batch_concurrency at a time and paced by a RateBudget over
+batch_requests_per_minute and batch_tokens_per_minute (prompt plus
+max_tokens, estimated locally).
+"""
+import asyncio
+import json
+import re
+from utils.config_manager import get_config
+from integrations.async_openai import RateBudget, get_async_llm
+from memory.context_builder import estimate_message_tokens
+
+MODEL = "gpt-3.5-turbo"
+CONCURRENCY = 4
+REQUESTS_PER_MINUTE = 60
+TOKENS_PER_MINUTE = 60000
+
+# Per task: output field, instruction, default texts per request, characters
+# kept per text and reply tokens budgeted per item (JSON syntax included)
+TASKS = {
+    'sentiment': {
+        'field': 'sentiment',
+        'instruction': "Classify the sentiment of each numbered text as positive, negative or neutral.",
+        'batch_size': 25,
+        'item_chars': 1000,
+        'item_tokens': 12,
+        'temperature': 0.0,
+    },
+    'summary': {
+        'field': 'summary',
+        'instruction': "Summarize each numbered text concisely in one or two sentences.",
+        'batch_size': 8,
+        'item_chars': 1200,
+        'item_tokens': 80,
+        'temperature': 0.3,
+    },
+}
+
+SENTIMENTS = ('positive', 'negative', 'neutral')
+
+_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+
+def build_batch_messages(kind, texts):
+    """One request covering every text, numbered from 1"""
+    task = TASKS[kind]
+    field = task['field']
+    system = (f"{task['instruction']} Reply with only a JSON array of "
+              f"{{\"id\": <item number>, \"{field}\": <string>}} objects, one per item, in order.")
+    items = "\n\n".join(f"[{i}] {' '.join(str(text).split())[:task['item_chars']]}"
+                        for i, text in enumerate(texts, 1))
+    return [{"role": "system", "content": system}, {"role": "user", "content": items}]
+
+
+def _normalize(kind, value):
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    if kind == 'sentiment':
+        value = value.lower().strip('.')
+        return value if value in SENTIMENTS else None
+    return value
+
+
+def parse_batch_reply(kind, content, count):
+    """Values for items 1..count from a batch reply; None where unreadable"""
+    results = [None] * count
+    match = _ARRAY_RE.search(content or "")
+    if not match:
+        return results
+    try:
+        items = json.loads(match.group(0))
+    except ValueError:
+        return results
+
+    field = TASKS[kind]['field']
+    for position, item in enumerate(items if isinstance(items, list) else []):
+        if isinstance(item, dict):
+            index, value = item.get('id', position + 1), item.get(field)
+        else:
+            # A bare list of strings, taken in order
+            index, value = position + 1, item
+        try:
+            index = int(index)
+        except (TypeError, ValueError):
+            continue
+        if 1 <= index <= count and results[index - 1] is None:
+            results[index - 1] = _normalize(kind, value)
+    return results
+
+
+async def _run_batch(llm, kind, texts, budget):
+    task = TASKS[kind]
+    messages = build_batch_messages(kind, texts)
+    max_tokens = task['item_tokens'] * len(texts) + 16
+    await budget.acquire(estimate_message_tokens(messages) + max_tokens)
+    try:
+        content, _ = await llm.complete(messages, MODEL, max_tokens, task['temperature'])
+    except Exception as e:
+        print(f"Error in {kind} batch of {len(texts)}: {e}")
+        return [None] * len(texts)
+    return parse_batch_reply(kind, content, len(texts))
+
+
+async def run_batches(llm, kind, texts, batch_size=None, concurrency=None, budget=None, on_batch=None):
+    """Process texts in concurrent batches; results align with texts.
+
+    on_batch(offset, results) is called in a worker thread as each batch
+    finishes, so callers can write results back without waiting for the rest.
+    """
+    batch_size = batch_size or TASKS[kind]['batch_size']
+    concurrency = concurrency or get_config().get('batch_concurrency', CONCURRENCY)
+    budget = budget or make_rate_budget()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    results = [None] * len(texts)
+
+    async def worker(offset):
+        async with semaphore:
+            chunk = await _run_batch(llm, kind, texts[offset:offset + batch_size], budget)
+        results[offset:offset + len(chunk)] = chunk
+        if on_batch is not None:
+            # Off the event loop: write-back must not stall other batches
+            await loop.run_in_executor(None, on_batch, offset, chunk)
+
+    await asyncio.gather(*(worker(offset) for offset in range(0, len(texts), batch_size)))
+    return results
+
+
+def make_rate_budget():
+    """RateBudget from the config; share one across calls in a long job"""
+    config = get_config()
+    return RateBudget(config.get('batch_requests_per_minute', REQUESTS_PER_MINUTE),
+                      config.get('batch_tokens_per_minute', TOKENS_PER_MINUTE))
+
+
+def batch_process(kind, texts, batch_size=None, concurrency=None, budget=None, on_batch=None):
+    """Blocking entry point; every result is None when AI is unavailable"""
+    texts = list(texts)
+    llm = get_async_llm()
+    if llm is None or not texts:
+        return [None] * len(texts)
+    return llm.run(run_batches(llm, kind, texts, batch_size, concurrency, budget, on_batch))
+
+
+def analyze_sentiment_batch(texts, batch_size=None):
+    """Sentiment for many texts; 'neutral' where it could not be determined"""
+    return [value or "neutral" for value in batch_process('sentiment', texts, batch_size)]
+
+
+def summarize_batch(texts, batch_size=None):
+    """Summaries for many texts; None where a summary could not be produced"""
+    return batch_process('summary', texts, batch_size)
\ No newline at end of file
@@ -1,78 +1,188 @@
-import openai
 import os
+import threading
+import time
 from utils.config_manager import get_config
+from integrations.response_cache import get_response_cache, make_key
+from integrations.async_openai import get_async_llm, get_llm_stats
+from memory.context_builder import build_chat_messages, get_context_stats
 
-# Initialize OpenAI client
+MODEL = "gpt-3.5-turbo"
+RETRY_SECONDS = 60  # how long a missing key / failed build is remembered
+
+# The client is built on first use (or by the background warm-up), never
+# during import or startup. ai_status tracks where it got to:
+#   cold -> ready -> verified / unreachable   (probe result)
+#   cold -> offline                           (no key or openai missing)
 client = None
+ai_status = {'state': 'cold', 'error': None, 'probe_ms': None, 'checked_at': None}
+_client_lock = threading.Lock()
 
-def initialize_ai():
-    """Initialize OpenAI client with API key"""
-    global client
-    config = get_config()
+def _set_status(state, error=None, probe_ms=None):
+    ai_status.update(state=state, error=error, probe_ms=probe_ms, checked_at=time.time())
 
-    api_key = config.get('openai_api_key')
-    if not api_key:
-        # SILENT MODE - No warning messages
+def get_client():
+    """The OpenAI client, built on first call; None when AI is unavailable"""
+    global client
+    if client is not None:
+        return client
+
+    with _client_lock:
+        if client is not None:
+            return client
+        if ai_status['state'] == 'offline' and time.time() - ai_status['checked_at'] < RETRY_SECONDS:
+            return None
+
+        config = get_config()
+        api_key = config.get('openai_api_key')
+        if not api_key:
+            # SILENT MODE - No warning messages
+            _set_status('offline', 'no API key configured')
+            return None
+
+        try:
+            import openai
+            client = openai.OpenAI(api_key=api_key, base_url=config.get('openai_base_url') or None)
+            _set_status('ready')
+        except Exception as e:
+            _set_status('offline', str(e))
+        return client
+
+def probe_ai():
+    """Cheap health check (lists models, costs no tokens); records the result"""
+    if get_client() is None:
         return False
-
+    start = time.perf_counter()
     try:
-        client = openai.OpenAI(api_key=api_key)
-        # Test the connection with a simple request
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": "Say 'AI connected' in a creative way."}],
-            max_tokens=20
-        )
-        print("🤖 " + response.choices[0].message.content)
+        client.models.list()
+        _set_status('verified', probe_ms=round((time.perf_counter() - start) * 1000, 1))
         return True
     except Exception as e:
-        # SILENT MODE - No error messages
+        _set_status('unreachable', str(e))
         return False
 
-def chat_with_gpt(message, context=""):
+def _warm_up(probe):
+    if get_client() is not None and probe:
+        probe_ai()
+
+def initialize_ai(probe=None):
+    """Start building the client in the background; never blocks startup.
+
+    Returns whether an API key is configured, i.e. whether AI is expected
+    to come up. Use is_ai_ready() / get_ai_status() for the actual state.
+    """
+    if not get_config().get('openai_api_key'):
+        _set_status('offline', 'no API key configured')
+        return False
+
+    if probe is None:
+        probe = get_config().get('ai_health_probe', False)
+    threading.Thread(target=_warm_up, args=(probe,), name="aura-ai-warmup", daemon=True).start()
+    return True
+
+def is_ai_ready():
+    """Readiness flag: client built and not known to be unreachable"""
+    return ai_status['state'] in ('ready', 'verified')
+
+def get_ai_status():
+    return dict(ai_status, ready=is_ai_ready(), llm=get_llm_stats(), context=get_context_stats())
+
+def _complete(function, messages, max_tokens, temperature, model=MODEL):
+    """One chat completion, served from the response cache when possible"""
+    cache = get_response_cache()
+    key = make_key(messages, model, max_tokens, temperature)
+    if cache is not None:
+        cached = cache.get(key, function)
+        if cached is not None:
+            return cached
+
+    # Pooled, rate-limited and coalesced (see integrations.async_openai)
+    start = time.perf_counter()
+    content, tokens = get_async_llm().complete_sync(messages, model, max_tokens, temperature)
+
+    if cache is not None and content:
+        cache.put(key, function, content, tokens, (time.perf_counter() - start) * 1000)
+    return content
+
+def _stream_complete(function, messages, max_tokens, temperature, model=MODEL):
+    """Like _complete(), but yields the response text as it arrives.
+
+    A cache hit is yielded as one chunk. The full text is cached once the
+    stream finishes (openai 1.3 streams carry no token usage, so these
+    entries record 0 tokens).
+    """
+    cache = get_response_cache()
+    key = make_key(messages, model, max_tokens, temperature)
+    if cache is not None:
+        cached = cache.get(key, function)
+        if cached is not None:
+            yield cached
+            return
+
+    # Same pool, semaphore and timeout as _complete() (see integrations.async_openai)
+    start = time.perf_counter()
+    parts = []
+    for delta in get_async_llm().stream_sync(messages, model, max_tokens, temperature):
+        parts.append(delta)
+        yield delta
+
+    content = ''.join(parts)
+    if cache is not None and content:
+        cache.put(key, function, content, 0, (time.perf_counter() - start) * 1000)
+
+def _chat_messages(message, context, history):
+    if history and get_config().get('context_history_enabled', True):
+        # Recent turns and a digest of older ones, within the token budget
+        return build_chat_messages(message, context)
+
+    messages = []
+    if context:
+        messages.append({"role": "system", "content": context})
+
+    messages.append({"role": "user", "content": message})
+    return messages
+
+def chat_with_gpt(message, context="", history=True):
     """Chat with OpenAI GPT"""
-    if not client:
+    if not get_client():
         return "I'd be happy to help with that! How can I assist you?"
 
     try:
-        messages = []
-        if context:
-            messages.append({"role": "system", "content": context})
-
-        messages.append({"role": "user", "content": message})
+        return _complete('chat', _chat_messages(message, context, history), max_tokens=500, temperature=0.7)
+    except Exception as e:
+        return f"I'd be happy to help with that! How can I assist you?"
 
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=messages,
-            max_tokens=500,
-            temperature=0.7
-        )
+def stream_chat_with_gpt(message, context="", history=True):
+    """Chat with OpenAI GPT, yielding text deltas as they are generated"""
+    fallback = "I'd be happy to help with that! How can I assist you?"
+    if not get_client():
+        yield fallback
+        return
 
-        return response.choices[0].message.content
+    started = False
+    try:
+        for delta in _stream_complete('chat', _chat_messages(message, context, history), max_tokens=500, temperature=0.7):
+            started = True
+            yield delta
     except Exception as e:
-        return f"I'd be happy to help with that! How can I assist you?"
+        # Mid-stream failures keep what was already shown
+        if not started:
+            yield fallback
 
 def summarize_text(text):
     """Summarize text using AI"""
-    if not client:
+    if not get_client():
         return "I can help you summarize that! What would you like me to focus on?"
 
     prompt = f"Please summarize the following text concisely:\n\n{text}"
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=150,
-            temperature=0.3
-        )
-        return response.choices[0].message.content
+        return _complete('summarize', [{"role": "user", "content": prompt}], max_tokens=150, temperature=0.3)
     except Exception as e:
         return "I can help you summarize that! What would you like me to focus on?"
 
 def generate_content(topic, content_type="paragraph"):
     """Generate content using AI"""
-    if not client:
+    if not get_client():
         return f"I can help you create content about {topic}! What specific aspect would you like me to focus on?"
 
     prompts = {
@@ -85,30 +195,19 @@ def generate_content(topic, content_type="paragraph"):
     prompt = prompts.get(content_type, f"Write about: {topic}")
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=300,
-            temperature=0.7
-        )
-        return response.choices[0].message.content
+        return _complete('generate', [{"role": "user", "content": prompt}], max_tokens=300, temperature=0.7)
     except Exception as e:
         return f"I can help you create content about {topic}! What specific aspect would you like me to focus on?"
 
 def analyze_sentiment(text):
     """Analyze sentiment of text"""
-    if not client:
+    if not get_client():
         return "neutral"
 
     prompt = f"Analyze the sentiment of this text and respond with only one word: positive, negative, or neutral:\n\n{text}"
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=10,
-            temperature=0.1
-        )
-        return response.choices[0].message.content.strip().lower()
+        content = _complete('sentiment', [{"role": "user", "content": prompt}], max_tokens=10, temperature=0.1)
+        return content.strip().lower()
     except Exception as e:
         return "neutral"
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""Persistent cache for OpenAI chat completions.
+
+Entries are content-addressed: the key is a SHA-256 of the normalised
+messages, model, max_tokens and temperature, so the same prompt with the
+same parameters is only paid for once per TTL. The cache lives in its own
+SQLite file (not aura.db) so lookups never contend with task writes. Each
+calling function has its own TTL, the table is bounded to max_entries with
+least-recently-used eviction, and per-function hits, misses and the tokens
+and time saved are kept for the hit-rate report.
+
+Run from the AURA directory:
+    python -m integrations.response_cache            # hit-rate report
+    python -m integrations.response_cache --clear    # drop all entries
+"""
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from utils.config_manager import get_config
+
+CACHE_FILE = "aura_cache.db"
+MAX_ENTRIES = 5000
+
+# Seconds a response stays valid, per openai_client function
+FUNCTION_TTLS = {
+    'chat': 60 * 60,
+    'summarize': 7 * 24 * 60 * 60,
+    'generate': 24 * 60 * 60,
+    'sentiment': 30 * 24 * 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        function TEXT NOT NULL,
+        response TEXT NOT NULL,
+        tokens INTEGER DEFAULT 0,
+        latency_ms REAL DEFAULT 0,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        last_used REAL NOT NULL,
+        hits INTEGER DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)",
+    """
+    CREATE TABLE IF NOT EXISTS cache_stats (
+        function TEXT PRIMARY KEY,
+        hits INTEGER DEFAULT 0,
+        misses INTEGER DEFAULT 0,
+        saved_tokens INTEGER DEFAULT 0,
+        saved_ms REAL DEFAULT 0
+    )
+    """,
+]
+
+
+def normalize_messages(messages):
+    """Whitespace-insensitive form of a chat message list"""
+    return [[m.get('role', ''), ' '.join(str(m.get('content', '')).split())] for m in messages]
+
+
+def make_key(messages, model, max_tokens, temperature):
+    payload = json.dumps({
+        'messages': normalize_messages(messages),
+        'model': model,
+        'max_tokens': max_tokens,
+        'temperature': round(float(temperature), 3),
+    }, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, cache_file=CACHE_FILE, max_entries=MAX_ENTRIES, ttls=None):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.ttls = dict(FUNCTION_TTLS, **(ttls or {}))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(cache_file, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def _count(self, function, column, amount=1, saved_tokens=0, saved_ms=0):
+        self._conn.execute(f"""
+            INSERT INTO cache_stats (function, {column}, saved_tokens, saved_ms) VALUES (?, ?, ?, ?)
+            ON CONFLICT (function) DO UPDATE SET
+                {column} = {column} + excluded.{column},
+                saved_tokens = saved_tokens + excluded.saved_tokens,
+                saved_ms = saved_ms + excluded.saved_ms
+        """, (function, amount, saved_tokens, saved_ms))
+
+    def get(self, key, function):
+        """Cached response text, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT response, tokens, latency_ms FROM responses WHERE key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+                if row is None:
+                    self._count(function, 'misses')
+                else:
+                    self._conn.execute(
+                        "UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key)
+                    )
+                    self._count(function, 'hits', saved_tokens=row[1], saved_ms=row[2])
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"Response cache read failed: {e}")
+                return None
+        return row[0] if row else None
+
+    def put(self, key, function, response, tokens=0, latency_ms=0):
+        now = time.time()
+        ttl = self.ttls.get(function, DEFAULT_TTL)
+        with self._lock:
+            try:
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO responses
+                        (key, function, response, tokens, latency_ms, created_at, expires_at, last_used)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (key, function, response, tokens, latency_ms, now, now + ttl, now))
+                self._evict(now)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"Response cache write failed: {e}")
+
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_used LIMIT ?
+                )
+            """, (count - self.max_entries,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM cache_stats")
+            self._conn.commit()
+
+    def report(self):
+        """Per-function hit rate and what the hits saved"""
+        with self._lock:
+            stats = self._conn.execute(
+                "SELECT function, hits, misses, saved_tokens, saved_ms FROM cache_stats ORDER BY function"
+            ).fetchall()
+            entries = dict(self._conn.execute(
+                "SELECT function, COUNT(*) FROM responses WHERE expires_at > ? GROUP BY function", (time.time(),)
+            ).fetchall())
+
+        report = {}
+        for function, hits, misses, saved_tokens, saved_ms in stats:
+            lookups = hits + misses
+            report[function] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / lookups, 3) if lookups else 0,
+                'saved_tokens': saved_tokens,
+                'saved_seconds': round(saved_ms / 1000, 1),
+                'entries': entries.get(function, 0),
+            }
+        return report
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Shared cache, or None when disabled with response_cache_enabled=false"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = get_config()
+                if not config.get('response_cache_enabled', True):
+                    return None
+                _cache = ResponseCache(max_entries=config.get('response_cache_max_entries', MAX_ENTRIES))
+    return _cache
+
+
+def main(argv):
+    cache = ResponseCache()
+    if '--clear' in argv:
+        cache.clear()
+        print("🧹 Response cache cleared")
+        return 0
+
+    report = cache.report()
+    if not report:
+        print("Response cache is empty")
+        return 0
+
+    print(f"{'function':<12}{'hits':>8}{'misses':>8}{'hit rate':>10}{'tokens saved':>14}{'time saved':>12}{'entries':>9}")
+    for function, row in report.items():
+        print(f"{function:<12}{row['hits']:>8}{row['misses']:>8}{row['hit_rate']:>10.1%}"
+              f"{row['saved_tokens']:>14}{row['saved_seconds']:>11}s{row['entries']:>9}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
\ No newline at end of file
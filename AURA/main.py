@@ -4,13 +4,14 @@ import re
 import speech_recognition as sr
 from memory.database import setup_database
 from voice.speech_to_text import listen, text_input
-from voice.text_to_speech import speak
+from voice.text_to_speech import speak, speak_stream
 from voice.wake_word import start_wake_word_detection
-from brain.nlp_processor import process_command
+from brain.nlp_processor import stream_command
 from memory.memory_manager import save_conversation
 from memory.reminder_manager import check_reminders, get_daily_summary
 from brain.habit_tracker import get_habit_summary
 from brain.smart_suggestions import get_smart_suggestions
+from brain.stats_engine import begin_snapshot, end_snapshot
 from utils.data_export import export_data
 from utils.config_manager import get_config, save_config
 from integrations.openai_client import initialize_ai
@@ -130,10 +131,8 @@ def improved_wake_word_detection():
                     speak("Stopping voice assistant")
                     break
                 elif command:
-                    # Process the command
-                    response = process_command(command)
-                    print(f"AURA: {response}")
-                    speak(response)
+                    # Process the command, speaking each sentence as it arrives
+                    response = speak_stream(stream_command(command))
                     save_conversation(command, response)
                 else:
                     print("❓ No command detected after wake word")
@@ -214,14 +213,17 @@ def initialize_aura():
         print(f"❌ Database setup failed: {e}")
         return False
 
-    # Initialize AI
+    # Initialize AI (client is built in the background, startup doesn't wait)
     print("🧠 Initializing AI engine...")
     ai_ready = initialize_ai()
     if ai_ready:
-        print("✅ AI engine ready")
+        print("✅ AI engine starting in the background")
     else:
         print("⚠️  AI engine offline - using basic mode")
 
+    # The summaries below share one pass over tasks and habits
+    begin_snapshot()
+
     # Check for reminders
     try:
         reminders = check_reminders()
@@ -256,6 +258,8 @@ def initialize_aura():
     except Exception as e:
         print(f"💡 Keep using AURA for personalized suggestions!")
 
+    end_snapshot()
+
     print("\n🎯 Available Modes:")
     print("1. Text Mode")
     print("2. Voice Mode")
@@ -342,8 +346,7 @@ def manual_voice_mode():
             if user_input.lower() in ['quit', 'exit', 'stop listening']:
                 break
 
-            response = process_command(user_input)
-            speak(response)
+            response = speak_stream(stream_command(user_input))
             save_conversation(user_input, response)
         except KeyboardInterrupt:
             print("\n👋 Exiting voice mode...")
@@ -372,8 +375,12 @@ def text_mode():
                 show_help()
                 continue
 
-            response = process_command(user_input)
-            print(f"\nAURA: {response}")
+            print("\nAURA: ", end="", flush=True)
+            response = ""
+            for delta in stream_command(user_input):
+                print(delta, end="", flush=True)
+                response += delta
+            print()
             save_conversation(user_input, response)
 
         except KeyboardInterrupt:
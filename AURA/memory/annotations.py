@@ -0,0 +1,209 @@
+"""Bulk sentiment and summary backfill for user_memory and file_memory.
+
+Rows are sent through the batch APIs in integrations.batch_ai and the
+results land in memory_annotations (migration 6), one value per
+(source, kind, source_id). Each finished batch is written back in one
+executemany transaction, so an interrupted run loses at most the batches
+in flight: the next run only selects rows that have no annotation yet and
+picks up where the last one stopped. Items the model could not answer are
+left unannotated and retried on the next run. A file_memory row whose
+summary changes loses its annotations (memory.file_memory) and is redone.
+
+Run from the AURA directory:
+    python -m memory.annotations --kind sentiment --source user_memory
+    python -m memory.annotations --status
+"""
+import argparse
+import threading
+import time
+from memory.database import get_connection
+
+# Text sent for each (source, kind); sentiment is about what the user said
+SOURCES = {
+    'user_memory': {
+        'sentiment': "user_input",
+        'summary': "user_input || char(10) || ai_response",
+        'where': "1 = 1",
+    },
+    'file_memory': {
+        'sentiment': "content_summary",
+        'summary': "content_summary",
+        'where': "content_summary IS NOT NULL AND content_summary != ''",
+    },
+}
+KINDS = ('sentiment', 'summary')
+PAGE_ROWS = 500  # rows fetched per round; batches within a round run concurrently
+
+
+def _pending(source, kind, after_id, limit):
+    """Unannotated (id, text) rows after after_id, in id order"""
+    spec = SOURCES[source]
+    conn = get_connection()
+    if conn is None:
+        return []
+    cur = conn.cursor()
+    try:
+        cur.execute(f"""
+            SELECT m.id, {spec[kind]}
+            FROM {source} m
+            WHERE m.id > ? AND {spec['where']}
+              AND NOT EXISTS (
+                  SELECT 1 FROM memory_annotations a
+                  WHERE a.source = ? AND a.kind = ? AND a.source_id = m.id
+              )
+            ORDER BY m.id
+            LIMIT ?
+        """, (after_id, source, kind, limit))
+        return cur.fetchall()
+    except Exception as e:
+        print(f"Error fetching rows to annotate: {e}")
+        return []
+    finally:
+        cur.close()
+        conn.close()
+
+
+def save_annotations(source, kind, pairs):
+    """Bulk upsert of (source_id, value) pairs in one transaction"""
+    if not pairs:
+        return 0
+    conn = get_connection()
+    if conn is None:
+        return 0
+    cur = conn.cursor()
+    try:
+        cur.executemany("""
+            INSERT OR REPLACE INTO memory_annotations (source, source_id, kind, value)
+            VALUES (?, ?, ?, ?)
+        """, [(source, source_id, kind, value) for source_id, value in pairs])
+        conn.commit()
+        return len(pairs)
+    except Exception as e:
+        print(f"Error saving annotations: {e}")
+        return 0
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_annotations(source, kind, source_ids):
+    """{source_id: value} for the given rows"""
+    source_ids = list(source_ids)
+    if not source_ids:
+        return {}
+    conn = get_connection()
+    if conn is None:
+        return {}
+    cur = conn.cursor()
+    try:
+        placeholders = ",".join("?" * len(source_ids))
+        cur.execute(f"""
+            SELECT source_id, value FROM memory_annotations
+            WHERE source = ? AND kind = ? AND source_id IN ({placeholders})
+        """, [source, kind] + source_ids)
+        return dict(cur.fetchall())
+    except Exception as e:
+        print(f"Error fetching annotations: {e}")
+        return {}
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_annotation_status():
+    """{source: {kind: (annotated, total)}}"""
+    status = {}
+    conn = get_connection()
+    if conn is None:
+        return status
+    cur = conn.cursor()
+    try:
+        for source, spec in SOURCES.items():
+            cur.execute(f"SELECT COUNT(*) FROM {source} WHERE {spec['where']}")
+            total = cur.fetchone()[0]
+            status[source] = {}
+            for kind in KINDS:
+                cur.execute("SELECT COUNT(*) FROM memory_annotations WHERE source = ? AND kind = ?",
+                            (source, kind))
+                status[source][kind] = (cur.fetchone()[0], total)
+        return status
+    except Exception as e:
+        print(f"Error fetching annotation status: {e}")
+        return status
+    finally:
+        cur.close()
+        conn.close()
+
+
+def backfill(kind, source='user_memory', batch_size=None, concurrency=None, limit=None, verbose=True):
+    """Annotate every pending row of source; safe to interrupt and rerun"""
+    from integrations.async_openai import get_async_llm
+    from integrations.batch_ai import batch_process, make_rate_budget
+
+    stats = {'rows': 0, 'saved': 0, 'failed': 0, 'seconds': 0.0}
+    if get_async_llm() is None:
+        print("AI is not configured; nothing to backfill")
+        return stats
+
+    lock = threading.Lock()
+    budget = make_rate_budget()  # one budget for the whole job, not per page
+    start = time.perf_counter()
+    after_id = 0
+    while limit is None or stats['rows'] < limit:
+        page = PAGE_ROWS if limit is None else min(PAGE_ROWS, limit - stats['rows'])
+        rows = _pending(source, kind, after_id, page)
+        if not rows:
+            break
+        # Rows that fail this run sit behind after_id until the next run
+        after_id = rows[-1][0]
+        ids = [row[0] for row in rows]
+
+        def write_back(offset, results, ids=ids):
+            pairs = [(ids[offset + i], value) for i, value in enumerate(results) if value]
+            saved = save_annotations(source, kind, pairs)
+            with lock:
+                stats['saved'] += saved
+                stats['failed'] += len(results) - saved
+                if verbose:
+                    print(f"  {source} {kind}: {stats['saved']} saved, {stats['failed']} failed", end="\r")
+
+        batch_process(kind, [row[1] or "" for row in rows], batch_size, concurrency, budget, write_back)
+        stats['rows'] += len(rows)
+
+    stats['seconds'] = round(time.perf_counter() - start, 2)
+    if verbose:
+        print(f"\n✅ {source} {kind}: {stats['saved']} of {stats['rows']} rows annotated "
+              f"in {stats['seconds']}s ({stats['failed']} left for the next run)")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--kind', choices=KINDS + ('all',), default='all')
+    parser.add_argument('--source', choices=tuple(SOURCES) + ('all',), default='all')
+    parser.add_argument('--batch-size', type=int, help="texts per request (default per kind)")
+    parser.add_argument('--concurrency', type=int, help="batches in flight (default batch_concurrency)")
+    parser.add_argument('--limit', type=int, help="stop after this many rows per source and kind")
+    parser.add_argument('--status', action='store_true', help="show progress and exit")
+    args = parser.parse_args()
+
+    from memory.database import setup_database
+    setup_database()
+
+    if not args.status:
+        kinds = KINDS if args.kind == 'all' else (args.kind,)
+        sources = tuple(SOURCES) if args.source == 'all' else (args.source,)
+        try:
+            for source in sources:
+                for kind in kinds:
+                    backfill(kind, source, args.batch_size, args.concurrency, args.limit)
+        except KeyboardInterrupt:
+            print("\n⏸️ Interrupted; finished batches are saved, run again to resume")
+
+    for source, kinds in get_annotation_status().items():
+        for kind, (done, total) in kinds.items():
+            print(f"{source:<12} {kind:<10} {done}/{total}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
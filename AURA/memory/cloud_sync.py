@@ -4,6 +4,7 @@ import os
 from datetime import datetime
 from utils.config_manager import get_config
 from utils.security import encrypt_data, decrypt_data
+from utils.cache import bump_generation
 
 
 class CloudSync:
@@ -79,15 +80,15 @@ class CloudSync:
 
         try:
             # Backup tasks
-            cur.execute("SELECT * FROM tasks")
+            cur.execute("SELECT id, task_text, due_date, priority, status, created_at FROM tasks")
             backup['tasks'] = cur.fetchall()
 
             # Backup habits
-            cur.execute("SELECT * FROM habits")
+            cur.execute("SELECT id, habit_name, frequency, streak_count, last_completed, total_completions, created_at FROM habits")
             backup['habits'] = cur.fetchall()
 
             # Backup memories
-            cur.execute("SELECT * FROM user_memory")
+            cur.execute("SELECT id, user_input, ai_response, timestamp, memory_type FROM user_memory")
             backup['memories'] = cur.fetchall()
 
             # Backup configuration
@@ -117,17 +118,21 @@ class CloudSync:
 
             # Restore tasks
             for task in backup_data.get('tasks', []):
-                cur.execute("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?)", task)
+                cur.execute("INSERT INTO tasks (id, task_text, due_date, priority, status, created_at) VALUES (?, ?, ?, ?, ?, ?)", task)
 
             # Restore habits
             for habit in backup_data.get('habits', []):
-                cur.execute("INSERT INTO habits VALUES (?, ?, ?, ?, ?, ?)", habit)
+                cur.execute("""
+                    INSERT INTO habits (id, habit_name, frequency, streak_count, last_completed, total_completions, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, habit)
 
             # Restore memories
             for memory in backup_data.get('memories', []):
-                cur.execute("INSERT INTO user_memory VALUES (?, ?, ?, ?, ?)", memory)
+                cur.execute("INSERT INTO user_memory (id, user_input, ai_response, timestamp, memory_type) VALUES (?, ?, ?, ?, ?)", memory)
 
             conn.commit()
+            bump_generation('tasks', 'habits', 'user_memory')
             return True
 
         except Exception as e:
@@ -0,0 +1,287 @@
+"""Token-budgeted chat context from user_memory.
+
+build_chat_messages() turns the current message into the message list sent
+to the model:
+
+    system prompt + digest of older turns
+    the most relevant recent turns that fit the budget (oldest first)
+    the current message
+
+Token counts use estimate_tokens(), a local approximation of the model's
+tokenizer (about 4 characters per token; long words count as several).
+Turns older than the recent window are folded into a running summary kept
+in conversation_summaries (migration 5). The summary is refreshed in the
+background once SUMMARY_BATCH new turns have aged out of the window, so a
+request never waits for it: it just sends the latest stored digest. The
+digest keeps its newest part: when it outgrows DIGEST_TOKENS the oldest
+topics are cut, and covered_until only moves past turns it actually holds.
+
+Turns still in the conversation logger's write-behind queue are merged in
+from memory, so a request never waits for them to be committed either.
+"""
+import math
+import re
+import threading
+from memory.database import get_connection
+from memory.conversation_logger import pending_conversations
+from utils.config_manager import get_config
+
+TOKEN_BUDGET = 1200  # prompt tokens per chat request, all messages included
+RECENT_TURNS = 20  # candidate turns considered for verbatim inclusion
+SUMMARY_BATCH = 10  # aged-out turns that trigger a summary refresh
+DIGEST_TOKENS = 200  # cap on the stored summary
+MESSAGE_OVERHEAD = 4  # role/formatting tokens per message
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from have how i in is it me my of on or so "
+    "that the this to was what when where which who why will with you your".split()
+)
+
+_stats_lock = threading.Lock()
+_stats = {'requests': 0, 'prompt_tokens': 0, 'max_prompt_tokens': 0, 'last_prompt_tokens': 0,
+          'history_turns': 0, 'summaries_built': 0}
+_summary_lock = threading.Lock()
+
+
+def estimate_tokens(text):
+    """Fast local token estimate: one per word or symbol, longer words ~4 chars/token"""
+    if not text:
+        return 0
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_RE.findall(text))
+
+
+def estimate_message_tokens(messages):
+    return sum(estimate_tokens(m['content']) + MESSAGE_OVERHEAD for m in messages)
+
+
+def _keywords(text):
+    return {word for word in re.findall(r"\w+", text.lower()) if word not in _STOPWORDS and len(word) > 2}
+
+
+def _fetch_turns(cur, limit):
+    cur.execute("""
+        SELECT id, user_input, ai_response, timestamp
+        FROM user_memory
+        WHERE memory_type = 'conversation'
+        ORDER BY id DESC
+        LIMIT ?
+    """, (limit,))
+    return cur.fetchall()[::-1]
+
+
+def _merge_pending(turns, pending, limit):
+    """Committed turns followed by the uncommitted ones (id None), newest limit kept"""
+    # A batch committed between the two reads shows up in both
+    committed = {(user_input, ai_response, timestamp) for _, user_input, ai_response, timestamp in turns}
+    merged = [turn[:3] for turn in turns]
+    merged += [(None, user_input, ai_response) for user_input, ai_response, timestamp in pending
+               if (user_input, ai_response, timestamp) not in committed]
+    return merged[-limit:] if limit else []
+
+
+def _latest_summary(cur):
+    try:
+        cur.execute("SELECT covered_until, summary FROM conversation_summaries ORDER BY id DESC LIMIT 1")
+    except Exception:
+        # Pre-migration database
+        return 0, ""
+    row = cur.fetchone()
+    return (row[0], row[1]) if row else (0, "")
+
+
+def _select_turns(turns, message, budget):
+    """Most relevant turns within budget, returned oldest first.
+
+    Score = keyword overlap with the current message plus a recency bonus,
+    so the last exchange is nearly always kept and older turns only win
+    when they are on topic.
+    """
+    wanted = _keywords(message)
+    scored = []
+    for position, turn in enumerate(turns):
+        _, user_input, ai_response = turn
+        overlap = len(wanted & _keywords(user_input + " " + ai_response))
+        recency = (position + 1) / len(turns)
+        cost = estimate_tokens(user_input) + estimate_tokens(ai_response) + 2 * MESSAGE_OVERHEAD
+        scored.append((overlap + 2 * recency, position, cost))
+
+    chosen = []
+    for score, position, cost in sorted(scored, reverse=True):
+        if cost <= budget:
+            chosen.append(position)
+            budget -= cost
+    return [turns[position] for position in sorted(chosen)]
+
+
+def build_chat_messages(message, system_prompt="", token_budget=None):
+    """Messages for a chat request: system + digest, fitted history, message"""
+    config = get_config()
+    budget = token_budget or config.get('context_token_budget', TOKEN_BUDGET)
+    recent = config.get('context_recent_turns', RECENT_TURNS)
+
+    turns, covered_until, digest = [], 0, ""
+    pending = pending_conversations()
+    conn = get_connection()
+    if conn is not None:
+        cur = conn.cursor()
+        try:
+            turns = _fetch_turns(cur, recent)
+            covered_until, digest = _latest_summary(cur)
+        except Exception as e:
+            print(f"Error loading conversation context: {e}")
+        finally:
+            cur.close()
+            conn.close()
+    turns = _merge_pending(turns, pending, recent)
+
+    system = system_prompt
+    if digest:
+        system = (system + "\n\n" if system else "") + f"Summary of earlier conversation: {digest}"
+
+    head = [{"role": "system", "content": system}] if system else []
+    tail = [{"role": "user", "content": message}]
+    remaining = budget - estimate_message_tokens(head + tail)
+
+    history = []
+    for _, user_input, ai_response in _select_turns(turns, message, max(remaining, 0)):
+        history.append({"role": "user", "content": user_input})
+        history.append({"role": "assistant", "content": ai_response})
+
+    messages = head + history + tail
+    _record(estimate_message_tokens(messages), len(history) // 2)
+
+    # Turns older than the window that the digest doesn't cover yet
+    if turns and turns[0][0] is not None and turns[0][0] - 1 - covered_until >= SUMMARY_BATCH:
+        threading.Thread(target=refresh_summary, args=(turns[0][0] - 1,),
+                         name="aura-context-summary", daemon=True).start()
+    return messages
+
+
+def _local_digest(previous, turns):
+    """Extractive fallback when the AI summarizer is unavailable: (digest, turns covered)"""
+    # New topics get at least half the digest; the previous digest keeps its newest part
+    lead = "Later the user asked about:" if previous else "The user asked about:"
+    topics, used = _fit_turns(turns, DIGEST_TOKENS // 2 - estimate_tokens(lead),
+                              lambda turn: " ".join(turn[1].split()[:8]), "; ")
+    latest = f"{lead} {topics}."
+    if previous:
+        previous = _truncate(previous, DIGEST_TOKENS - estimate_tokens(latest), keep_end=True)
+    text = f"{previous} {latest}" if previous else latest
+    return _truncate(text, DIGEST_TOKENS, keep_end=True), used
+
+
+def _fit_turns(turns, tokens, render, separator):
+    """Render turns oldest first while they fit in tokens: (text, turns used).
+
+    The first turn is always used, cut to fit if it is too long alone, so a
+    refresh always makes progress.
+    """
+    parts, used = [], 0
+    for turn in turns:
+        part = render(turn)
+        if parts and estimate_tokens(separator.join(parts + [part])) > tokens:
+            break
+        parts.append(part)
+        used += 1
+    return _truncate(separator.join(parts), tokens), used
+
+
+def _truncate(text, tokens, keep_end=False):
+    """text cut to at most tokens, dropping words from the end (or the start, with keep_end)"""
+    words = text.split()
+    while words and estimate_tokens(" ".join(words)) > tokens:
+        keep = max(len(words) * 3 // 4, len(words) - 50)
+        words = words[-keep:] if keep_end and keep else words[:keep]
+    return " ".join(words)
+
+
+def refresh_summary(up_to_id):
+    """Fold turns up to up_to_id into a new running summary row"""
+    if not _summary_lock.acquire(blocking=False):
+        return False  # another refresh is already running
+
+    try:
+        conn = get_connection()
+        if conn is None:
+            return False
+        cur = conn.cursor()
+        try:
+            covered_until, previous = _latest_summary(cur)
+            cur.execute("""
+                SELECT id, user_input, ai_response FROM user_memory
+                WHERE memory_type = 'conversation' AND id > ? AND id <= ?
+                ORDER BY id
+            """, (covered_until, up_to_id))
+            turns = cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+
+        if not turns:
+            return False
+
+        digest, used = _summarize(previous, turns)
+        if not used:
+            return False
+
+        conn = get_connection()
+        if conn is None:
+            return False
+        cur = conn.cursor()
+        try:
+            cur.execute("""
+                INSERT INTO conversation_summaries (covered_until, summary, tokens)
+                VALUES (?, ?, ?)
+            """, (turns[used - 1][0], digest, estimate_tokens(digest)))
+            # Only the newest digest is ever read
+            cur.execute("DELETE FROM conversation_summaries WHERE id < last_insert_rowid()")
+            conn.commit()
+        finally:
+            cur.close()
+            conn.close()
+
+        with _stats_lock:
+            _stats['summaries_built'] += 1
+        return True
+    except Exception as e:
+        print(f"Error refreshing conversation summary: {e}")
+        return False
+    finally:
+        _summary_lock.release()
+
+
+def _summarize(previous, turns):
+    from integrations.openai_client import get_client, summarize_text
+
+    if get_client() is None:
+        return _local_digest(previous, turns)
+
+    # Keep the summarizer's own prompt within budget too: the previous digest
+    # (already at most DIGEST_TOKENS) plus as many new turns as fit after it
+    head = f"Earlier summary: {previous}\n\n" if previous else ""
+    transcript, used = _fit_turns(turns, TOKEN_BUDGET * 2 - estimate_tokens(head),
+                                  lambda turn: f"User: {turn[1]}\nAURA: {turn[2]}", "\n")
+    summary = summarize_text(head + transcript)
+    if not summary or summary.startswith("I can help you summarize"):
+        return _local_digest(previous, turns)
+    return _truncate(summary, DIGEST_TOKENS, keep_end=True), used
+
+
+def _record(prompt_tokens, history_turns):
+    with _stats_lock:
+        _stats['requests'] += 1
+        _stats['prompt_tokens'] += prompt_tokens
+        _stats['last_prompt_tokens'] = prompt_tokens
+        _stats['max_prompt_tokens'] = max(_stats['max_prompt_tokens'], prompt_tokens)
+        _stats['history_turns'] += history_turns
+
+
+def get_context_stats():
+    """Prompt-token metrics for chat requests built here"""
+    with _stats_lock:
+        stats = dict(_stats)
+    requests = stats['requests']
+    stats['avg_prompt_tokens'] = round(stats['prompt_tokens'] / requests, 1) if requests else 0
+    stats['avg_history_turns'] = round(stats['history_turns'] / requests, 2) if requests else 0
+    return stats
\ No newline at end of file
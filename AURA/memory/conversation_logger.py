@@ -0,0 +1,244 @@
+"""Write-behind logger for conversation turns.
+
+save_conversation() runs on the response path of every chat turn. Instead
+of inserting and committing one row there, turns are put on a bounded queue
+and a background thread writes them in batches with executemany, one
+transaction per batch. The batch is flushed when it reaches batch_size, when
+flush_interval has passed since its first row, when flush() is called and
+at interpreter shutdown. A row the database rejects (e.g. a NULL response)
+is dropped on its own; the rest of its batch is still written.
+"""
+import atexit
+import collections
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from memory.database import get_connection
+
+MAX_QUEUE = 1000
+BATCH_SIZE = 100
+FLUSH_INTERVAL = 0.5  # seconds a row may wait before its batch is written
+PUT_TIMEOUT = 2.0  # how long a producer blocks on a full queue
+
+INSERT_SQL = """
+    INSERT INTO user_memory (user_input, ai_response, memory_type, timestamp)
+    VALUES (?, ?, ?, ?)
+"""
+
+_STOP = object()
+_FLUSH = object()  # wakes the writer: commit the batch collected so far
+
+
+def _utc_timestamp():
+    # Same format and timezone as the column's CURRENT_TIMESTAMP default
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class ConversationLogger:
+    def __init__(self, max_queue=MAX_QUEUE, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL, put_timeout=PUT_TIMEOUT):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pending = collections.deque()  # rows queued but not yet committed or dropped
+        self.stats = {
+            'enqueued': 0, 'written': 0, 'batches': 0,
+            'blocked': 0, 'sync_writes': 0, 'dropped': 0, 'max_depth': 0
+        }
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="aura-conversation-logger", daemon=True)
+                self._thread.start()
+
+    def log(self, user_input, ai_response, memory_type="conversation"):
+        """Queue one turn for writing; returns without touching the disk"""
+        row = (user_input, ai_response, memory_type, _utc_timestamp())
+        self.start()
+        with self._lock:
+            self._pending.append(row)
+
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            # Back-pressure: slow the producer down rather than grow unbounded
+            with self._lock:
+                self.stats['blocked'] += 1
+            try:
+                self._queue.put(row, timeout=self.put_timeout)
+            except queue.Full:
+                # Writer is stuck (e.g. database locked); don't lose the turn
+                with self._lock:
+                    self.stats['sync_writes'] += 1
+                return self._write([row])
+
+        with self._lock:
+            self.stats['enqueued'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], self._queue.qsize())
+        return True
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                self._queue.task_done()
+                return
+            if first is _FLUSH:
+                self._queue.task_done()
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            signal = None
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP or item is _FLUSH:
+                    signal = item
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            for _ in range(len(batch) + (1 if signal else 0)):
+                self._queue.task_done()
+            if signal is _STOP:
+                return
+
+    def _write(self, batch, attempts=3):
+        for attempt in range(attempts):
+            conn = get_connection()
+            if conn is None:
+                time.sleep(0.1 * (attempt + 1))
+                continue
+
+            cur = conn.cursor()
+            try:
+                cur.executemany(INSERT_SQL, batch)
+                conn.commit()
+                self._finish(batch, len(batch))
+                return True
+            except sqlite3.OperationalError as e:
+                # Locked or busy: the same batch can succeed on a retry
+                conn.rollback()
+                print(f"Error saving conversation: {e}")
+                time.sleep(0.1 * (attempt + 1))
+            except sqlite3.Error as e:
+                # A bad row fails the whole executemany; find it row by row
+                conn.rollback()
+                print(f"Error saving conversation: {e}")
+                return self._write_rows(conn, cur, batch)
+            finally:
+                cur.close()
+                conn.close()
+
+        self._finish(batch, 0)
+        return False
+
+    def _write_rows(self, conn, cur, batch):
+        written = 0
+        try:
+            for row in batch:
+                try:
+                    cur.execute(INSERT_SQL, row)
+                    written += 1
+                except sqlite3.OperationalError:
+                    raise
+                except sqlite3.Error as e:
+                    print(f"Dropped conversation turn: {e}")
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Error saving conversation: {e}")
+            written = 0
+        self._finish(batch, written)
+        return written == len(batch)
+
+    def _finish(self, batch, written):
+        """Count a batch's outcome and take its rows off the pending list"""
+        with self._lock:
+            self.stats['written'] += written
+            self.stats['dropped'] += len(batch) - written
+            if written:
+                self.stats['batches'] += 1
+            for row in batch:
+                try:
+                    self._pending.remove(row)
+                except ValueError:
+                    pass
+
+    def pending(self, memory_type="conversation"):
+        """(user_input, ai_response, timestamp) of rows not yet committed, oldest first"""
+        with self._lock:
+            return [(row[0], row[1], row[3]) for row in self._pending if row[2] == memory_type]
+
+    def flush(self, timeout=5.0):
+        """Block until everything queued so far has been written"""
+        if self._thread is None:
+            return True
+
+        if self._queue.unfinished_tasks:
+            try:
+                # Without this the writer keeps collecting until flush_interval runs out
+                self._queue.put_nowait(_FLUSH)
+            except queue.Full:
+                pass  # a full queue is written in full batches without waiting
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout=5.0):
+        """Write out the remaining queue and stop the writer thread"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats['queued'] = self._queue.qsize()
+        return stats
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def get_conversation_logger():
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                _logger = ConversationLogger()
+                atexit.register(_logger.stop)
+    return _logger
+
+
+def pending_conversations(memory_type="conversation"):
+    """Turns saved in this process that the writer has not committed yet"""
+    if _logger is None:
+        return []
+    return _logger.pending(memory_type)
+
+
+def flush_conversations(timeout=5.0):
+    if _logger is None:
+        return True
+    return _logger.flush(timeout)
\ No newline at end of file
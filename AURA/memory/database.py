@@ -1,17 +1,353 @@
 import sqlite3
 import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from utils.config_manager import get_config
+
+DB_FILE = 'aura.db'
+
+# Upper bound on connections held by the pool. Flask, the GUI workers and the
+# voice loop each lease one connection at a time, so a handful is plenty.
+POOL_MAX_SIZE = 8
+POOL_TIMEOUT = 10
+
+# Applied once when a connection is opened, not on every lease
+CONNECTION_PRAGMAS = [
+    "PRAGMA temp_store = MEMORY",
+]
+
+# Storage profiles, selected with "storage_profile" in aura_config.json.
+# journal_mode is persistent and set by setup_database(); everything else is
+# per-connection and applied when the pool opens a connection.
+STORAGE_PROFILES = {
+    # Concurrent readers alongside one writer; commits skip the fsync of
+    # the main file and only sync the WAL at checkpoints.
+    'wal': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -16000,  # KiB, i.e. ~16 MB
+        'busy_timeout': 5000,
+        'wal_autocheckpoint': 1000,
+        'checkpoint_interval': 60,
+        'checkpoint_truncate_bytes': 64 * 1024 * 1024,
+    },
+    # WAL with a full fsync on every commit
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -16000,
+        'busy_timeout': 5000,
+        'wal_autocheckpoint': 1000,
+        'checkpoint_interval': 60,
+        'checkpoint_truncate_bytes': 64 * 1024 * 1024,
+    },
+    # The original rollback-journal behaviour
+    'legacy': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000,
+    },
+}
+DEFAULT_STORAGE_PROFILE = 'wal'
+
+PROFILE_PRAGMAS = ['synchronous', 'mmap_size', 'cache_size', 'busy_timeout', 'wal_autocheckpoint']
+
+
+def get_storage_profile(name=None):
+    """Resolve a storage profile by name, falling back to the configured one"""
+    if name is None:
+        name = get_config().get('storage_profile', DEFAULT_STORAGE_PROFILE)
+    if name not in STORAGE_PROFILES:
+        print(f"⚠️  Unknown storage profile '{name}', using '{DEFAULT_STORAGE_PROFILE}'")
+        name = DEFAULT_STORAGE_PROFILE
+    return name, STORAGE_PROFILES[name]
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to the pool"""
+
+    def close(self):
+        pool = getattr(self, 'pool', None)
+        if pool is None:
+            super().close()
+        else:
+            pool.release(self)
+
+    def really_close(self):
+        super().close()
+
+
+class ConnectionPool:
+    """Bounded pool of long-lived connections with per-thread leases.
+
+    A thread that asks for a connection while it already holds one gets the
+    same connection back, so nested helpers share a single lease.
+    """
+
+    def __init__(self, db_file=DB_FILE, max_size=POOL_MAX_SIZE, timeout=POOL_TIMEOUT, profile=None):
+        self.db_file = db_file
+        self.profile_name, self.profile = get_storage_profile(profile)
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._size = 0
+        self.stats = {'opened': 0, 'reused': 0, 'closed': 0, 'waits': 0}
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_file, timeout=self.timeout,
+                               check_same_thread=False, factory=PooledConnection)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        for name in PROFILE_PRAGMAS:
+            if name in self.profile:
+                conn.execute(f"PRAGMA {name} = {self.profile[name]}")
+        conn.pool = self
+        return conn
+
+    def acquire(self):
+        held = getattr(self._local, 'conn', None)
+        if held is not None:
+            self._local.depth += 1
+            with self._lock:
+                self.stats['reused'] += 1
+            return held
+
+        try:
+            conn = self._idle.get_nowait()
+            with self._lock:
+                self.stats['reused'] += 1
+        except queue.Empty:
+            with self._lock:
+                can_open = self._size < self.max_size
+                if can_open:
+                    # Reserve the slot, then connect outside the lock
+                    self._size += 1
+            if can_open:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                    raise
+                with self._lock:
+                    self.stats['opened'] += 1
+            else:
+                with self._lock:
+                    self.stats['waits'] += 1
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError("connection pool exhausted")
+                with self._lock:
+                    self.stats['reused'] += 1
+
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self, conn):
+        if getattr(self._local, 'conn', None) is not conn:
+            # Not leased by this thread (e.g. closed twice); nothing to do
+            return
+
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+
+        self._local.conn = None
+        try:
+            if conn.in_transaction:
+                # Match plain close(): uncommitted work is discarded
+                conn.rollback()
+            self._idle.put(conn)
+        except sqlite3.Error:
+            self._discard(conn)
+
+    def _discard(self, conn):
+        with self._lock:
+            self._size -= 1
+            self.stats['closed'] += 1
+        try:
+            conn.really_close()
+        except sqlite3.Error:
+            pass
+
+    def close_all(self):
+        """Close every idle connection (used at shutdown and before file swaps)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['open'] = self._size
+        stats['idle'] = self._idle.qsize()
+        stats['in_use'] = stats['open'] - stats['idle']
+        stats['max_size'] = self.max_size
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def configure_pool(db_file=DB_FILE, max_size=POOL_MAX_SIZE, timeout=POOL_TIMEOUT, profile=None):
+    """Replace the global pool, closing idle connections of the old one"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+        _pool = ConnectionPool(db_file, max_size, timeout, profile)
+    return _pool
+
+
+def close_all_connections():
+    if _pool is not None:
+        _pool.close_all()
+
+
+def get_pool_stats():
+    """Connections opened vs. reused since startup"""
+    return get_pool().get_stats()
 
 
 def get_connection():
     try:
-        conn = sqlite3.connect('aura.db')
-        return conn
+        return get_pool().acquire()
     except Exception as e:
         print(f"Database connection error: {e}")
         return None
 
 
+@contextmanager
+def db_connection():
+    """Lease a pooled connection; commits on success, rolls back on error"""
+    conn = get_pool().acquire()
+    try:
+        yield conn
+        if conn.in_transaction:
+            conn.commit()
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+class WalCheckpointer:
+    """Background thread that keeps the WAL file from growing unbounded.
+
+    Every interval it runs a PASSIVE checkpoint, which never blocks readers or
+    the writer. Once the -wal file passes truncate_bytes it escalates to a
+    TRUNCATE checkpoint so the file shrinks back to zero.
+    """
+
+    def __init__(self, interval=60, truncate_bytes=64 * 1024 * 1024):
+        self.interval = interval
+        self.truncate_bytes = truncate_bytes
+        self.stats = {'passive': 0, 'truncate': 0, 'busy': 0, 'pages_checkpointed': 0}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="aura-wal-checkpoint", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.checkpoint()
+            except Exception as e:
+                print(f"⚠️  WAL checkpoint skipped: {e}")
+
+    def checkpoint(self):
+        wal_file = get_pool().db_file + '-wal'
+        wal_size = os.path.getsize(wal_file) if os.path.exists(wal_file) else 0
+        mode = 'TRUNCATE' if wal_size >= self.truncate_bytes else 'PASSIVE'
+
+        conn = get_connection()
+        if conn is None:
+            return None
+
+        try:
+            busy, log_pages, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+            self.stats[mode.lower()] += 1
+            self.stats['busy'] += busy
+            self.stats['pages_checkpointed'] += max(checkpointed, 0)
+            return busy, log_pages, checkpointed
+        finally:
+            conn.close()
+
+
+_checkpointer = None
+
+
+def start_checkpointer(profile=None):
+    """Start the background WAL checkpointer if the profile uses WAL"""
+    global _checkpointer
+    if profile is None:
+        profile = get_pool().profile
+
+    if profile.get('journal_mode', '').upper() != 'WAL' or not profile.get('checkpoint_interval'):
+        return None
+
+    if _checkpointer is None:
+        _checkpointer = WalCheckpointer(profile['checkpoint_interval'],
+                                        profile.get('checkpoint_truncate_bytes', 64 * 1024 * 1024))
+    _checkpointer.start()
+    return _checkpointer
+
+
+def stop_checkpointer():
+    if _checkpointer is not None:
+        _checkpointer.stop()
+
+
+def apply_journal_mode(conn, profile):
+    """Switch the database file to the profile's journal mode (persistent)"""
+    wanted = profile.get('journal_mode', 'DELETE').upper()
+    for attempt in range(5):
+        try:
+            mode = conn.execute(f"PRAGMA journal_mode = {wanted}").fetchone()[0]
+            return mode.upper()
+        except sqlite3.OperationalError:
+            # Another process is mid-transaction; journal_mode needs a quiet moment
+            time.sleep(0.2 * (attempt + 1))
+    return conn.execute("PRAGMA journal_mode").fetchone()[0].upper()
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
 def setup_database():
     conn = get_connection()
     if conn is None:
@@ -21,64 +357,17 @@ def setup_database():
     cur = conn.cursor()
 
     try:
-        # Create user_memory table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS user_memory (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_input TEXT NOT NULL,
-                ai_response TEXT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                memory_type VARCHAR(50)
-            )
-        """)
-
-        # Create tasks table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_text TEXT NOT NULL,
-                due_date DATETIME,
-                priority INTEGER DEFAULT 1,
-                status VARCHAR(20) DEFAULT 'pending',
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Create habits table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS habits (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                habit_name TEXT NOT NULL UNIQUE,
-                frequency TEXT NOT NULL,
-                streak_count INTEGER DEFAULT 0,
-                last_completed DATE,
-                total_completions INTEGER DEFAULT 0,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Create habit_logs table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS habit_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                habit_id INTEGER,
-                completed_date DATE,
-                FOREIGN KEY (habit_id) REFERENCES habits (id)
-            )
-        """)
-
-        # Create file_memory table
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS file_memory (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                file_path TEXT UNIQUE,
-                content_summary TEXT,
-                last_accessed DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        conn.commit()
-        print("✅ Database tables created successfully!")
+        pool = get_pool()
+        mode = apply_journal_mode(conn, pool.profile)
+        print(f"💾 Storage profile: {pool.profile_name} (journal_mode={mode.lower()})")
+
+        # Tables and indexes are created by the versioned migrations
+        from memory.migrations import apply_migrations
+        apply_migrations(conn)
+        print(f"✅ Database tables created successfully! (schema v{get_schema_version(conn)})")
+
+        if mode == 'WAL':
+            start_checkpointer(pool.profile)
 
     except Exception as e:
         print(f"Error creating tables: {e}")
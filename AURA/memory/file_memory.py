@@ -1,6 +1,7 @@
 import os
 import sqlite3
 from memory.database import get_connection
+from memory.vector_store import get_vector_store
 
 
 def save_file_memory(file_path, content_summary):
@@ -11,13 +12,30 @@ def save_file_memory(file_path, content_summary):
     cur = conn.cursor()
 
     try:
+        # A changed summary voids the row's sentiment and summary, so the next
+        # memory.annotations run picks it up again; same transaction as the upsert
         cur.execute("""
-            INSERT OR REPLACE INTO file_memory 
-            (file_path, content_summary, last_accessed) 
+            DELETE FROM memory_annotations
+            WHERE source = 'file_memory' AND source_id = (
+                SELECT id FROM file_memory
+                WHERE file_path = ? AND content_summary IS NOT ?
+            )
+        """, (file_path, content_summary))
+
+        # Upsert rather than INSERT OR REPLACE: the row keeps its id, so the
+        # search index and memory_annotations stay attached to it
+        cur.execute("""
+            INSERT INTO file_memory (file_path, content_summary, last_accessed)
             VALUES (?, ?, datetime('now'))
+            ON CONFLICT (file_path) DO UPDATE SET
+                content_summary = excluded.content_summary,
+                last_accessed = excluded.last_accessed
         """, (file_path, content_summary))
 
         conn.commit()
+        store = get_vector_store()
+        if store is not None:
+            store.notify()
         return True
     except Exception as e:
         print(f"Error saving file memory: {e}")
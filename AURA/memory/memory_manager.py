@@ -1,30 +1,31 @@
 from memory.database import get_connection
+from memory.conversation_logger import get_conversation_logger, flush_conversations
+from memory.vector_store import get_vector_store, find_similar
 
 
 def save_conversation(user_input, ai_response, memory_type="conversation"):
-    conn = get_connection()
-    if conn is None:
-        return False
-
-    cur = conn.cursor()
-
+    """Queue a conversation turn; it is written in the background in batches"""
     try:
-        cur.execute("""
-            INSERT INTO user_memory (user_input, ai_response, memory_type) 
-            VALUES (?, ?, ?)
-        """, (user_input, ai_response, memory_type))
-
-        conn.commit()
-        return True
+        logged = get_conversation_logger().log(user_input, ai_response, memory_type)
+        store = get_vector_store()
+        if store is not None:
+            # Embedded in the background (see memory.vector_store)
+            store.notify()
+        return logged
     except Exception as e:
         print(f"Error saving conversation: {e}")
         return False
-    finally:
-        cur.close()
-        conn.close()
+
+
+def find_similar_memories(text, limit=5):
+    """Past conversations closest in meaning to text, best first"""
+    return find_similar(text, limit, sources=('user_memory',))
 
 
 def get_recent_memories(limit=5):
+    # Make turns still sitting in the write-behind queue visible
+    flush_conversations()
+
     conn = get_connection()
     if conn is None:
         return []
@@ -0,0 +1,605 @@
+"""Versioned schema migrations for aura.db.
+
+The schema version lives in SQLite's PRAGMA user_version. Migrations are
+applied in order on startup, each in its own transaction, so a database
+created by any earlier AURA build is brought up to date in place.
+
+Run from the AURA directory:
+    python -m memory.migrations            # migrate aura.db
+    python -m memory.migrations --check    # fail if a hot query scans a table
+"""
+import re
+import sys
+from memory.database import get_connection, get_schema_version
+
+
+def _fts_steps(table, columns):
+    """External-content FTS5 index over table(columns), kept in sync by triggers.
+
+    The index stores only tokens; column values are read back from table
+    through the rowid, so it costs a fraction of a copy of the text.
+    """
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new = ", ".join(f"NEW.{c}" for c in columns)
+    old = ", ".join(f"OLD.{c}" for c in columns)
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols}, content='{table}', content_rowid='id', tokenize='porter unicode61'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {fts} (rowid, {cols}) VALUES (NEW.id, {new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', OLD.id, {old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {cols} ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', OLD.id, {old});
+            INSERT INTO {fts} (rowid, {cols}) VALUES (NEW.id, {new});
+        END
+        """,
+        # Index the rows that already exist
+        f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')",
+    ]
+
+
+# Each migration is (version, description, steps). A step is either a SQL
+# string or a callable taking the cursor, for data backfills.
+MIGRATIONS = [
+    (1, "baseline schema", [
+        """
+        CREATE TABLE IF NOT EXISTS user_memory (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_input TEXT NOT NULL,
+            ai_response TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            memory_type VARCHAR(50)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_text TEXT NOT NULL,
+            due_date DATETIME,
+            priority INTEGER DEFAULT 1,
+            status VARCHAR(20) DEFAULT 'pending',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS habits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            habit_name TEXT NOT NULL UNIQUE,
+            frequency TEXT NOT NULL,
+            streak_count INTEGER DEFAULT 0,
+            last_completed DATE,
+            total_completions INTEGER DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS habit_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            habit_id INTEGER,
+            completed_date DATE,
+            FOREIGN KEY (habit_id) REFERENCES habits (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS file_memory (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path TEXT UNIQUE,
+            content_summary TEXT,
+            last_accessed DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (2, "indexes for hot task, habit and memory queries", [
+        # get_pending_tasks, get_overdue_tasks, check_reminders, pending counts
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks (status, due_date)",
+        # get_completed_tasks, recent completions in get_smart_suggestions
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks (status, created_at)",
+        # get_productivity_analytics / get_recent_tasks: covers every column
+        # the windowed aggregates read, so they never touch the table itself
+        "CREATE INDEX IF NOT EXISTS idx_tasks_created_cover ON tasks (created_at, status, priority, due_date)",
+        # completed-today counts in get_habit_stats and get_smart_suggestions
+        "CREATE INDEX IF NOT EXISTS idx_habits_last_completed ON habits (last_completed)",
+        # get_habit_completion_rate, get_habit_history, delete_habit
+        "CREATE INDEX IF NOT EXISTS idx_habit_logs_habit_date ON habit_logs (habit_id, completed_date)",
+        # get_recent_memories
+        "CREATE INDEX IF NOT EXISTS idx_user_memory_timestamp ON user_memory (timestamp)",
+    ]),
+    (3, "stats_counters table kept in sync by triggers", [
+        """
+        CREATE TABLE IF NOT EXISTS stats_counters (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            tasks_total INTEGER NOT NULL DEFAULT 0,
+            tasks_completed INTEGER NOT NULL DEFAULT 0,
+            tasks_pending INTEGER NOT NULL DEFAULT 0,
+            habits_total INTEGER NOT NULL DEFAULT 0,
+            habit_completions INTEGER NOT NULL DEFAULT 0,
+            habit_streak_sum INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        INSERT OR REPLACE INTO stats_counters
+            (id, tasks_total, tasks_completed, tasks_pending,
+             habits_total, habit_completions, habit_streak_sum)
+        SELECT 1, t.total, t.completed, t.pending, h.total, h.completions, h.streaks
+        FROM (SELECT COUNT(*) AS total,
+                     IFNULL(SUM(status = 'completed'), 0) AS completed,
+                     IFNULL(SUM(status = 'pending'), 0) AS pending
+              FROM tasks) t,
+             (SELECT COUNT(*) AS total,
+                     IFNULL(SUM(total_completions), 0) AS completions,
+                     IFNULL(SUM(streak_count), 0) AS streaks
+              FROM habits) h
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_stats_tasks_insert AFTER INSERT ON tasks
+        BEGIN
+            UPDATE stats_counters SET
+                tasks_total = tasks_total + 1,
+                tasks_completed = tasks_completed + (NEW.status = 'completed'),
+                tasks_pending = tasks_pending + (NEW.status = 'pending')
+            WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_stats_tasks_delete AFTER DELETE ON tasks
+        BEGIN
+            UPDATE stats_counters SET
+                tasks_total = tasks_total - 1,
+                tasks_completed = tasks_completed - (OLD.status = 'completed'),
+                tasks_pending = tasks_pending - (OLD.status = 'pending')
+            WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_stats_tasks_status AFTER UPDATE OF status ON tasks
+        BEGIN
+            UPDATE stats_counters SET
+                tasks_completed = tasks_completed + (NEW.status = 'completed') - (OLD.status = 'completed'),
+                tasks_pending = tasks_pending + (NEW.status = 'pending') - (OLD.status = 'pending')
+            WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_stats_habits_insert AFTER INSERT ON habits
+        BEGIN
+            UPDATE stats_counters SET
+                habits_total = habits_total + 1,
+                habit_completions = habit_completions + IFNULL(NEW.total_completions, 0),
+                habit_streak_sum = habit_streak_sum + IFNULL(NEW.streak_count, 0)
+            WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_stats_habits_delete AFTER DELETE ON habits
+        BEGIN
+            UPDATE stats_counters SET
+                habits_total = habits_total - 1,
+                habit_completions = habit_completions - IFNULL(OLD.total_completions, 0),
+                habit_streak_sum = habit_streak_sum - IFNULL(OLD.streak_count, 0)
+            WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_stats_habits_update
+        AFTER UPDATE OF total_completions, streak_count ON habits
+        BEGIN
+            UPDATE stats_counters SET
+                habit_completions = habit_completions
+                    + IFNULL(NEW.total_completions, 0) - IFNULL(OLD.total_completions, 0),
+                habit_streak_sum = habit_streak_sum
+                    + IFNULL(NEW.streak_count, 0) - IFNULL(OLD.streak_count, 0)
+            WHERE id = 1;
+        END
+        """,
+        # Best streak becomes a single index probe instead of a MAX() scan
+        "CREATE INDEX IF NOT EXISTS idx_habits_streak ON habits (streak_count)",
+    ]),
+    (4, "daily_rollup table for analytics", [
+        # One row per UTC day of tasks.created_at / habit_logs.completed_date.
+        # tasks_completed counts tasks created that day that are now done,
+        # matching how get_productivity_analytics has always bucketed them.
+        """
+        CREATE TABLE IF NOT EXISTS daily_rollup (
+            day DATE PRIMARY KEY,
+            tasks_created INTEGER NOT NULL DEFAULT 0,
+            tasks_completed INTEGER NOT NULL DEFAULT 0,
+            priority_low INTEGER NOT NULL DEFAULT 0,
+            priority_medium INTEGER NOT NULL DEFAULT 0,
+            priority_high INTEGER NOT NULL DEFAULT 0,
+            priority_other INTEGER NOT NULL DEFAULT 0,
+            habit_completions INTEGER NOT NULL DEFAULT 0,
+            overdue_snapshot INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        # Tracks when overdue_snapshot was last recomputed (see analytics)
+        """
+        CREATE TABLE IF NOT EXISTS rollup_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            overdue_refreshed_at DATETIME
+        )
+        """,
+        "INSERT OR IGNORE INTO rollup_state (id, overdue_refreshed_at) VALUES (1, NULL)",
+        """
+        INSERT OR REPLACE INTO daily_rollup
+            (day, tasks_created, tasks_completed, priority_low, priority_medium,
+             priority_high, priority_other)
+        SELECT date(created_at), COUNT(*), IFNULL(SUM(status = 'completed'), 0),
+               IFNULL(SUM(priority = 1), 0), IFNULL(SUM(priority = 2), 0),
+               IFNULL(SUM(priority = 3), 0), SUM(priority IS NULL OR priority NOT IN (1, 2, 3))
+        FROM tasks
+        WHERE created_at IS NOT NULL
+        GROUP BY date(created_at)
+        """,
+        """
+        INSERT INTO daily_rollup (day, habit_completions)
+        SELECT completed_date, COUNT(*)
+        FROM habit_logs
+        WHERE completed_date IS NOT NULL
+        GROUP BY completed_date
+        ON CONFLICT (day) DO UPDATE SET habit_completions = excluded.habit_completions
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_tasks_insert AFTER INSERT ON tasks
+        WHEN NEW.created_at IS NOT NULL
+        BEGIN
+            INSERT INTO daily_rollup (day) VALUES (date(NEW.created_at))
+            ON CONFLICT (day) DO NOTHING;
+            UPDATE daily_rollup SET
+                tasks_created = tasks_created + 1,
+                tasks_completed = tasks_completed + IFNULL(NEW.status = 'completed', 0),
+                priority_low = priority_low + IFNULL(NEW.priority = 1, 0),
+                priority_medium = priority_medium + IFNULL(NEW.priority = 2, 0),
+                priority_high = priority_high + IFNULL(NEW.priority = 3, 0),
+                priority_other = priority_other + (NEW.priority IS NULL OR NEW.priority NOT IN (1, 2, 3)),
+                overdue_snapshot = overdue_snapshot
+                    + IFNULL(NEW.status = 'pending' AND NEW.due_date < datetime('now'), 0)
+            WHERE day = date(NEW.created_at);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_tasks_delete AFTER DELETE ON tasks
+        WHEN OLD.created_at IS NOT NULL
+        BEGIN
+            UPDATE daily_rollup SET
+                tasks_created = tasks_created - 1,
+                tasks_completed = tasks_completed - IFNULL(OLD.status = 'completed', 0),
+                priority_low = priority_low - IFNULL(OLD.priority = 1, 0),
+                priority_medium = priority_medium - IFNULL(OLD.priority = 2, 0),
+                priority_high = priority_high - IFNULL(OLD.priority = 3, 0),
+                priority_other = priority_other - (OLD.priority IS NULL OR OLD.priority NOT IN (1, 2, 3)),
+                overdue_snapshot = MAX(overdue_snapshot
+                    - IFNULL(OLD.status = 'pending' AND OLD.due_date < datetime('now'), 0), 0)
+            WHERE day = date(OLD.created_at);
+        END
+        """,
+        # An update is a delete of the old row's contribution plus an insert
+        # of the new one, which also covers created_at moving between days
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_tasks_update
+        AFTER UPDATE OF status, priority, due_date, created_at ON tasks
+        BEGIN
+            UPDATE daily_rollup SET
+                tasks_created = tasks_created - 1,
+                tasks_completed = tasks_completed - IFNULL(OLD.status = 'completed', 0),
+                priority_low = priority_low - IFNULL(OLD.priority = 1, 0),
+                priority_medium = priority_medium - IFNULL(OLD.priority = 2, 0),
+                priority_high = priority_high - IFNULL(OLD.priority = 3, 0),
+                priority_other = priority_other - (OLD.priority IS NULL OR OLD.priority NOT IN (1, 2, 3)),
+                overdue_snapshot = MAX(overdue_snapshot
+                    - IFNULL(OLD.status = 'pending' AND OLD.due_date < datetime('now'), 0), 0)
+            WHERE day = date(OLD.created_at);
+            INSERT INTO daily_rollup (day) SELECT date(NEW.created_at)
+            WHERE NEW.created_at IS NOT NULL
+            ON CONFLICT (day) DO NOTHING;
+            UPDATE daily_rollup SET
+                tasks_created = tasks_created + 1,
+                tasks_completed = tasks_completed + IFNULL(NEW.status = 'completed', 0),
+                priority_low = priority_low + IFNULL(NEW.priority = 1, 0),
+                priority_medium = priority_medium + IFNULL(NEW.priority = 2, 0),
+                priority_high = priority_high + IFNULL(NEW.priority = 3, 0),
+                priority_other = priority_other + (NEW.priority IS NULL OR NEW.priority NOT IN (1, 2, 3)),
+                overdue_snapshot = overdue_snapshot
+                    + IFNULL(NEW.status = 'pending' AND NEW.due_date < datetime('now'), 0)
+            WHERE day = date(NEW.created_at);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_habit_logs_insert AFTER INSERT ON habit_logs
+        WHEN NEW.completed_date IS NOT NULL
+        BEGIN
+            INSERT INTO daily_rollup (day) VALUES (NEW.completed_date)
+            ON CONFLICT (day) DO NOTHING;
+            UPDATE daily_rollup SET habit_completions = habit_completions + 1
+            WHERE day = NEW.completed_date;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_habit_logs_delete AFTER DELETE ON habit_logs
+        WHEN OLD.completed_date IS NOT NULL
+        BEGIN
+            UPDATE daily_rollup SET habit_completions = habit_completions - 1
+            WHERE day = OLD.completed_date;
+        END
+        """,
+    ]),
+    (5, "conversation_summaries for the chat context builder", [
+        # Running digests of older chat turns; the newest row covers every
+        # user_memory id up to covered_until (see memory.context_builder)
+        """
+        CREATE TABLE IF NOT EXISTS conversation_summaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            covered_until INTEGER NOT NULL,
+            summary TEXT NOT NULL,
+            tokens INTEGER DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (6, "memory_annotations for batched sentiment and summaries", [
+        # One value per (source table, row id, kind), written by the bulk
+        # backfill in memory.annotations; a missing row means "not done yet"
+        """
+        CREATE TABLE IF NOT EXISTS memory_annotations (
+            source TEXT NOT NULL,
+            source_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            value TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, kind, source_id)
+        ) WITHOUT ROWID
+        """,
+    ]),
+    (7, "FTS5 search indexes over conversations, tasks and file summaries", (
+        # Searched by memory.search
+        _fts_steps('user_memory', ('user_input', 'ai_response'))
+        + _fts_steps('tasks', ('task_text',))
+        + _fts_steps('file_memory', ('file_path', 'content_summary'))
+    )),
+    (8, "row version on tasks for numbered task commands", [
+        # Bumped by every task UPDATE in brain.task_manager; brain.task_views
+        # compares it to detect that a listed task changed since it was shown
+        "ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0",
+    ]),
+    (9, "stats_counters task triggers that tolerate a NULL status", [
+        # Migration 3's triggers add (status = 'completed'), which is NULL for
+        # a NULL status and turns the counter itself NULL. Recreate them with
+        # IFNULL and recount, repairing counters that already went wrong.
+        "DROP TRIGGER IF EXISTS trg_stats_tasks_insert",
+        "DROP TRIGGER IF EXISTS trg_stats_tasks_delete",
+        "DROP TRIGGER IF EXISTS trg_stats_tasks_status",
+        """
+        CREATE TRIGGER trg_stats_tasks_insert AFTER INSERT ON tasks
+        BEGIN
+            UPDATE stats_counters SET
+                tasks_total = tasks_total + 1,
+                tasks_completed = tasks_completed + IFNULL(NEW.status = 'completed', 0),
+                tasks_pending = tasks_pending + IFNULL(NEW.status = 'pending', 0)
+            WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER trg_stats_tasks_delete AFTER DELETE ON tasks
+        BEGIN
+            UPDATE stats_counters SET
+                tasks_total = tasks_total - 1,
+                tasks_completed = tasks_completed - IFNULL(OLD.status = 'completed', 0),
+                tasks_pending = tasks_pending - IFNULL(OLD.status = 'pending', 0)
+            WHERE id = 1;
+        END
+        """,
+        """
+        CREATE TRIGGER trg_stats_tasks_status AFTER UPDATE OF status ON tasks
+        BEGIN
+            UPDATE stats_counters SET
+                tasks_completed = tasks_completed + IFNULL(NEW.status = 'completed', 0) - IFNULL(OLD.status = 'completed', 0),
+                tasks_pending = tasks_pending + IFNULL(NEW.status = 'pending', 0) - IFNULL(OLD.status = 'pending', 0)
+            WHERE id = 1;
+        END
+        """,
+        """
+        UPDATE stats_counters SET
+            tasks_total = (SELECT COUNT(*) FROM tasks),
+            tasks_completed = (SELECT IFNULL(SUM(status = 'completed'), 0) FROM tasks),
+            tasks_pending = (SELECT IFNULL(SUM(status = 'pending'), 0) FROM tasks)
+        WHERE id = 1
+        """,
+    ]),
+    (10, "case-insensitive index on habit names", [
+        # brain.habit_tracker keeps names as typed and matches them with
+        # COLLATE NOCASE, which the UNIQUE (BINARY) index cannot serve
+        "CREATE INDEX IF NOT EXISTS idx_habits_name_nocase ON habits (habit_name COLLATE NOCASE)",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def apply_migrations(conn=None):
+    """Apply every migration newer than the database's user_version.
+
+    Returns the list of versions that were applied.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+        if conn is None:
+            return []
+
+    applied = []
+    cur = conn.cursor()
+
+    try:
+        current = get_schema_version(conn)
+        for version, description, steps in MIGRATIONS:
+            if version <= current:
+                continue
+
+            # IMMEDIATE takes the write lock up front, so two processes
+            # starting at once cannot both apply the same migration
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                if get_schema_version(conn) >= version:
+                    conn.rollback()
+                    continue
+                for step in steps:
+                    if callable(step):
+                        step(cur)
+                    else:
+                        cur.execute(step)
+                cur.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+            applied.append(version)
+            print(f"🧱 Applied migration {version}: {description}")
+
+        if applied:
+            # Refresh planner statistics for the new indexes
+            cur.execute("PRAGMA optimize")
+
+        return applied
+    finally:
+        cur.close()
+        if own_conn:
+            conn.close()
+
+
+# The queries the indexes above were designed for, with representative
+# parameters. check_query_plans() fails if any of them plans a table scan.
+HOT_QUERIES = {
+    'get_pending_tasks': ("""
+        SELECT id, task_text, due_date, priority
+        FROM tasks
+        WHERE status = 'pending'
+        ORDER BY
+            CASE priority WHEN 3 THEN 1 WHEN 2 THEN 2 ELSE 3 END,
+            due_date ASC NULLS LAST
+    """, ()),
+    'get_overdue_tasks': ("""
+        SELECT id, task_text, due_date
+        FROM tasks
+        WHERE status = 'pending'
+        AND due_date < datetime('now')
+        ORDER BY due_date ASC
+    """, ()),
+    'get_completed_tasks': ("""
+        SELECT task_text, created_at
+        FROM tasks
+        WHERE status = 'completed'
+        ORDER BY created_at DESC
+        LIMIT ?
+    """, (10,)),
+    'get_productivity_analytics.summary': ("""
+        SELECT
+            COUNT(*),
+            SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN status = 'pending' AND due_date < datetime('now') THEN 1 ELSE 0 END)
+        FROM tasks
+        WHERE created_at >= datetime('now', ?)
+    """, ('-30 days',)),
+    'get_productivity_analytics.daily_trends': ("""
+        SELECT date(created_at) as day, COUNT(*)
+        FROM tasks
+        WHERE status = 'completed'
+        AND created_at >= datetime('now', ?)
+        GROUP BY day
+        ORDER BY day
+    """, ('-30 days',)),
+    'get_productivity_analytics.priority_breakdown': ("""
+        SELECT priority, COUNT(*)
+        FROM tasks
+        WHERE created_at >= datetime('now', ?)
+        GROUP BY priority
+    """, ('-30 days',)),
+    'get_habit_completion_rate': ("""
+        SELECT COUNT(*) FROM habit_logs
+        WHERE habit_id = ? AND completed_date >= ?
+    """, (1, '2000-01-01')),
+    'habits_completed_today': ("""
+        SELECT COUNT(*) FROM habits WHERE last_completed = date('now')
+    """, ()),
+    'list_tasks.by_status': ("""
+        SELECT id, task_text, status, created_at, id
+        FROM tasks
+        WHERE status IN (?) AND (created_at, id) < (?, ?)
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+    """, ('pending', '2100-01-01', 1 << 62, 51)),
+    'list_habits': ("""
+        SELECT habit_name, streak_count, streak_count, id
+        FROM habits
+        WHERE (streak_count, id) < (?, ?)
+        ORDER BY streak_count DESC, id DESC
+        LIMIT ?
+    """, (1 << 30, 1 << 62, 51)),
+    'get_recent_memories': ("""
+        SELECT user_input, ai_response, timestamp
+        FROM user_memory
+        ORDER BY timestamp DESC
+        LIMIT ?
+    """, (5,)),
+}
+
+# "SCAN tasks" is a full table scan; "SCAN x USING INDEX" walks an index in
+# order (fine for ORDER BY ... LIMIT), and SEARCH is an index lookup.
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+def explain(conn, sql, params=()):
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+
+
+def check_query_plans(conn=None):
+    """Return {query_name: plan} for every hot query that scans a table"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+        if conn is None:
+            return {}
+
+    try:
+        failures = {}
+        for name, (sql, params) in HOT_QUERIES.items():
+            plan = explain(conn, sql, params)
+            if any(FULL_SCAN.match(detail.strip()) for detail in plan):
+                failures[name] = plan
+        return failures
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def main(argv):
+    from memory.database import setup_database
+    setup_database()
+
+    if '--check' in argv:
+        failures = check_query_plans()
+        if failures:
+            print("❌ Hot queries falling back to a full table scan:")
+            for name, plan in failures.items():
+                print(f"  {name}: {' | '.join(plan)}")
+            return 1
+        print(f"✅ All {len(HOT_QUERIES)} hot queries use an index")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
\ No newline at end of file
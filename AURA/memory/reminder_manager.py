@@ -1,4 +1,5 @@
 from memory.database import get_connection
+from brain.stats_engine import get_task_counters
 from datetime import datetime, timedelta
 
 
@@ -39,40 +40,12 @@ def check_reminders():
 
 def get_daily_summary():
     """Generate daily task summary"""
-    conn = get_connection()
-    if conn is None:
-        return ""
-
-    cur = conn.cursor()
-
-    try:
-        # Tasks completed today
-        cur.execute("""
-            SELECT COUNT(*) FROM tasks 
-            WHERE status = 'completed' 
-            AND date(created_at) = date('now')
-        """)
-        completed_today = cur.fetchone()[0]
-
-        # Pending tasks
-        cur.execute("SELECT COUNT(*) FROM tasks WHERE status = 'pending'")
-        pending_total = cur.fetchone()[0]
-
-        # Overdue tasks
-        cur.execute("SELECT COUNT(*) FROM tasks WHERE status = 'pending' AND due_date < datetime('now')")
-        overdue = cur.fetchone()[0]
-
-        summary = f"📅 Daily Summary:\n"
-        summary += f"• Completed today: {completed_today}\n"
-        summary += f"• Pending tasks: {pending_total}\n"
-        if overdue > 0:
-            summary += f"• Overdue: {overdue} ⚠️\n"
+    counters = get_task_counters()
 
-        return summary
+    summary = f"📅 Daily Summary:\n"
+    summary += f"• Completed today: {counters['completed_today']}\n"
+    summary += f"• Pending tasks: {counters['pending']}\n"
+    if counters['overdue'] > 0:
+        summary += f"• Overdue: {counters['overdue']} ⚠️\n"
 
-    except Exception as e:
-        print(f"Error generating summary: {e}")
-        return ""
-    finally:
-        cur.close()
-        conn.close()
\ No newline at end of file
+    return summary
\ No newline at end of file
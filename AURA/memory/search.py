@@ -0,0 +1,148 @@
+"""Full-text search over conversations, tasks and file summaries.
+
+Backed by the FTS5 indexes from migration 7 (user_memory_fts, tasks_fts,
+file_memory_fts), which triggers keep in step with every insert, update
+and delete. Each source ranks its matches by BM25 (FTS5's rank, lower is
+better) and returns its best offset + limit + 1; the lists are merged and
+snippets are built only for the page being returned. Scoring is capped at
+the newest RANK_WINDOW matches per source, so a word found in most of a
+million rows costs tens of milliseconds rather than seconds, while rarer
+queries rank every match.
+
+Only committed rows are searched: a chat turn shows up once the
+write-behind logger commits it, within its flush_interval, and a query
+never waits for that.
+
+User text is turned into a safe MATCH expression: every word is quoted
+and the last one is a prefix, so "meeting notes" finds "Meeting notes
+for Monday". If requiring every word finds nothing, any word will do.
+
+Run from the AURA directory:
+    python -m memory.search "dentist appointment"
+"""
+import re
+import sys
+import time
+from memory.database import get_connection
+
+# source -> (FTS table, content table, snippet column or -1 for any, the
+# two content columns returned with each match and their names)
+SOURCES = {
+    'conversations': ('user_memory_fts', 'user_memory', -1, ('user_input', 'timestamp'), ('title', 'timestamp')),
+    'tasks': ('tasks_fts', 'tasks', 0, ('task_text', 'status'), ('title', 'status')),
+    'files': ('file_memory_fts', 'file_memory', -1, ('file_path', 'last_accessed'), ('title', 'last_accessed')),
+}
+MAX_LIMIT = 100
+RANK_WINDOW = 5000  # newest matches ranked per source when a term is very common
+HIGHLIGHT = ('[', ']')
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match(query, any_term=False):
+    """FTS5 MATCH expression for free text; None when it has no words"""
+    terms = _TERM_RE.findall(query.lower())
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return (" OR " if any_term else " ").join(quoted)
+
+
+def _rank_source(cur, source, match, count):
+    """[(score, source, rowid)] for the best count matches"""
+    fts = SOURCES[source][0]
+    # The index walks matches newest first without scoring them, so the
+    # window caps BM25 work for terms that appear in most rows
+    cur.execute(f"""
+        SELECT score, rowid FROM (
+            SELECT rowid, rank AS score FROM {fts} WHERE {fts} MATCH ?
+            ORDER BY rowid DESC LIMIT ?
+        ) ORDER BY score LIMIT ?
+    """, (match, RANK_WINDOW, count))
+    return [(score, source, rowid) for score, rowid in cur.fetchall()]
+
+
+def _fetch_matches(cur, source, match, rowids, highlight):
+    """{rowid: result dict} with snippets, for one page of rowids"""
+    fts, table, column, columns, names = SOURCES[source]
+    placeholders = ",".join("?" * len(rowids))
+    cur.execute(f"""
+        SELECT f.rowid, snippet({fts}, {column}, ?, ?, '…', 12), m.{columns[0]}, m.{columns[1]}
+        FROM {fts} f JOIN {table} m ON m.id = f.rowid
+        WHERE {fts} MATCH ? AND f.rowid IN ({placeholders})
+    """, [highlight[0], highlight[1], match] + list(rowids))
+    return {row[0]: {'source': source, 'id': row[0], 'snippet': row[1], names[0]: row[2], names[1]: row[3]}
+            for row in cur.fetchall()}
+
+
+def search(query, sources=None, limit=10, offset=0, highlight=HIGHLIGHT):
+    """One page of matches across sources, best (lowest BM25 score) first.
+
+    Returns {'query', 'results', 'offset', 'limit', 'has_more', 'took_ms'}.
+    """
+    start = time.perf_counter()
+    sources = [s for s in (sources or SOURCES) if s in SOURCES]
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    offset = max(0, int(offset))
+    page = {'query': query, 'results': [], 'offset': offset, 'limit': limit, 'has_more': False}
+
+    if build_match(query) is None or not sources:
+        page['took_ms'] = 0.0
+        return page
+
+    conn = get_connection()
+    if conn is None:
+        page['took_ms'] = 0.0
+        return page
+
+    cur = conn.cursor()
+    try:
+        # One extra row tells whether there is a next page
+        wanted = offset + limit + 1
+        for any_term in (False, True):
+            match = build_match(query, any_term)
+            ranked = []
+            for source in sources:
+                ranked.extend(_rank_source(cur, source, match, wanted))
+            if ranked or len(_TERM_RE.findall(query)) < 2:
+                break
+
+        ranked.sort()
+        page['has_more'] = len(ranked) > offset + limit
+        ranked = ranked[offset:offset + limit]
+
+        # Snippets only for the rows on this page
+        found = {}
+        for source in sources:
+            rowids = [rowid for _, s, rowid in ranked if s == source]
+            if rowids:
+                found[source] = _fetch_matches(cur, source, match, rowids, highlight)
+        for score, source, rowid in ranked:
+            result = found[source].get(rowid)
+            if result is not None:
+                result['score'] = round(score, 4)
+                page['results'].append(result)
+    except Exception as e:
+        print(f"Error searching memory: {e}")
+    finally:
+        cur.close()
+        conn.close()
+
+    page['took_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return page
+
+
+def main():
+    query = " ".join(sys.argv[1:])
+    if not query:
+        print('Usage: python -m memory.search "words to find"')
+        return
+    page = search(query)
+    for i, match in enumerate(page['results'], 1):
+        print(f"{i}. [{match['source']}] {match['snippet']}")
+    print(f"{len(page['results'])} results in {page['took_ms']} ms")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,530 @@
+"""Semantic memory: recall conversations and file summaries by meaning.
+
+Each user_memory turn and file_memory summary gets an embedding from a
+local embedder (no network):
+  hashing            signed feature hashing of stemmed words, word bigrams
+                     and character trigrams, so "running" is close to "run"
+  random_projection  the same features, each projected onto a seeded
+                     random +/-1 vector (denser, slower to embed)
+register_embedder() plugs in others; vector_embedder picks one.
+
+Vectors live in aura_vectors/vectors.f32, a memory-mapped float32 matrix
+(one L2-normalised row per item) with a parallel int64 key array of
+source << 48 | id. The OS pages the matrix in on demand, so opening the
+store costs nothing and the corpus can exceed RAM. Queries are cosine
+top-k:
+  flat  batched matrix products over CHUNK_ROWS rows at a time, exact
+  ivf   k-means inverted file: only the IVF_PROBES closest clusters (plus
+        rows added since the last build) are scored; approximate
+vector_index 'auto' switches to ivf from IVF_MIN_ROWS rows and rebuilds
+the clusters in the background as the store grows.
+
+save_conversation() and save_file_memory() only nudge a background sync
+thread, which reads rows newer than it has seen and embeds them in
+batches, so the response path never waits for embedding. Needs numpy;
+without it semantic memory is simply off.
+
+Run from the AURA directory:
+    python -m memory.vector_store --sync
+    python -m memory.vector_store "that conversation about sleep"
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from functools import lru_cache
+from memory.database import get_connection
+from memory.conversation_logger import flush_conversations
+from utils.config_manager import get_config
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency: semantic memory is off without it
+    np = None
+
+STORE_DIR = "aura_vectors"
+DIM = 256
+GROW_ROWS = 4096  # matrix grows by at least this many rows at a time
+CHUNK_ROWS = 65536  # rows scored per matrix product in flat search
+SYNC_BATCH = 2000  # rows embedded per database read
+IVF_MIN_ROWS = 50000
+IVF_PROBES = 8
+IVF_REBUILD_RATIO = 0.2  # rebuild once this share of rows is unclustered
+MIN_SCORE = 0.1  # cosine below this is noise for hashed embeddings
+
+SOURCES = {'user_memory': 1, 'file_memory': 2}
+SOURCE_NAMES = {code: name for name, code in SOURCES.items()}
+KEY_SHIFT = 48
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _stem(word):
+    """Crude suffix stripping: running -> run, notes -> note"""
+    for suffix in ('ing', 'ed', 'ly', 's'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and not word.endswith('ss'):
+            word = word[:-len(suffix)]
+            if word[-1] == word[-2] and word[-1] not in 'lsz':
+                word = word[:-1]
+            break
+    return word
+
+
+def _features(text):
+    """(feature, weight) pairs: stemmed words and bigrams, plus character
+    trigrams at half weight for spelling variants the stemmer misses"""
+    words = _TOKEN_RE.findall(text.lower())
+    stems = [_stem(word) for word in words]
+    features = [(stem, 1.0) for stem in stems]
+    features.extend((f"{a} {b}", 1.0) for a, b in zip(stems, stems[1:]))
+    for word in words:
+        padded = f"#{word}#"
+        features.extend((padded[i:i + 3], 0.5) for i in range(len(padded) - 2))
+    return features
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class HashingEmbedder:
+    name = 'hashing'
+
+    def __init__(self, dim=DIM):
+        self.dim = dim
+
+    def embed(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in _features(text or ""):
+                # crc32, not hash(): stable across processes
+                h = zlib.crc32(feature.encode('utf-8'))
+                out[row, h % self.dim] += weight if h >> 31 else -weight
+        return _normalize_rows(out)
+
+
+class RandomProjectionEmbedder:
+    name = 'random_projection'
+
+    def __init__(self, dim=DIM):
+        self.dim = dim
+        self._projection = lru_cache(maxsize=65536)(self._make_projection)
+
+    def _make_projection(self, seed):
+        return np.where(np.random.default_rng(seed).random(self.dim) < 0.5, -1.0, 1.0).astype(np.float32)
+
+    def embed(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in _features(text or ""):
+                out[row] += weight * self._projection(zlib.crc32(feature.encode('utf-8')))
+        return _normalize_rows(out)
+
+
+EMBEDDERS = {
+    'hashing': HashingEmbedder,
+    'random_projection': RandomProjectionEmbedder,
+}
+
+
+def register_embedder(name, factory):
+    """factory(dim) -> object with .name, .dim and .embed(texts) -> (n, dim) float32"""
+    EMBEDDERS[name] = factory
+
+
+class VectorStore:
+    def __init__(self, path=STORE_DIR, embedder=None, index='auto'):
+        self.path = path
+        self.embedder = embedder or HashingEmbedder()
+        self.dim = self.embedder.dim
+        self.index_mode = index
+        self.count = 0
+        self.capacity = 0
+        self.vectors = None
+        self.keys = None
+        self.rows = {}  # key -> row
+        self.synced = {'user_memory': 0, 'file_memory': ""}
+        self.ivf = None  # (centroids, order, offsets, rows covered)
+        self._lock = threading.RLock()
+        # Held by sync and IVF builds, the only code that grows the files
+        self._syncing = threading.RLock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {'queries': 0, 'flat_queries': 0, 'ivf_queries': 0, 'embedded': 0,
+                      'syncs': 0, 'ivf_builds': 0, 'last_query_ms': 0.0}
+
+    # ---- storage ----
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def open(self):
+        os.makedirs(self.path, exist_ok=True)
+        meta = {}
+        try:
+            with open(self._file('meta.json'), 'r') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            pass
+
+        if meta and (meta.get('dim') != self.dim or meta.get('embedder') != self.embedder.name):
+            # Vectors from another embedder are not comparable; start over
+            print("🧠 Embedder changed, rebuilding semantic memory")
+            for name in ('vectors.f32', 'keys.i64', 'ivf.npz'):
+                if os.path.exists(self._file(name)):
+                    os.remove(self._file(name))
+            meta = {}
+
+        self.count = meta.get('count', 0)
+        self.synced.update(meta.get('synced', {}))
+        self._map(meta.get('capacity', 0))
+        self.rows = {int(key): row for row, key in enumerate(self.keys[:self.count])}
+        self._load_ivf()
+        return self
+
+    def _map(self, capacity):
+        capacity = max(capacity, GROW_ROWS)
+        if self.vectors is not None:
+            # Windows cannot resize a file while it is mapped
+            self.vectors.flush()
+            self.keys.flush()
+            self.vectors = self.keys = None
+        for name, dtype, width in (('vectors.f32', np.float32, self.dim), ('keys.i64', np.int64, 1)):
+            path = self._file(name)
+            size = capacity * width * np.dtype(dtype).itemsize
+            # Grow (or create) the file, then map the whole of it
+            with open(path, 'ab') as f:
+                if f.tell() < size:
+                    f.truncate(size)
+            shape = (capacity, self.dim) if width > 1 else (capacity,)
+            matrix = np.memmap(path, dtype=dtype, mode='r+', shape=shape)
+            if width > 1:
+                self.vectors = matrix
+            else:
+                self.keys = matrix
+        self.capacity = capacity
+
+    def _save_meta(self):
+        self.vectors.flush()
+        self.keys.flush()
+        meta = {'dim': self.dim, 'embedder': self.embedder.name, 'count': self.count,
+                'capacity': self.capacity, 'synced': self.synced}
+        # Unique per writer, so two never replace each other's half-written file
+        tmp = self._file(f'meta.json.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._file('meta.json'))
+
+    def add(self, source, ids, texts):
+        """Embed and store texts; an existing (source, id) is overwritten in place"""
+        if not ids:
+            return 0
+        return self.add_vectors(source, ids, self.embedder.embed(list(texts)))
+
+    def add_vectors(self, source, ids, vectors):
+        """Store already-normalised (n, dim) float32 vectors"""
+        keys = [(SOURCES[source] << KEY_SHIFT) | int(i) for i in ids]
+        with self._lock:
+            new = sum(1 for key in set(keys) if key not in self.rows)
+            if self.count + new > self.capacity:
+                self._map(max(self.capacity * 2, self.count + new))
+            for key, vector in zip(keys, vectors):
+                row = self.rows.get(key)
+                if row is None:
+                    row = self.rows[key] = self.count
+                    self.keys[row] = key
+                    self.count += 1
+                self.vectors[row] = vector
+            self.stats['embedded'] += len(keys)
+            self._save_meta()
+        return len(keys)
+
+    # ---- search ----
+
+    def search_many(self, texts, k=5, sources=None):
+        """[(score, source, id)] best first, for each query text"""
+        start = time.perf_counter()
+        queries = self.embedder.embed(list(texts))
+        # Held throughout: add() may remap the files (queries take milliseconds)
+        with self._lock:
+            count, ivf = self.count, self.ivf
+            vectors, keys = self.vectors, self.keys
+            use_ivf = ivf is not None and self.index_mode in ('auto', 'ivf')
+
+            if use_ivf:
+                results = [self._search_ivf(vectors, keys, ivf, count, query, k, sources) for query in queries]
+            else:
+                results = self._search_flat(vectors, keys, count, queries, k, sources)
+
+            self.stats['queries'] += len(queries)
+            self.stats['ivf_queries' if use_ivf else 'flat_queries'] += len(queries)
+            self.stats['last_query_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        return results
+
+    def search(self, text, k=5, sources=None):
+        return self.search_many([text], k, sources)[0]
+
+    def _mask(self, keys, sources):
+        if not sources:
+            return None
+        codes = np.array([SOURCES[s] for s in sources], dtype=np.int64)
+        return ~np.isin(keys >> KEY_SHIFT, codes)
+
+    def _top(self, scores, keys, k):
+        if len(scores) > k:
+            best = np.argpartition(-scores, k)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best])]
+        return [(float(scores[i]), SOURCE_NAMES[int(keys[i]) >> KEY_SHIFT], int(keys[i]) & ((1 << KEY_SHIFT) - 1))
+                for i in best if scores[i] > -np.inf]
+
+    def _search_flat(self, vectors, keys, count, queries, k, sources):
+        best_scores = [np.empty(0, dtype=np.float32) for _ in queries]
+        best_keys = [np.empty(0, dtype=np.int64) for _ in queries]
+        for begin in range(0, count, CHUNK_ROWS):
+            end = min(begin + CHUNK_ROWS, count)
+            chunk_keys = np.asarray(keys[begin:end])
+            scores = np.asarray(vectors[begin:end]) @ queries.T  # (rows, queries)
+            mask = self._mask(chunk_keys, sources)
+            if mask is not None:
+                scores[mask] = -np.inf
+            for q in range(len(queries)):
+                column = scores[:, q]
+                take = np.argpartition(-column, k)[:k] if len(column) > k else np.arange(len(column))
+                best_scores[q] = np.concatenate([best_scores[q], column[take]])
+                best_keys[q] = np.concatenate([best_keys[q], chunk_keys[take]])
+        return [self._top(s, key, k) for s, key in zip(best_scores, best_keys)]
+
+    def _search_ivf(self, vectors, keys, ivf, count, query, k, sources):
+        centroids, order, offsets, covered = ivf
+        probes = np.argsort(-(centroids @ query))[:IVF_PROBES]
+        candidates = [order[offsets[c]:offsets[c + 1]] for c in probes]
+        # Rows added since the clusters were built are always scanned
+        candidates.append(np.arange(covered, count))
+        rows = np.sort(np.concatenate(candidates))
+        if not len(rows):
+            return []
+        candidate_keys = np.asarray(keys[rows])
+        scores = np.asarray(vectors[rows]) @ query
+        mask = self._mask(candidate_keys, sources)
+        if mask is not None:
+            scores[mask] = -np.inf
+        return self._top(scores, candidate_keys, k)
+
+    # ---- approximate index ----
+
+    def build_ivf(self, lists=None, iterations=8, sample=20000, seed=0):
+        """Spherical k-means over the current rows; swaps in the new lists"""
+        with self._syncing:
+            with self._lock:
+                count, vectors = self.count, self.vectors
+            if count == 0:
+                return False
+            lists = lists or max(1, int(np.sqrt(count)))
+            rng = np.random.default_rng(seed)
+            sample = min(max(sample, lists * 32), count)
+            training = np.asarray(vectors[np.sort(rng.choice(count, sample, replace=False))])
+            centroids = training[rng.choice(len(training), min(lists, len(training)), replace=False)].copy()
+            for _ in range(iterations):
+                nearest = np.argmax(training @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, nearest, training)
+                # A cluster that lost all its members keeps its old centre
+                empty = ~sums.any(axis=1)
+                sums[empty] = centroids[empty]
+                centroids = _normalize_rows(sums)
+
+            assign = np.empty(count, dtype=np.int32)
+            for begin in range(0, count, CHUNK_ROWS):
+                end = min(begin + CHUNK_ROWS, count)
+                assign[begin:end] = np.argmax(np.asarray(vectors[begin:end]) @ centroids.T, axis=1)
+            order = np.argsort(assign, kind='stable').astype(np.int64)
+            offsets = np.searchsorted(assign[order], np.arange(len(centroids) + 1))
+
+            np.savez(self._file('ivf.npz'), centroids=centroids, order=order, offsets=offsets, covered=count)
+            with self._lock:
+                self.ivf = (centroids, order, offsets, count)
+                self.stats['ivf_builds'] += 1
+            return True
+
+    def _load_ivf(self):
+        try:
+            data = np.load(self._file('ivf.npz'))
+            covered = int(data['covered'])
+            if covered <= self.count:
+                self.ivf = (data['centroids'], data['order'], data['offsets'], covered)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading semantic memory index: {e}")
+
+    def _ivf_is_stale(self):
+        if self.index_mode == 'flat' or (self.index_mode == 'auto' and self.count < IVF_MIN_ROWS):
+            return False
+        if self.ivf is None:
+            return True
+        return self.count - self.ivf[3] > IVF_REBUILD_RATIO * self.ivf[3]
+
+    # ---- keeping up with the database ----
+
+    def sync(self):
+        """Embed user_memory and file_memory rows not seen yet"""
+        with self._syncing:
+            return self._sync()
+
+    def _sync(self):
+        flush_conversations(timeout=1.0)
+        added = 0
+        conn = get_connection()
+        if conn is None:
+            return 0
+        cur = conn.cursor()
+        try:
+            while True:
+                cur.execute("""
+                    SELECT id, user_input || ' ' || ai_response FROM user_memory
+                    WHERE id > ? ORDER BY id LIMIT ?
+                """, (self.synced['user_memory'], SYNC_BATCH))
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                added += self.add('user_memory', [r[0] for r in rows], [r[1] for r in rows])
+                self.synced['user_memory'] = rows[-1][0]
+
+            # Summaries are updated in place, so go by last_accessed, not id
+            cur.execute("""
+                SELECT id, file_path || ' ' || IFNULL(content_summary, ''), last_accessed FROM file_memory
+                WHERE last_accessed >= ? ORDER BY last_accessed
+            """, (self.synced['file_memory'],))
+            rows = cur.fetchall()
+            if rows:
+                added += self.add('file_memory', [r[0] for r in rows], [r[1] for r in rows])
+                self.synced['file_memory'] = rows[-1][2]
+        finally:
+            cur.close()
+            conn.close()
+
+        with self._lock:
+            self.stats['syncs'] += 1
+            self._save_meta()
+        if self._ivf_is_stale():
+            self.build_ivf()
+        return added
+
+    def notify(self):
+        """New rows were saved: sync soon, on the background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._sync_loop, name="aura-vector-sync", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def _sync_loop(self):
+        while True:
+            self._wake.wait()
+            # Let a burst of saves land before embedding them together
+            time.sleep(1.0)
+            self._wake.clear()
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Error syncing semantic memory: {e}")
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats, rows=self.count, dim=self.dim, embedder=self.embedder.name,
+                        index='ivf' if self.ivf is not None and self.index_mode != 'flat' else 'flat')
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_vector_store():
+    """Shared store, opened on first use; None when disabled or numpy is missing"""
+    global _store
+    if np is None or not get_config().get('vector_memory_enabled', True):
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                config = get_config()
+                embedder = EMBEDDERS.get(config.get('vector_embedder', 'hashing'), HashingEmbedder)
+                _store = VectorStore(
+                    embedder=embedder(config.get('vector_dim', DIM)),
+                    index=config.get('vector_index', 'auto')
+                ).open()
+                # Catch up on anything saved while the store was closed
+                _store.notify()
+    return _store
+
+
+def find_similar(text, k=5, sources=None, min_score=MIN_SCORE):
+    """Closest memories to text, with their content, best first"""
+    store = get_vector_store()
+    if store is None or not text:
+        return []
+    matches = [match for match in store.search(text, k, sources) if match[0] >= min_score]
+    if not matches:
+        return []
+
+    conn = get_connection()
+    if conn is None:
+        return []
+    cur = conn.cursor()
+    results = []
+    try:
+        for score, source, item_id in matches:
+            if source == 'user_memory':
+                cur.execute("SELECT user_input, ai_response, timestamp FROM user_memory WHERE id = ?", (item_id,))
+                fields = ('user_input', 'ai_response', 'timestamp')
+            else:
+                cur.execute("SELECT file_path, content_summary, last_accessed FROM file_memory WHERE id = ?", (item_id,))
+                fields = ('file_path', 'content_summary', 'last_accessed')
+            row = cur.fetchone()
+            # Deleted since it was embedded
+            if row is not None:
+                results.append(dict(zip(fields, row), source=source, id=item_id, score=round(score, 4)))
+        return results
+    except Exception as e:
+        print(f"Error fetching similar memories: {e}")
+        return results
+    finally:
+        cur.close()
+        conn.close()
+
+
+def get_vector_stats():
+    return _store.get_stats() if _store is not None else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('query', nargs='*')
+    parser.add_argument('--sync', action='store_true', help="embed new rows now")
+    parser.add_argument('--build-ivf', action='store_true', help="rebuild the approximate index")
+    parser.add_argument('-k', type=int, default=5)
+    args = parser.parse_args()
+
+    store = get_vector_store()
+    if store is None:
+        print("Semantic memory is disabled (vector_memory_enabled) or numpy is not installed")
+        return
+    if args.sync:
+        print(f"Embedded {store.sync()} rows")
+    if args.build_ivf:
+        store.build_ivf()
+    if args.query:
+        for match in find_similar(" ".join(args.query), args.k):
+            text = match.get('user_input') or match.get('file_path')
+            print(f"{match['score']:.3f}  [{match['source']}] {text}")
+    print(store.get_stats())
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,256 @@
+"""Production serving: the web dashboard and the REST API in one process.
+
+web/app.py and aura_api.py each start Werkzeug's development server
+(app.run(debug=True): one process, the reloader and the debugger). This
+mounts both Flask apps on one WSGI app - the dashboard at / and the REST
+API under serve_api_prefix (/rest, so /rest/api/tasks) - and runs it on
+a real server, picked by serve_server:
+
+  gunicorn   POSIX only: serve_workers processes (0 = up to 4, one per
+             core) of serve_threads threads each; SIGTERM drains and
+             restarts workers gracefully, as gunicorn always does
+  waitress   one process, serve_threads threads; runs on Windows too
+  werkzeug   Werkzeug's threaded server without the reloader or debugger,
+             for when neither of the above is installed
+  auto       the first of those that is available
+
+gunicorn and waitress keep idle connections open for serve_keepalive
+seconds (waitress closes one after a streamed, chunked response such as a
+task listing); Werkzeug closes every connection after its response. On
+SIGTERM/SIGINT the server stops taking requests (503), waits up to
+serve_graceful_timeout seconds for those in flight to finish, flushes the
+conversation log and closes its connections.
+
+Migrations run once, before any worker starts. Each worker process then
+opens its own connection pool, sized to its threads, and its own WAL
+checkpointer: SQLite connections must not cross a fork.
+
+Semantic memory (aura_vectors/) and the local model
+(aura_local_model.json) are files that one process appends to and rewrites
+from state it keeps in memory; two workers writing them would overwrite
+each other's rows. While either is enabled (vector_memory_enabled,
+local_model_enabled) gunicorn runs a single worker, and serve_threads is
+what scales. Disable both to run more workers.
+
+Run from the AURA directory:
+    python serve.py [--server auto] [--port 8080] [--workers 0] [--threads 8]
+"""
+import argparse
+import os
+import signal
+import threading
+import _thread
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+from werkzeug.wsgi import ClosingIterator
+from memory.database import (configure_pool, setup_database, start_checkpointer, stop_checkpointer,
+                             close_all_connections)
+from utils.config_manager import get_config
+
+SERVERS = ('gunicorn', 'waitress', 'werkzeug')
+# Config switches of the file-backed stores that only one process may write
+SINGLE_WRITER_FEATURES = ('vector_memory_enabled', 'local_model_enabled')
+WORKER_TIMEOUT = 120  # seconds a gunicorn worker may spend on one request (long AI replies)
+
+
+class GracefulApp:
+    """WSGI wrapper that counts requests in flight and turns new ones away while draining"""
+
+    def __init__(self, app):
+        self.app = app
+        self.active = 0
+        self.draining = False
+        self._cond = threading.Condition()
+
+    def __call__(self, environ, start_response):
+        with self._cond:
+            refuse = self.draining
+            if not refuse:
+                self.active += 1
+        if refuse:
+            start_response('503 Service Unavailable', [('Content-Type', 'text/plain'), ('Retry-After', '5')])
+            return [b"AURA is shutting down\n"]
+
+        try:
+            body = self.app(environ, start_response)
+        except BaseException:
+            self._finished()
+            raise
+        # Streamed responses are in flight until the server closes them
+        return ClosingIterator(body, self._finished)
+
+    def _finished(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def drain(self, timeout):
+        """Refuse new requests; True once none are in flight, False on timeout"""
+        with self._cond:
+            self.draining = True
+            return self._cond.wait_for(lambda: self.active == 0, timeout)
+
+
+def build_app(api_prefix=None):
+    from web.app import app as web_app
+    from aura_api import app as api_app
+
+    prefix = (api_prefix or get_config().get('serve_api_prefix', '/rest')).rstrip('/')
+    return GracefulApp(DispatcherMiddleware(web_app, {prefix: api_app}))
+
+
+def prepare_database():
+    """Migrate once in the parent, leaving no connection or thread to fork"""
+    setup_database()
+    stop_checkpointer()
+    close_all_connections()
+
+
+def init_worker(threads):
+    """Per-process database state: a pool with a connection per request thread"""
+    pool = configure_pool(max_size=threads + 2)
+    if pool.profile.get('journal_mode') == 'WAL':
+        start_checkpointer(pool.profile)
+
+
+def shutdown_worker():
+    from memory.conversation_logger import get_conversation_logger
+    get_conversation_logger().stop()
+    stop_checkpointer()
+    close_all_connections()
+
+
+def _stop_on_signal(app, stop, timeout):
+    """First SIGTERM/SIGINT drains then calls stop(); a second one stops at once"""
+    def handler(signum, frame):
+        if app.draining:
+            stop()
+            return
+        print(f"\n🛑 Finishing requests in flight (up to {timeout}s)...")
+        threading.Thread(target=lambda: (app.drain(timeout), stop()), name="aura-drain", daemon=True).start()
+
+    signal.signal(signal.SIGINT, handler)
+    signal.signal(signal.SIGTERM, handler)
+
+
+def available_server(name='auto'):
+    if name != 'auto':
+        return name
+    for server in SERVERS:
+        if server == 'gunicorn' and os.name != 'posix':
+            continue
+        try:
+            __import__(server)
+            return server
+        except ImportError:
+            continue
+    return 'werkzeug'
+
+
+def run_werkzeug(settings):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class Handler(WSGIRequestHandler):
+        # HTTP/1.1 for chunked streaming; a stalled client is dropped after keepalive
+        protocol_version = "HTTP/1.1"
+        timeout = settings['keepalive']
+
+    init_worker(settings['threads'])
+    app = build_app(settings['api_prefix'])
+    server = make_server(settings['host'], settings['port'], app, threaded=True, request_handler=Handler)
+    _stop_on_signal(app, lambda: threading.Thread(target=server.shutdown).start(), settings['graceful_timeout'])
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        shutdown_worker()
+
+
+def run_waitress(settings):
+    from waitress.server import create_server
+
+    init_worker(settings['threads'])
+    app = build_app(settings['api_prefix'])
+    server = create_server(app, host=settings['host'], port=settings['port'], threads=settings['threads'],
+                           channel_timeout=settings['keepalive'], ident="AURA")
+    def stop():
+        # waitress leaves its loop on KeyboardInterrupt in the main thread; interrupt_main()
+        # delivers SIGINT, whose handler lands back here
+        if threading.current_thread() is threading.main_thread():
+            raise KeyboardInterrupt
+        _thread.interrupt_main()
+
+    _stop_on_signal(app, stop, settings['graceful_timeout'])
+    try:
+        server.run()
+    finally:
+        server.close()
+        shutdown_worker()
+
+
+def run_gunicorn(settings):
+    from gunicorn.app.base import BaseApplication
+
+    threads = settings['threads']
+
+    class AuraApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': f"{settings['host']}:{settings['port']}",
+                'workers': settings['workers'] or min(4, os.cpu_count() or 1),
+                'worker_class': 'gthread',
+                'threads': threads,
+                'keepalive': settings['keepalive'],
+                'graceful_timeout': settings['graceful_timeout'],
+                'timeout': WORKER_TIMEOUT,
+                'preload_app': False,  # each worker imports the apps itself, after the fork
+                'post_fork': lambda server, worker: init_worker(threads),
+                'worker_exit': lambda server, worker: shutdown_worker(),
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return build_app(settings['api_prefix'])
+
+    AuraApplication().run()
+
+
+RUNNERS = {'gunicorn': run_gunicorn, 'waitress': run_waitress, 'werkzeug': run_werkzeug}
+
+
+def main():
+    config = get_config()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--server', choices=('auto',) + SERVERS, default=config.get('serve_server', 'auto'))
+    parser.add_argument('--host', default=config.get('serve_host', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=config.get('serve_port', 8080))
+    parser.add_argument('--workers', type=int, default=config.get('serve_workers', 0),
+                        help="gunicorn worker processes (0 = up to 4, one per core)")
+    parser.add_argument('--threads', type=int, default=config.get('serve_threads', 8))
+    args = parser.parse_args()
+
+    server = available_server(args.server)
+    settings = {
+        'host': args.host,
+        'port': args.port,
+        'workers': args.workers,
+        'threads': max(1, args.threads),
+        'keepalive': config.get('serve_keepalive', 5),
+        'graceful_timeout': config.get('serve_graceful_timeout', 30),
+        'api_prefix': config.get('serve_api_prefix', '/rest'),
+    }
+    if args.workers > 1 and server != 'gunicorn':
+        print(f"⚠️  {server} runs a single process; --workers is ignored")
+    writers = [name for name in SINGLE_WRITER_FEATURES if config.get(name, True)]
+    if server == 'gunicorn' and writers and settings['workers'] != 1:
+        print(f"⚠️  {', '.join(writers)} on: their files take one writer, so gunicorn runs 1 worker")
+        settings['workers'] = 1
+
+    prepare_database()
+    print(f"🚀 Serving AURA on http://{args.host}:{args.port}/ "
+          f"(REST API under {settings['api_prefix']}) with {server}, {settings['threads']} threads per process")
+    RUNNERS[server](settings)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
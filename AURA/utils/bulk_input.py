@@ -0,0 +1,192 @@
+"""Streaming record readers and chunked inserts for the bulk import APIs.
+
+read_records() turns a request body - a JSON array, newline-delimited JSON
+or CSV with a header row - into one dict per record while reading
+BUFFER_SIZE bytes at a time, so a 100k-row import never sits in memory
+whole. run_bulk() passes each record through a validator and writes the
+valid ones CHUNK_SIZE rows per transaction with executemany. A rejected
+row is reported by its position (1-based, counting records rather than
+lines) and skipped; the rest still go in. Input that cannot be parsed
+stops the import at that point, keeping the chunks already committed.
+"""
+import codecs
+import csv
+import io
+import json
+import time
+from memory.database import get_connection
+from utils.cache import bump_generation
+
+CHUNK_SIZE = 1000  # rows per transaction
+BUFFER_SIZE = 64 * 1024  # bytes read from the stream at once
+MAX_RECORD_CHARS = 1 << 20  # a JSON record longer than this is malformed
+MAX_ERRORS = 1000  # row errors listed in a result; the rest are only counted
+
+CSV_TYPES = ('text/csv', 'application/csv')
+
+
+class BulkInputError(ValueError):
+    """The input cannot be read any further"""
+
+
+def read_records(stream, fmt='json'):
+    """Records from a binary stream: dicts for CSV, decoded values for JSON"""
+    return _read_csv(stream) if fmt == 'csv' else _read_json(stream)
+
+
+def input_format(mimetype, requested=None):
+    """'csv' or 'json' for a request's Content-Type and optional ?format="""
+    if requested in ('csv', 'json'):
+        return requested
+    return 'csv' if mimetype in CSV_TYPES else 'json'
+
+
+def _read_json(stream):
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer, pos, eof = "", 0, False
+    started, row = False, 0
+
+    while True:
+        # Separators between records: whitespace, commas, the opening bracket
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ','):
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == '[' and not started:
+            started = True
+            pos += 1
+            continue
+        if pos < len(buffer) and buffer[pos] == ']':
+            return
+
+        if pos < len(buffer):
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if eof or len(buffer) - pos > MAX_RECORD_CHARS:
+                    raise BulkInputError(f"row {row + 1}: invalid JSON ({e.msg})")
+            else:
+                # A bare number may continue in the next read; objects cannot
+                if end < len(buffer) or eof or isinstance(value, (dict, list, str)):
+                    started = True
+                    row += 1
+                    pos = end
+                    yield value
+                    continue
+        elif eof:
+            return
+
+        chunk = stream.read(BUFFER_SIZE)
+        eof = not chunk
+        try:
+            buffer, pos = buffer[pos:] + utf8.decode(chunk, final=eof), 0
+        except UnicodeDecodeError:
+            raise BulkInputError(f"row {row + 1}: input is not UTF-8")
+
+
+class _RawReader(io.RawIOBase):
+    """Any object with read(n) - e.g. a WSGI input stream - as a raw stream"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _read_csv(stream):
+    # newline='' leaves line breaks to the csv module, which ends records only
+    # at \n, \r\n or \r (str.splitlines() would also split on \x0c, \x85, ...)
+    text = io.TextIOWrapper(io.BufferedReader(_RawReader(stream), BUFFER_SIZE), encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    row = 0
+    try:
+        for record in reader:
+            row += 1
+            # Columns past the header land under None; blank cells mean "not given"
+            yield {key.strip().lower(): value.strip() for key, value in record.items()
+                   if key is not None and isinstance(value, str) and value.strip()}
+    except csv.Error as e:
+        raise BulkInputError(f"row {row + 1}: invalid CSV ({e})")
+    except UnicodeDecodeError:
+        raise BulkInputError(f"row {row + 1}: input is not UTF-8")
+
+
+def run_bulk(records, prepare, write_chunk, tables, chunk_size=CHUNK_SIZE):
+    """Validate and insert records in chunked transactions.
+
+    prepare(record) returns the row's parameters or raises ValueError with
+    the reason. write_chunk(cur, [(row, params), ...]) inserts one chunk and
+    returns (rows inserted, [(row, reason), ...] rejected while inserting).
+    Returns {'inserted', 'failed', 'errors', 'errors_truncated', 'took_ms'},
+    plus 'error' when the input could not be read to the end.
+    """
+    start = time.perf_counter()
+    result = {'inserted': 0, 'failed': 0, 'errors': []}
+
+    def reject(row, reason):
+        result['failed'] += 1
+        if len(result['errors']) < MAX_ERRORS:
+            result['errors'].append({'row': row, 'error': reason})
+
+    conn = get_connection()
+    if conn is None:
+        result['error'] = "Database connection failed"
+        return result
+
+    cur = conn.cursor()
+    chunk = []
+
+    def flush():
+        try:
+            inserted, rejected = write_chunk(cur, chunk)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Error in bulk insert: {e}")
+            inserted, rejected = 0, [(row, f"not saved: {e}") for row, _ in chunk]
+        result['inserted'] += inserted
+        for row, reason in rejected:
+            reject(row, reason)
+        chunk.clear()
+        if inserted:
+            bump_generation(*tables)
+
+    try:
+        try:
+            for row, record in enumerate(records, 1):
+                if not isinstance(record, dict):
+                    reject(row, "expected an object with named fields")
+                    continue
+                try:
+                    chunk.append((row, prepare(record)))
+                except ValueError as e:
+                    reject(row, str(e))
+                    continue
+                if len(chunk) >= chunk_size:
+                    flush()
+        except BulkInputError as e:
+            result['error'] = str(e)
+        if chunk:
+            flush()
+    finally:
+        cur.close()
+        conn.close()
+
+    result['errors'].sort(key=lambda error: error['row'])
+    result['errors_truncated'] = result['failed'] > len(result['errors'])
+    result['took_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def field(record, *names):
+    """First non-empty value among names in record, or None"""
+    for name in names:
+        value = record.get(name)
+        if value is not None and value != "":
+            return value
+    return None
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""Process-wide read cache for read-mostly brain queries.
+
+Cached functions declare which tables they read. Every write path bumps the
+generation counter of the tables it changes, and the current generations are
+part of each cache key, so a write makes all older entries unreachable at
+once: a cached read is never staler than the last write in this process.
+The TTL bounds staleness for writes from other processes (API server, GUI
+and CLI running side by side) and for time-dependent answers.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_TTL = 30  # seconds
+
+_generations = {}
+_generation_lock = threading.Lock()
+_caches = {}
+
+
+def bump_generation(*tables):
+    """Invalidate every cached read of these tables (call after a commit)"""
+    with _generation_lock:
+        for table in tables:
+            _generations[table] = _generations.get(table, 0) + 1
+
+
+def get_generation(table):
+    return _generations.get(table, 0)
+
+
+class LRUCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0}
+
+    def get(self, key):
+        """Return (found, value)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return False, None
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return False, None
+
+            self._data.move_to_end(key)
+            self.stats['hits'] += 1
+            return True, value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._data)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0
+        stats['maxsize'] = self.maxsize
+        stats['ttl'] = self.ttl
+        return stats
+
+
+def cached(tables, ttl=DEFAULT_TTL, maxsize=DEFAULT_MAXSIZE):
+    """Cache a function's results until a write to one of `tables` or the TTL"""
+    tables = tuple(tables)
+
+    def decorator(func):
+        cache = LRUCache(maxsize, ttl)
+        _caches[f"{func.__module__}.{func.__name__}"] = cache
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())), tuple(get_generation(t) for t in tables))
+            found, value = cache.get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+            # Hand out copies of mutable results so callers can't poison the cache
+            return copy.copy(value) if isinstance(value, (list, dict)) else value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def clear_caches():
+    for cache in _caches.values():
+        cache.clear()
+
+
+def get_cache_stats():
+    """Hit/miss/eviction statistics per cached function, for the API"""
+    totals = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0, 'size': 0}
+    caches = {}
+    for name, cache in _caches.items():
+        stats = cache.get_stats()
+        caches[name] = stats
+        for key in totals:
+            totals[key] += stats[key]
+
+    lookups = totals['hits'] + totals['misses']
+    totals['hit_rate'] = round(totals['hits'] / lookups, 3) if lookups else 0
+    with _generation_lock:
+        generations = dict(_generations)
+    return {'totals': totals, 'caches': caches, 'generations': generations}
\ No newline at end of file
@@ -11,9 +11,37 @@ def get_default_config():
         "user_name": "User",
         "voice_enabled": True,
         "ai_enabled": False,
+        "ai_health_probe": False,
+        "openai_base_url": "",
+        "openai_max_concurrency": 4,
+        "openai_timeout": 30,
+        "context_history_enabled": True,
+        "context_token_budget": 1200,
+        "context_recent_turns": 20,
+        "batch_concurrency": 4,
+        "batch_requests_per_minute": 60,
+        "batch_tokens_per_minute": 60000,
+        "local_model_enabled": True,
+        "local_model_threshold": 0.8,
+        "local_model_min_support": 2,
+        "vector_memory_enabled": True,
+        "vector_embedder": "hashing",
+        "vector_dim": 256,
+        "vector_index": "auto",
+        "serve_host": "127.0.0.1",
+        "serve_port": 8080,
+        "serve_server": "auto",
+        "serve_workers": 0,
+        "serve_threads": 8,
+        "serve_keepalive": 5,
+        "serve_graceful_timeout": 30,
+        "serve_api_prefix": "/rest",
         "auto_backup": True,
         "theme": "dark",
         "language": "english",
+        "storage_profile": "wal",
+        "response_cache_enabled": True,
+        "response_cache_max_entries": 5000,
         "productivity_goals": {
             "daily_tasks": 5,
             "weekly_habits": 3,
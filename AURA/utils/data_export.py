@@ -37,7 +37,7 @@ def export_to_csv(cur, filename):
             # Export tasks
             writer.writerow(['TASKS'])
             writer.writerow(['ID', 'Task', 'Due Date', 'Priority', 'Status', 'Created'])
-            cur.execute("SELECT * FROM tasks")
+            cur.execute("SELECT id, task_text, due_date, priority, status, created_at FROM tasks")
             tasks = cur.fetchall()
             for task in tasks:
                 writer.writerow(task)
@@ -74,7 +74,7 @@ def export_to_json(cur, filename):
         data = {}
 
         # Tasks
-        cur.execute("SELECT * FROM tasks")
+        cur.execute("SELECT id, task_text, due_date, priority, status, created_at FROM tasks")
         tasks = cur.fetchall()
         data['tasks'] = [{
             'id': task[0],
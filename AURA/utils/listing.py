@@ -0,0 +1,192 @@
+"""Paged, filtered listings of tasks and habits for the HTTP APIs.
+
+GET /api/tasks and /api/habits (aura_api.py and web/app.py alike) return
+{"tasks": [...], "next_cursor": ..., "count": n}. Pages are keyset-based:
+next_cursor is the sort key of the last row, and passing it back as
+?cursor= continues with "WHERE key < last key", which is an index seek, so
+page 1000 costs the same as page 1 and a row added meanwhile never shifts
+a page. The body is encoded row by row as the cursor is read, so neither
+the rows nor the JSON text are built up in memory.
+
+Query parameters:
+  limit     rows per page (default DEFAULT_LIMIT, at most MAX_LIMIT)
+  cursor    next_cursor from the previous page
+  fields    comma-separated subset of the listing's fields
+  tasks:    status, priority (comma-separated; priority also low/medium/high),
+            due_after, due_before (ISO dates; due_after inclusive)
+  habits:   frequency (comma-separated)
+"""
+import base64
+import json
+from datetime import datetime
+from memory.database import get_connection
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+FETCH_SIZE = 200  # rows fetched from SQLite at a time
+FLUSH_CHARS = 16 * 1024  # response text buffered before a chunk is sent
+
+PRIORITIES = {'low': 1, 'medium': 2, 'high': 3}
+
+# name -> table, public field -> column, sort key (descending, unique)
+LISTINGS = {
+    'tasks': {
+        'table': 'tasks',
+        'fields': {'id': 'id', 'text': 'task_text', 'due_date': 'due_date', 'priority': 'priority',
+                   'status': 'status', 'created': 'created_at'},
+        'order': ('created_at', 'id'),  # newest first
+    },
+    'habits': {
+        'table': 'habits',
+        'fields': {'id': 'id', 'name': 'habit_name', 'frequency': 'frequency', 'streak': 'streak_count',
+                   'last_completed': 'last_completed', 'total_completions': 'total_completions'},
+        'order': ('streak_count', 'id'),  # longest streak first
+    },
+}
+
+
+def _values(args, name):
+    raw = args.get(name)
+    return [value.strip() for value in raw.split(',') if value.strip()] if raw else []
+
+
+def _iso(args, name):
+    raw = args.get(name)
+    if not raw:
+        return None
+    try:
+        return str(datetime.fromisoformat(raw.replace('Z', '+00:00')).replace(tzinfo=None))
+    except ValueError:
+        raise ValueError(f"{name} is not an ISO date: {raw!r}")
+
+
+def _task_filters(args):
+    where, params = [], []
+    statuses = _values(args, 'status')
+    if statuses:
+        if not set(statuses) <= {'pending', 'completed'}:
+            raise ValueError("status must be pending and/or completed")
+        where.append(f"status IN ({','.join('?' * len(statuses))})")
+        params += statuses
+
+    priorities = []
+    for value in _values(args, 'priority'):
+        priority = PRIORITIES.get(value.lower(), value)
+        if str(priority) not in ('1', '2', '3'):
+            raise ValueError("priority must be 1-3 or low/medium/high")
+        priorities.append(int(priority))
+    if priorities:
+        where.append(f"priority IN ({','.join('?' * len(priorities))})")
+        params += priorities
+
+    due_after, due_before = _iso(args, 'due_after'), _iso(args, 'due_before')
+    if due_after:
+        where.append("due_date >= ?")
+        params.append(due_after)
+    if due_before:
+        where.append("due_date < ?")
+        params.append(due_before)
+    return where, params
+
+
+def _habit_filters(args):
+    frequencies = _values(args, 'frequency')
+    if not frequencies:
+        return [], []
+    return [f"frequency IN ({','.join('?' * len(frequencies))})"], frequencies
+
+
+FILTERS = {'tasks': _task_filters, 'habits': _habit_filters}
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        key = None
+    if not isinstance(key, list) or len(key) != size or not all(isinstance(v, (int, float, str)) for v in key):
+        raise ValueError("cursor is not valid for this listing")
+    return key
+
+
+def build_query(name, args):
+    """(sql, params, public field names, limit) for one page; ValueError on bad args"""
+    listing = LISTINGS[name]
+    columns, order = listing['fields'], listing['order']
+
+    fields = _values(args, 'fields') or list(columns)
+    unknown = [f for f in fields if f not in columns]
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)} (choose from {', '.join(columns)})")
+
+    try:
+        limit = int(args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError("limit must be a number")
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    where, params = FILTERS[name](args)
+    if args.get('cursor'):
+        key = decode_cursor(args['cursor'], len(order))
+        if len(order) == 1:
+            where.append(f"{order[0]} < ?")
+        else:
+            where.append(f"({', '.join(order)}) < ({', '.join('?' * len(order))})")
+        params += key
+
+    # The sort key rides along after the requested fields, for next_cursor
+    selected = [columns[f] for f in fields] + list(order)
+    sql = f"SELECT {', '.join(selected)} FROM {listing['table']}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {', '.join(f'{column} DESC' for column in order)} LIMIT ?"
+    return sql, params + [limit + 1], fields, limit
+
+
+def stream_listing(name, args):
+    """Validate args now (ValueError) and return a generator of JSON text"""
+    sql, params, fields, limit = build_query(name, args)
+    return _encode_page(name, sql, params, fields, limit, len(LISTINGS[name]['order']))
+
+
+def _encode_page(name, sql, params, fields, limit, key_size):
+    conn = get_connection()
+    if conn is None:
+        yield json.dumps({name: [], 'next_cursor': None, 'count': 0, 'error': 'Database connection failed'})
+        return
+
+    cur = conn.cursor()
+    count, last, more, error = 0, None, False, None
+    buffer = f'{{"{name}": ['
+    try:
+        cur.execute(sql, params)
+        while not more:
+            rows = cur.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                if count == limit:
+                    more = True
+                    break
+                buffer += ("," if count else "") + json.dumps(dict(zip(fields, row)), default=str)
+                last = row
+                count += 1
+                if len(buffer) >= FLUSH_CHARS:
+                    yield buffer
+                    buffer = ""
+    except Exception as e:
+        print(f"Error listing {name}: {e}")
+        error = str(e)
+    finally:
+        cur.close()
+        conn.close()
+
+    next_cursor = encode_cursor(list(last[-key_size:])) if more else None
+    buffer += f'], "next_cursor": {json.dumps(next_cursor)}, "count": {count}'
+    if error:
+        buffer += f', "error": {json.dumps(error)}'
+    yield buffer + "}"
\ No newline at end of file
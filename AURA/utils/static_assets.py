@@ -0,0 +1,114 @@
+"""Content-hashed, precompressed static files for the web dashboard.
+
+Every file under web/static is read once per process and published as
+/assets/<name>.<hash>.<ext>, the hash being the first HASH_CHARS hex
+digits of its SHA-256. A URL therefore names one exact version of a file
+and is served with a one-year "immutable" Cache-Control: browsers keep it
+without revalidating, and an edited file gets a new URL through
+asset_url(), which the templates use. Text files are gzipped (and, when
+the brotli module is installed, brotli-compressed) at the highest levels
+once, when the manifest is built, so a request only picks a ready body by
+its Accept-Encoding. Each variant has its own strong ETag, answered with
+304 on If-None-Match.
+
+The manifest is rebuilt when a file's size or mtime changes, which is
+checked on each lookup only while the app runs in debug mode.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'web', 'static')
+URL_PREFIX = '/assets/'
+HASH_CHARS = 12
+MAX_AGE = 365 * 24 * 3600  # seconds; a hashed URL never changes content
+MIN_COMPRESS_BYTES = 512  # smaller files are not worth a compressed variant
+COMPRESSIBLE = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+_manifest = None
+_lock = threading.Lock()
+
+
+class Asset:
+    """One static file: its hashed URL, body, and compressed variants by encoding"""
+
+    def __init__(self, name, body):
+        self.name = name
+        self.digest = hashlib.sha256(body).hexdigest()[:HASH_CHARS]
+        stem, ext = os.path.splitext(name)
+        self.url = f"{URL_PREFIX}{stem}.{self.digest}{ext}"
+        self.mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        self.variants = {'identity': body}
+
+        if len(body) >= MIN_COMPRESS_BYTES and self.mimetype.startswith(COMPRESSIBLE):
+            self._add_variant('gzip', gzip.compress(body, compresslevel=9, mtime=0))
+            if brotli is not None:
+                self._add_variant('br', brotli.compress(body, mode=brotli.MODE_TEXT, quality=11))
+
+    def _add_variant(self, encoding, data):
+        if len(data) < len(self.variants['identity']):
+            self.variants[encoding] = data
+
+    def etag(self, encoding):
+        return self.digest if encoding == 'identity' else f"{self.digest}-{encoding}"
+
+    def negotiate(self, accept_encodings):
+        """The smallest variant the client accepts: br, then gzip, then identity"""
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and accept_encodings[encoding]:
+                return encoding
+        return 'identity'
+
+
+class Manifest:
+    def __init__(self, directory):
+        self.directory = directory
+        self.signature = _signature(directory)
+        self.by_name, self.by_url = {}, {}
+        for name in self.signature:
+            with open(os.path.join(directory, name), 'rb') as f:
+                asset = Asset(name, f.read())
+            self.by_name[name] = asset
+            self.by_url[asset.url[len(URL_PREFIX):]] = asset
+
+
+def _signature(directory):
+    """name -> (size, mtime) for every file under directory, names with '/'"""
+    files = {}
+    for root, _, names in os.walk(directory):
+        for filename in names:
+            if filename.startswith('.'):
+                continue
+            path = os.path.join(root, filename)
+            stat = os.stat(path)
+            files[os.path.relpath(path, directory).replace(os.sep, '/')] = (stat.st_size, stat.st_mtime_ns)
+    return dict(sorted(files.items()))
+
+
+def get_manifest(check=False):
+    """The process-wide manifest; with check, rebuilt if web/static changed"""
+    global _manifest
+    with _lock:
+        if _manifest is None or (check and _signature(_manifest.directory) != _manifest.signature):
+            _manifest = Manifest(STATIC_DIR)
+        return _manifest
+
+
+def asset_url(name, check=False):
+    """Hashed URL of web/static/<name>, for templates"""
+    asset = get_manifest(check).by_name.get(name)
+    if asset is None:
+        raise KeyError(f"no static asset named {name!r} in {STATIC_DIR}")
+    return asset.url
+
+
+def find_asset(path, check=False):
+    """The Asset for a hashed path under URL_PREFIX, or None (unknown or outdated hash)"""
+    return get_manifest(check).by_url.get(path)
\ No newline at end of file
@@ -1,3 +1,4 @@
+import re
 import pyttsx3
 
 # Initialize the TTS engine once
@@ -12,11 +13,53 @@ def get_engine():
         engine.setProperty('volume', 0.8)  # Volume 0-1
     return engine
 
-def speak(text):
-    print(f"AURA: {text}")
+# End of a sentence: terminal punctuation followed by whitespace, or a newline
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+|\n+')
+
+class SentenceBuffer:
+    """Collects streamed text and hands it back one sentence at a time"""
+
+    def __init__(self):
+        self.pending = ""
+
+    def feed(self, delta):
+        """Add a delta; returns the sentences it completed"""
+        self.pending += delta
+        parts = SENTENCE_END.split(self.pending)
+        self.pending = parts.pop()
+        return [part.strip() for part in parts if part.strip()]
+
+    def flush(self):
+        rest, self.pending = self.pending.strip(), ""
+        return [rest] if rest else []
+
+def say(text):
     try:
         engine = get_engine()
         engine.say(text)
         engine.runAndWait()
     except Exception as e:
-        print(f"Text-to-speech error: {e}")
\ No newline at end of file
+        print(f"Text-to-speech error: {e}")
+
+def speak(text):
+    print(f"AURA: {text}")
+    say(text)
+
+def speak_stream(deltas):
+    """Print streamed text as it arrives and speak it sentence by sentence.
+
+    Speech starts as soon as the first sentence is complete instead of
+    after the whole response. Returns the full text.
+    """
+    print("AURA: ", end="", flush=True)
+    buffer = SentenceBuffer()
+    parts = []
+    for delta in deltas:
+        parts.append(delta)
+        print(delta, end="", flush=True)
+        for sentence in buffer.feed(delta):
+            say(sentence)
+    print()
+    for sentence in buffer.flush():
+        say(sentence)
+    return ''.join(parts)
\ No newline at end of file
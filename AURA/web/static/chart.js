@@ -0,0 +1,113 @@
+// Local stand-in for Chart.js, covering what the dashboard draws: a doughnut
+// chart with its legend on top, as wide as its container and as tall as wide.
+// Same constructor as Chart.js, which can replace this file unchanged:
+//   new Chart(canvas, {type: 'doughnut', data: {labels, datasets: [{data, backgroundColor}]}})
+(function () {
+    const FONT = '12px Arial, sans-serif';
+    const LEGEND_BOX = 12;
+    const LEGEND_GAP = 16;
+    const LEGEND_ROW = 20;
+    const CUTOUT = 0.5;
+    const EMPTY_COLOR = '#e0e0e0';
+
+    class Chart {
+        constructor(canvas, config) {
+            if (config.type !== 'doughnut') {
+                throw new Error(`Chart type '${config.type}' is not supported`);
+            }
+            this.canvas = canvas;
+            this.config = config;
+            this.onResize = () => this.draw();
+            window.addEventListener('resize', this.onResize);
+            this.draw();
+        }
+
+        destroy() {
+            window.removeEventListener('resize', this.onResize);
+        }
+
+        update() {
+            this.draw();
+        }
+
+        draw() {
+            const canvas = this.canvas;
+            canvas.style.width = '100%';
+            const width = canvas.clientWidth || canvas.width;
+            const height = width;
+            const ratio = window.devicePixelRatio || 1;
+            canvas.width = width * ratio;
+            canvas.height = height * ratio;
+            canvas.style.height = height + 'px';
+
+            const ctx = canvas.getContext('2d');
+            ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+            ctx.clearRect(0, 0, width, height);
+            ctx.font = FONT;
+
+            const data = this.config.data;
+            const dataset = data.datasets[0] || {data: []};
+            const values = dataset.data.map(value => Math.max(Number(value) || 0, 0));
+            const colors = dataset.backgroundColor || [];
+
+            const legendHeight = this.drawLegend(ctx, data.labels || [], colors, width);
+            const radius = Math.max(Math.min(width, height - legendHeight) / 2 - 4, 0);
+            const cx = width / 2;
+            const cy = legendHeight + (height - legendHeight) / 2;
+            this.drawRing(ctx, values, colors, cx, cy, radius);
+        }
+
+        drawLegend(ctx, labels, colors, width) {
+            // Items wrap into centred rows
+            const rows = [[]];
+            let rowWidth = 0;
+            labels.forEach((label, i) => {
+                const itemWidth = LEGEND_BOX + 6 + ctx.measureText(label).width;
+                if (rowWidth && rowWidth + LEGEND_GAP + itemWidth > width) {
+                    rows.push([]);
+                    rowWidth = 0;
+                }
+                rowWidth += (rowWidth ? LEGEND_GAP : 0) + itemWidth;
+                rows[rows.length - 1].push({label, color: colors[i], width: itemWidth});
+            });
+
+            ctx.textBaseline = 'middle';
+            rows.forEach((items, row) => {
+                const total = items.reduce((sum, item) => sum + item.width, 0) + LEGEND_GAP * (items.length - 1);
+                let x = (width - total) / 2;
+                const y = row * LEGEND_ROW + LEGEND_ROW / 2;
+                for (const item of items) {
+                    ctx.fillStyle = item.color || EMPTY_COLOR;
+                    ctx.fillRect(x, y - LEGEND_BOX / 2, LEGEND_BOX, LEGEND_BOX);
+                    ctx.fillStyle = '#666';
+                    ctx.fillText(item.label, x + LEGEND_BOX + 6, y);
+                    x += item.width + LEGEND_GAP;
+                }
+            });
+            return labels.length ? rows.length * LEGEND_ROW + 8 : 0;
+        }
+
+        drawRing(ctx, values, colors, cx, cy, radius) {
+            const total = values.reduce((sum, value) => sum + value, 0);
+            const segments = total ? values.map((value, i) => [value / total, colors[i]]) : [[1, EMPTY_COLOR]];
+
+            let angle = -Math.PI / 2;
+            for (const [share, color] of segments) {
+                if (!share) continue;
+                const end = angle + share * 2 * Math.PI;
+                ctx.beginPath();
+                ctx.arc(cx, cy, radius, angle, end);
+                ctx.arc(cx, cy, radius * CUTOUT, end, angle, true);
+                ctx.closePath();
+                ctx.fillStyle = color || EMPTY_COLOR;
+                ctx.fill();
+                ctx.strokeStyle = '#fff';
+                ctx.lineWidth = 2;
+                ctx.stroke();
+                angle = end;
+            }
+        }
+    }
+
+    window.Chart = Chart;
+})();
\ No newline at end of file
@@ -0,0 +1,98 @@
+// Load analytics
+async function loadAnalytics() {
+    try {
+        const response = await fetch('/api/analytics');
+        const data = await response.json();
+
+        document.getElementById('score').textContent = data.tasks?.completion_rate + '%';
+
+        // Task chart
+        if (document.getElementById('taskChart')) {
+            new Chart(document.getElementById('taskChart'), {
+                type: 'doughnut',
+                data: {
+                    labels: ['Completed', 'Pending', 'Overdue'],
+                    datasets: [{
+                        data: [data.tasks?.completed, data.tasks?.pending, data.tasks?.overdue],
+                        backgroundColor: ['#2ecc71', '#3498db', '#e74c3c']
+                    }]
+                }
+            });
+        }
+
+        // Recent activity
+        const activityElement = document.getElementById('recentActivity');
+        if (activityElement) {
+            activityElement.innerHTML = `
+                <p>Tasks: ${data.tasks?.completed}/${data.tasks?.total} completed</p>
+                <p>Habits: ${data.habits?.total} tracked</p>
+                <p>Best streak: ${data.habits?.best_streak} days</p>
+            `;
+        }
+    } catch (error) {
+        console.error('Error loading analytics:', error);
+    }
+}
+
+// Chat functionality
+function sendMessage() {
+    const input = document.getElementById('messageInput');
+    const message = input.value.trim();
+
+    if (!message) return;
+
+    addMessage('You', message, 'user-message');
+    input.value = '';
+
+    streamReply(message).catch(error => {
+        addMessage('AURA', 'Sorry, I encountered an error.', 'aura-message');
+    });
+}
+
+// Append the reply as the server streams it (server-sent events)
+async function streamReply(message) {
+    const response = await fetch('/api/chat/stream', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({message: message})
+    });
+    const text = addMessage('AURA', '', 'aura-message');
+    const chat = document.getElementById('chatHistory');
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const {done, value} = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, {stream: true});
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const event of events) {
+            if (event.startsWith('event: done')) continue;
+            const data = event.split('\n').find(line => line.startsWith('data: '));
+            if (!data) continue;
+            text.textContent += JSON.parse(data.slice(6)).delta;
+            chat.scrollTop = chat.scrollHeight;
+        }
+    }
+}
+
+function addMessage(sender, message, cssClass) {
+    const chat = document.getElementById('chatHistory');
+    const messageDiv = document.createElement('div');
+    messageDiv.className = `message ${cssClass}`;
+    messageDiv.innerHTML = `<strong>${sender}:</strong> <span>${message}</span>`;
+    chat.appendChild(messageDiv);
+    chat.scrollTop = chat.scrollHeight;
+    return messageDiv.querySelector('span');
+}
+
+function handleKeyPress(e) {
+    if (e.key === 'Enter') {
+        sendMessage();
+    }
+}
+
+// Initialize
+loadAnalytics();
\ No newline at end of file